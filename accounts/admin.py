@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import User, UserSession, OneTimeToken
 
 class UserAdmin(BaseUserAdmin):
     list_display = ("email", "username", "role", "is_verified", "is_staff")
@@ -11,12 +11,9 @@ class UserAdmin(BaseUserAdmin):
     
     ordering = ("email",)
     
-    readonly_fields = ("refresh_token", "forgot_password_token", "email_verification_token")
-    
     fieldsets = (
         (None, {"fields": ("email", "username", "password")}),
         ("Permissions", {"fields": ("role", "is_verified", "is_staff", "is_superuser")}),
-        ("Important tokens", {"fields": ("refresh_token", "forgot_password_token", "email_verification_token")}),
         ("Login Type", {"fields": ("login_type",)}),
     )
     
@@ -27,4 +24,26 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
     
-admin.site.register(User, UserAdmin)
\ No newline at end of file
+admin.site.register(User, UserAdmin)
+
+class UserSessionAdmin(admin.ModelAdmin):
+    list_display = ("user", "user_agent", "ip_address", "created_at", "expires_at", "revoked_at")
+    
+    list_filter = ("revoked_at",)
+    
+    search_fields = ("user__email", "ip_address")
+    
+    readonly_fields = ("token_hash",)
+    
+admin.site.register(UserSession, UserSessionAdmin)
+
+class OneTimeTokenAdmin(admin.ModelAdmin):
+    list_display = ("user", "purpose", "created_at", "expires_at", "used_at")
+    
+    list_filter = ("purpose", "used_at")
+    
+    search_fields = ("user__email",)
+    
+    readonly_fields = ("token_hash",)
+    
+admin.site.register(OneTimeToken, OneTimeTokenAdmin)
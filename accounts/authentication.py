@@ -1,6 +1,7 @@
 import jwt 
 from rest_framework import authentication, exceptions
 from django.conf import settings
+from .cache import principal_cache
 from .models import User
 
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -11,7 +12,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
             return None
         
         if not auth_header.startswith("Bearer "):
-            raise exception.AuthenticationFailed("Invalid Authorization header format")
+            raise exceptions.AuthenticationFailed("Invalid Authorization header format")
 
         token = auth_header.split("Bearer ")[1]
         try:
@@ -19,7 +20,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
             user_id = payload.get("id")
             if not user_id:
                 raise exceptions.AuthenticationFailed("Invalid token payload")
-            user = User.objects.get(id=user_id)
+            user = principal_cache.get_user(user_id, lambda: User.objects.get(id=user_id))
             return (user, token)
         
         except jwt.ExpiredSignatureError:
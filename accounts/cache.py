@@ -0,0 +1,100 @@
+import copy
+from django.conf import settings
+from django.core.cache import caches
+
+from core.cache import LRUCache
+from core.metrics import registry
+
+# ----------------------------
+# Authenticated Principal Cache
+# ----------------------------
+PRINCIPAL_CACHE_SETTINGS = {
+    "MAX_SIZE": 10000,
+    "TTL": 60,
+    # Alias from CACHES shared by all workers, e.g. "default". None = per-process only.
+    "SHARED_CACHE": None,
+    # TTL cap without a shared cache: invalidations then only reach the current
+    # process, so other workers may serve a deactivated user or an old role this long.
+    "LOCAL_TTL": 5,
+    **getattr(settings, "AUTH_PRINCIPAL_CACHE", {}),
+}
+
+
+class PrincipalCache:
+    """
+    Caches the User behind a JWT so authentication does not hit the DB on
+    every request.
+
+    Entries are keyed by user id plus a per-user version. `User.save` calls
+    `invalidate`, which drops the local entry and, when a shared cache is
+    configured, bumps the version so other workers miss on their next lookup.
+    Without one, entries live at most `local_ttl` seconds.
+    """
+
+    def __init__(self, maxsize, ttl, shared_alias=None, local_ttl=None):
+        self.ttl = ttl
+        if not shared_alias and local_ttl is not None:
+            ttl = min(ttl, local_ttl)
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.shared_alias = shared_alias
+        self.shared_hits = 0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    def get_version(self, user_id):
+        if self.shared is None:
+            return 0
+        return self.shared.get(f"principal-version:{user_id}", 0)
+
+    def get_user(self, user_id, loader):
+        """
+        Returns a per-request copy of the cached user, calling `loader()` on a miss.
+        """
+        user_id = str(user_id)
+        version = self.get_version(user_id)
+        user = self.local.get((user_id, version))
+
+        if user is None and self.shared is not None:
+            user = self.shared.get(f"principal:{user_id}:{version}")
+            if user is not None:
+                self.shared_hits += 1
+                self.local.set((user_id, version), user)
+
+        if user is None:
+            user = loader()
+            self.local.set((user_id, version), user)
+            if self.shared is not None:
+                self.shared.set(f"principal:{user_id}:{version}", user, self.ttl)
+
+        # Views mutate request.user, so never hand out the cached instance itself.
+        return copy.copy(user)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        version = self.get_version(user_id)
+        self.local.delete((user_id, version))
+
+        if self.shared is not None:
+            self.shared.delete(f"principal:{user_id}:{version}")
+            try:
+                self.shared.incr(f"principal-version:{user_id}")
+            except ValueError:
+                self.shared.set(f"principal-version:{user_id}", version + 1, None)
+
+    def stats(self):
+        return {**self.local.stats(), "shared_hits": self.shared_hits}
+
+
+principal_cache = PrincipalCache(
+    maxsize=PRINCIPAL_CACHE_SETTINGS["MAX_SIZE"],
+    ttl=PRINCIPAL_CACHE_SETTINGS["TTL"],
+    shared_alias=PRINCIPAL_CACHE_SETTINGS["SHARED_CACHE"],
+    local_ttl=PRINCIPAL_CACHE_SETTINGS["LOCAL_TTL"],
+)
+registry.register_collector(lambda: {
+    "apiverse_principal_cache_hits_total": principal_cache.local.hits,
+    "apiverse_principal_cache_misses_total": principal_cache.local.misses,
+    "apiverse_principal_cache_shared_hits_total": principal_cache.shared_hits,
+})
@@ -0,0 +1,119 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth import hashers
+
+from core.metrics import registry
+
+PASSWORD_HASHING_SETTINGS = {
+    # PBKDF2 iterations; 0 keeps Django's default. See `manage.py calibrate_hasher`.
+    "ITERATIONS": 0,
+    # Threads hashing for async views. hashlib releases the GIL while hashing,
+    # so these run in parallel up to the number of cores.
+    "MAX_WORKERS": os.cpu_count() or 1,
+    # Hashes queued or running beyond which async views answer 503 instead of queueing more.
+    "MAX_PENDING": 64,
+    **getattr(settings, "PASSWORD_HASHING", {}),
+}
+
+# ----------------------------
+# Hasher
+# ----------------------------
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2-SHA256 with PASSWORD_HASHING["ITERATIONS"]. The algorithm
+    name is unchanged, so existing hashes still verify, and are rehashed at
+    the new work factor on the next successful login.
+    """
+    iterations = PASSWORD_HASHING_SETTINGS["ITERATIONS"] or hashers.PBKDF2PasswordHasher.iterations
+
+# ----------------------------
+# Hashing Pool
+# ----------------------------
+class HashingPoolFull(Exception):
+    pass
+
+
+class HashingPool:
+    """
+    A bounded thread pool that keeps password hashing off the event loop.
+    Unlike Django's acheck_password/aauthenticate, which hash on the loop for
+    unknown users and rehashes, every hash of the async paths runs here.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.executor = None
+        self.pending = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        """Runs `func(*args)` in the pool. Raises HashingPoolFull when MAX_PENDING jobs are in flight."""
+        with self.lock:
+            if self.pending >= PASSWORD_HASHING_SETTINGS["MAX_PENDING"]:
+                self.rejected += 1
+                raise HashingPoolFull()
+            self.pending += 1
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=PASSWORD_HASHING_SETTINGS["MAX_WORKERS"], thread_name_prefix="password-hashing",
+                )
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+
+hashing_pool = HashingPool()
+
+registry.register_collector(lambda: {
+    "apiverse_password_hashing_pending": hashing_pool.pending,
+    "apiverse_password_hashing_rejected_total": hashing_pool.rejected,
+})
+
+# ----------------------------
+# Async Password Checks
+# ----------------------------
+def verify_and_upgrade(raw_password, encoded):
+    """
+    Returns (is_correct, new_encoded). new_encoded is the password hashed with
+    the preferred hasher when `encoded` used another hasher or work factor.
+    """
+    is_correct, must_update = hashers.verify_password(raw_password, encoded)
+    return is_correct, hashers.make_password(raw_password) if is_correct and must_update else None
+
+
+async def ahash_password(raw_password):
+    return await hashing_pool.run(hashers.make_password, raw_password)
+
+
+async def acheck_password(user, raw_password):
+    """Checks `raw_password` against `user`, saving a rehashed password when needed."""
+    is_correct, new_encoded = await hashing_pool.run(verify_and_upgrade, raw_password, user.password)
+    if new_encoded is not None:
+        user.password = new_encoded
+        await user.asave(update_fields=["password"])
+        registry.inc("apiverse_password_rehashes_total")
+    return is_correct
+
+
+async def aauthenticate(email, password):
+    """
+    Async equivalent of `authenticate(email=..., password=...)` with
+    ModelBackend: returns the active user or None.
+    """
+    User = get_user_model()
+    try:
+        user = await User._default_manager.aget_by_natural_key(email)
+    except User.DoesNotExist:
+        # Hash anyway, so response time doesn't reveal whether the email exists.
+        await ahash_password(password)
+        return None
+    if await acheck_password(user, password) and user.is_active:
+        return user
+    return None
@@ -0,0 +1,240 @@
+import codecs
+import csv
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from threading import Lock
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from accounts.models import User
+from accounts.serializers import UserImportSerializer
+from core.metrics import registry
+from ecommerce.models import Profile
+
+USER_IMPORT_SETTINGS = {
+    # Processes hashing passwords for the bulk endpoint; `import_users` takes --workers.
+    "WORKERS": 2,
+    "BATCH_SIZE": 1000,
+    # Rows accepted per request by the bulk endpoint.
+    "MAX_ROWS": 10000,
+    # Row errors returned by the bulk endpoint; the rest are only counted.
+    "MAX_ERRORS": 100,
+    **getattr(settings, "USER_IMPORT", {}),
+}
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# ----------------------------
+# Row Readers
+# ----------------------------
+# Readers take an iterable of byte lines (an open file or a request) and
+# yield (line number, row dict or None, error or None) without loading the
+# whole input.
+def read_csv(lines):
+    reader = csv.DictReader(codecs.iterdecode(lines, "utf-8-sig"))
+    try:
+        for row in reader:
+            # Empty cells count as missing, so optional columns fall back to their defaults.
+            yield reader.line_num, {k: v for k, v in row.items() if k is not None and v not in ("", None)}, None
+    except (csv.Error, UnicodeDecodeError) as e:
+        yield reader.line_num, None, f"Malformed CSV: {e}"
+
+
+def read_ndjson(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, row, None
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+# ----------------------------
+# Hashing Pool
+# ----------------------------
+_pool = None
+_pool_lock = Lock()
+
+
+def get_hashing_pool():
+    """The bulk endpoint's process pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None and USER_IMPORT_SETTINGS["WORKERS"]:
+            _pool = create_hashing_pool(USER_IMPORT_SETTINGS["WORKERS"])
+        return _pool
+
+
+def create_hashing_pool(workers):
+    # Spawned, not forked: request workers may be multi-threaded. Workers
+    # set Django up so make_password sees PASSWORD_HASHERS.
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup,
+    )
+
+# ----------------------------
+# Import
+# ----------------------------
+@dataclass
+class ImportResult:
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+    # Rows after `max_rows` were left unread.
+    truncated: bool = False
+
+    @property
+    def rows_per_second(self):
+        return (self.created + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line, errors, max_errors=None):
+        self.failed += 1
+        if max_errors is None or len(self.errors) < max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+
+class UserImporter:
+    """
+    Creates users from validated rows in batches: each batch's passwords are
+    hashed in `executor` (in-process when None) while the previous batch is
+    inserted with bulk_create, together with the Profile rows that
+    accounts.signals.create_user_profile creates for single users.
+
+    Invalid rows, and rows whose email or username is already taken, are
+    recorded in the result and skipped; the rest of the batch is imported.
+    Rows may only set a role other than ROLE_USER with `allow_any_role`.
+    """
+
+    def __init__(self, executor=None, batch_size=None, max_errors=None, on_error=None, on_batch=None,
+                 allow_any_role=False):
+        self.executor = executor
+        self.allow_any_role = allow_any_role
+        self.batch_size = batch_size or USER_IMPORT_SETTINGS["BATCH_SIZE"]
+        self.max_errors = max_errors
+        self.on_error = on_error
+        self.on_batch = on_batch
+        self.result = ImportResult()
+        self.seen_emails = set()
+        self.seen_usernames = set()
+
+    def run(self, rows, max_rows=None):
+        """Imports `rows` from a reader (see READERS), up to `max_rows`, and returns the ImportResult."""
+        start = perf_counter()
+        pending = None
+        valid_rows = self.validate(rows, max_rows)
+        while True:
+            batch = list(islice(valid_rows, self.batch_size))
+            if not batch:
+                break
+            batch = self.exclude_existing(batch)
+            passwords = [row["password"] or None for _, row in batch]
+            if self.executor is not None:
+                hashes = self.executor.map(make_password, passwords, chunksize=max(1, len(passwords) // 16))
+            else:
+                hashes = map(make_password, passwords)
+            if pending is not None:
+                self.insert(*pending)
+            pending = (batch, hashes)
+        if pending is not None:
+            self.insert(*pending)
+
+        self.result.elapsed = perf_counter() - start
+        return self.result
+
+    def error(self, line, errors):
+        self.result.add_error(line, errors, self.max_errors)
+        if self.on_error is not None:
+            self.on_error(line, errors)
+
+    def validate(self, rows, max_rows=None):
+        for count, (line, row, error) in enumerate(rows):
+            if max_rows is not None and count >= max_rows:
+                self.result.truncated = True
+                return
+            if error is not None:
+                self.error(line, {"row": [error]})
+                continue
+            serializer = UserImportSerializer(data=row, context={"allow_any_role": self.allow_any_role})
+            if not serializer.is_valid():
+                self.error(line, serializer.errors)
+                continue
+            data = serializer.validated_data
+            data["email"] = User.objects.normalize_email(data["email"])
+            if data["email"] in self.seen_emails or data["username"] in self.seen_usernames:
+                self.error(line, {"row": ["Duplicate email or username in this import."]})
+                continue
+            self.seen_emails.add(data["email"])
+            self.seen_usernames.add(data["username"])
+            yield line, data
+
+    def exclude_existing(self, batch):
+        """Drops rows whose email or username exists, with one query per field per batch."""
+        emails = set(User.objects.filter(email__in=[row["email"] for _, row in batch]).values_list("email", flat=True))
+        usernames = set(
+            User.objects.filter(username__in=[row["username"] for _, row in batch]).values_list("username", flat=True)
+        )
+        kept = []
+        for line, row in batch:
+            if row["email"] in emails:
+                self.error(line, {"email": ["user with this email already exists."]})
+            elif row["username"] in usernames:
+                self.error(line, {"username": ["user with this username already exists."]})
+            else:
+                kept.append((line, row))
+        return kept
+
+    def insert(self, batch, hashes):
+        users = [
+            User(
+                email=row["email"],
+                username=row["username"],
+                password=password,
+                role=row["role"],
+                is_verified=row["is_verified"],
+            )
+            for (_, row), password in zip(batch, hashes)
+        ]
+        created = self.result.created
+        try:
+            with transaction.atomic():
+                self.create(users)
+        except IntegrityError:
+            # Taken since exclude_existing ran (e.g. a concurrent signup): insert
+            # one by one so only the conflicting rows fail.
+            for (line, _), user in zip(batch, users):
+                try:
+                    with transaction.atomic():
+                        self.create([user])
+                except IntegrityError:
+                    self.error(line, {"row": ["Email or username already exists."]})
+                    continue
+                self.result.created += 1
+        else:
+            self.result.created += len(users)
+        registry.inc("apiverse_imported_users_total", value=self.result.created - created)
+        if self.on_batch is not None:
+            self.on_batch(self.result)
+
+    @staticmethod
+    def create(users):
+        User.objects.bulk_create(users)
+        Profile.objects.bulk_create([
+            Profile(owner=user, first_name=user.username, last_name="", country_code="", phone_number="")
+            for user in users
+        ])
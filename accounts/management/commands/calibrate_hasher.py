@@ -0,0 +1,88 @@
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.hashers import PASSWORD_HASHING_SETTINGS, PBKDF2PasswordHasher
+
+PASSWORD = "calibration-password"
+PROBE_ITERATIONS = 100_000
+# Never recommend less work than Django's own default.
+MIN_ITERATIONS = hashers.PBKDF2PasswordHasher.iterations
+
+# ----------------------------
+# Password Hasher Calibration
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the configured password hashers on this machine and picks the PBKDF2 iteration "
+        "count (PASSWORD_HASHING['ITERATIONS']) whose hash takes --target-ms, never below Django's "
+        "default, then measures how many such hashes per second the async hashing pool sustains."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-ms", type=float, default=250, help="Wanted time for one hash (default 250).")
+        parser.add_argument("--samples", type=int, default=5, help="Hashes timed per measurement.")
+        parser.add_argument(
+            "--workers", type=int, default=PASSWORD_HASHING_SETTINGS["MAX_WORKERS"],
+            help="Threads for the throughput measurement (default PASSWORD_HASHING['MAX_WORKERS']).",
+        )
+
+    def handle(self, *args, **options):
+        if options["target_ms"] <= 0 or options["samples"] < 1 or options["workers"] < 1:
+            raise CommandError("--target-ms, --samples and --workers must be positive.")
+
+        self.stdout.write(f"{'hasher':<42}{'ms/hash':>10}")
+        for hasher in get_hashers():
+            try:
+                ms = self.measure(lambda: hasher.encode(PASSWORD, hasher.salt()), options["samples"])
+            except ValueError:
+                # The hasher's library (argon2-cffi, bcrypt) is not installed.
+                self.stdout.write(f"{type(hasher).__name__:<42}{'-':>10}")
+                continue
+            self.stdout.write(f"{type(hasher).__name__:<42}{ms:>10.1f}")
+
+        hasher = PBKDF2PasswordHasher()
+        probe_ms = self.measure(lambda: hasher.encode(PASSWORD, hasher.salt(), PROBE_ITERATIONS), options["samples"])
+        # PBKDF2 time is linear in iterations; round to a readable figure.
+        calibrated = int(round(PROBE_ITERATIONS * options["target_ms"] / probe_ms, -4))
+        iterations = max(MIN_ITERATIONS, calibrated)
+        ms = self.measure(lambda: hasher.encode(PASSWORD, hasher.salt(), iterations), options["samples"])
+
+        jobs = options["workers"] * options["samples"]
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            start = perf_counter()
+            list(executor.map(lambda _: hasher.encode(PASSWORD, hasher.salt(), iterations), range(jobs)))
+            throughput = jobs / (perf_counter() - start)
+
+        self.stdout.write(
+            f"\nPBKDF2-SHA256: {iterations:,} iterations take {ms:.1f} ms "
+            f"(currently {hasher.iterations:,}; target {options['target_ms']:g} ms).\n"
+            f"{options['workers']} hashing threads sustain {throughput:.1f} hashes/s per process."
+        )
+        if calibrated < MIN_ITERATIONS:
+            self.stderr.write(self.style.WARNING(
+                f"{options['target_ms']:g} ms only allows {calibrated:,} iterations on this machine, below "
+                f"Django's default of {MIN_ITERATIONS:,}; recommending the default. Add hashing capacity "
+                f"(cores, workers) rather than lowering the work factor."
+            ))
+        if "accounts.hashers.PBKDF2PasswordHasher" not in settings.PASSWORD_HASHERS[:1]:
+            self.stderr.write(self.style.WARNING(
+                "accounts.hashers.PBKDF2PasswordHasher is not the first PASSWORD_HASHERS entry; the setting has no effect."
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Set PASSWORD_HASH_ITERATIONS={iterations}"))
+
+    @staticmethod
+    def measure(func, samples):
+        """Median milliseconds of `samples` calls, after one warm-up call."""
+        func()
+        times = []
+        for _ in range(samples):
+            start = perf_counter()
+            func()
+            times.append((perf_counter() - start) * 1000)
+        return statistics.median(times)
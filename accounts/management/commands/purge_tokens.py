@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from accounts.models import OneTimeToken
+
+# ----------------------------
+# Purge Expired One-Time Tokens
+# ----------------------------
+class Command(BaseCommand):
+    help = "Deletes expired email verification and password reset tokens in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows deleted per statement.")
+
+    def handle(self, *args, **options):
+        deleted = OneTimeToken.objects.purge_expired(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired tokens."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.oauth_stub import make_stub_server
+
+# ----------------------------
+# Stand-in OAuth Provider
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Serves a stand-in Google/GitHub OAuth provider for offline and load tests. Point the API at it "
+        "with OAUTH_STUB_URL=http://<host>:<port>; any `code` sent to a callback then signs in a user "
+        "derived from that code."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8090)
+        parser.add_argument("--latency-ms", type=float, default=0, help="Delay before every response.")
+        parser.add_argument("--failure-rate", type=float, default=0, help="Fraction of requests answered with 503.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["failure_rate"] <= 1:
+            raise CommandError("--failure-rate must be between 0 and 1.")
+        try:
+            server = make_stub_server(
+                options["host"], options["port"], options["latency_ms"] / 1000, options["failure_rate"],
+            )
+        except OSError as e:
+            raise CommandError(f"Cannot listen on {options['host']}:{options['port']}: {e.strerror}.")
+
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(f"Stub OAuth provider on http://{host}:{port} (OAUTH_STUB_URL). Ctrl-C to stop."))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
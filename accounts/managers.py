@@ -1,16 +1,35 @@
 import jwt
 import time, secrets, hashlib
 from datetime import timedelta
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from core.constants import ROLE_CHOICES, LOGIN_TYPE_CHOICES, ROLE_ADMIN, ROLE_USER, LOGIN_EMAIL_PASSWORD
+from .cache import principal_cache
+
+# ----------------------------
+# User QuerySet
+# ----------------------------
+class UserQuerySet(models.QuerySet):
+    """
+    Bulk updates (role changes, deactivation, bulk_update) skip `User.save`,
+    so `update` invalidates the cached principal of every updated user itself.
+    """
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.db, savepoint=False):
+            # Collected first: the update may change the fields this queryset filters on.
+            user_ids = list(self.values_list("pk", flat=True))
+            updated = super().update(**kwargs)
+        for user_id in user_ids:
+            principal_cache.invalidate(user_id)
+        return updated
 
 # ----------------------------
 # Custom User Manager
 # ----------------------------
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def _create_user(self, email, username, password=None, **extra_fields):
         if not email:
             raise ValueError("Email must be provided")
@@ -41,3 +60,149 @@ class UserManager(BaseUserManager):
 class ActiveUserManager(UserManager):
     def get_queryset(self):
         return super().get_queryset().filter(is_active=True)
+
+# ----------------------------
+# User Session Manager
+# ----------------------------
+class UserSessionManager(models.Manager):
+    """
+    Refresh-token sessions, one row per device. Only the SHA-256 hash of a
+    refresh token is stored; lookups go through its unique index.
+    """
+
+    @staticmethod
+    def hash_token(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def get_device_metadata(request):
+        if request is None:
+            return {}
+        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+        ip = x_forwarded_for.split(",")[0].strip() if x_forwarded_for else request.META.get("REMOTE_ADDR")
+        return {
+            "user_agent": request.META.get("HTTP_USER_AGENT", "")[:255],
+            "ip_address": ip or None,
+        }
+
+    def issue(self, user, request=None, days=7):
+        """
+        Creates a session for `user` and returns (refresh_token, session).
+        """
+        refresh = user.generate_refresh_token(days=days)
+        session = self.create(
+            user=user,
+            token_hash=self.hash_token(refresh),
+            expires_at=timezone.now() + timedelta(days=days),
+            **self.get_device_metadata(request),
+        )
+        return refresh, session
+
+    def rotate(self, refresh, request=None):
+        """
+        Consumes a refresh token and issues its replacement.
+        Returns (refresh_token, session), or None if the token is not live.
+        Replaying an already rotated token revokes every session of its owner.
+        """
+        token_hash = self.hash_token(refresh)
+        now = timezone.now()
+
+        with transaction.atomic():
+            consumed = self.filter(
+                token_hash=token_hash, revoked_at__isnull=True, expires_at__gt=now
+            ).update(revoked_at=now)
+
+            if not consumed:
+                user_id = self.filter(
+                    token_hash=token_hash, revoked_at__isnull=False, expires_at__gt=now
+                ).values_list("user_id", flat=True).first()
+                if user_id:
+                    self.revoke_all(user_id)
+                return None
+
+            session = self.select_related("user").get(token_hash=token_hash)
+            return self.issue(session.user, request)
+
+    def revoke(self, refresh, user=None):
+        sessions = self.filter(token_hash=self.hash_token(refresh), revoked_at__isnull=True)
+        if user is not None:
+            sessions = sessions.filter(user=user)
+        return sessions.update(revoked_at=timezone.now())
+
+    def revoke_all(self, user_id):
+        """Revokes every live session of a user with a single UPDATE."""
+        return self.filter(user_id=user_id, revoked_at__isnull=True).update(revoked_at=timezone.now())
+
+    def purge_expired(self, chunk_size=1000):
+        """
+        Deletes expired sessions in chunks so no single statement holds long locks.
+        Returns the number of rows deleted.
+        """
+        deleted = 0
+        while True:
+            ids = list(
+                self.filter(expires_at__lte=timezone.now()).values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                return deleted
+            deleted += self.filter(id__in=ids).delete()[0]
+
+# ----------------------------
+# One-Time Token Manager
+# ----------------------------
+class OneTimeTokenManager(models.Manager):
+    """
+    Single-use tokens (email verification, password reset). Only the SHA-256
+    hash is stored; lookups go through its unique index, and issuing a token
+    never writes to the user row.
+    """
+
+    @staticmethod
+    def hash_token(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def issue(self, user, purpose, minutes=10):
+        """
+        Creates a token for `user` and returns it unhashed. Earlier unused
+        tokens of the same purpose stop working.
+        """
+        token = secrets.token_hex(20)
+        now = timezone.now()
+        with transaction.atomic():
+            self.filter(user=user, purpose=purpose, used_at__isnull=True).update(used_at=now)
+            self.create(
+                user=user,
+                purpose=purpose,
+                token_hash=self.hash_token(token),
+                expires_at=now + timedelta(minutes=minutes),
+            )
+        return token
+
+    def consume(self, token, purpose):
+        """
+        Marks a live token as used and returns its user, or None if the token
+        is unknown, expired or already used. The conditional UPDATE lets only
+        one of several concurrent requests with the same token succeed; call
+        it inside the transaction that applies the token's effect.
+        """
+        token_hash = self.hash_token(token)
+        consumed = self.filter(
+            token_hash=token_hash, purpose=purpose, used_at__isnull=True, expires_at__gt=timezone.now()
+        ).update(used_at=timezone.now())
+        if not consumed:
+            return None
+        return self.select_related("user").get(token_hash=token_hash).user
+
+    def purge_expired(self, chunk_size=1000):
+        """
+        Deletes expired tokens in chunks so no single statement holds long locks.
+        Returns the number of rows deleted.
+        """
+        deleted = 0
+        while True:
+            ids = list(
+                self.filter(expires_at__lte=timezone.now()).values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                return deleted
+            deleted += self.filter(id__in=ids).delete()[0]
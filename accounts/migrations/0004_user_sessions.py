@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:30
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_refresh_tokens(apps, schema_editor):
+    """Keeps existing single-device logins alive as sessions."""
+    import hashlib
+    from datetime import timedelta
+
+    User = apps.get_model('accounts', 'User')
+    UserSession = apps.get_model('accounts', 'UserSession')
+    expires_at = django.utils.timezone.now() + timedelta(days=7)
+    sessions = [
+        UserSession(user_id=user_id, token_hash=hashlib.sha256(token.encode()).hexdigest(), expires_at=expires_at)
+        for user_id, token in User.objects.exclude(refresh_token__isnull=True).exclude(refresh_token='').values_list('id', 'refresh_token').iterator()
+    ]
+    UserSession.objects.bulk_create(sessions, batch_size=1000, ignore_conflicts=True)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('token_hash', models.CharField(max_length=64, unique=True)),
+                ('user_agent', models.CharField(blank=True, default='', max_length=255)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('revoked_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'revoked_at'], name='accounts_us_user_id_9fbea3_idx')],
+            },
+        ),
+        migrations.RunPython(copy_refresh_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='refresh_token',
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:21
+
+import core.ids
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_pending_tokens(apps, schema_editor):
+    """Keeps unexpired verification and reset links working; the columns already hold SHA-256 hashes."""
+    User = apps.get_model('accounts', 'User')
+    OneTimeToken = apps.get_model('accounts', 'OneTimeToken')
+    now = django.utils.timezone.now()
+    tokens = []
+    for purpose, token_field, expiry_field in (
+        ('EMAIL_VERIFICATION', 'email_verification_token', 'email_verification_expiry'),
+        ('PASSWORD_RESET', 'forgot_password_token', 'forgot_password_expiry'),
+    ):
+        pending = User.objects.filter(**{f'{token_field}__isnull': False, f'{expiry_field}__gt': now})
+        tokens += [
+            OneTimeToken(user_id=user_id, purpose=purpose, token_hash=token_hash, expires_at=expires_at)
+            for user_id, token_hash, expires_at in pending.values_list('id', token_field, expiry_field).iterator()
+        ]
+    OneTimeToken.objects.bulk_create(tokens, batch_size=1000, ignore_conflicts=True)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_uuid7_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OneTimeToken',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('purpose', models.CharField(choices=[('EMAIL_VERIFICATION', 'Email Verification'), ('PASSWORD_RESET', 'Password Reset')], max_length=32)),
+                ('token_hash', models.CharField(max_length=64, unique=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('used_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='one_time_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'purpose'], name='accounts_on_user_id_d58e9d_idx')],
+            },
+        ),
+        migrations.RunPython(copy_pending_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='email_verification_expiry',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='email_verification_token',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='forgot_password_expiry',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='forgot_password_token',
+        ),
+    ]
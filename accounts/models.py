@@ -8,9 +8,10 @@ from django.db import models
 from datetime import timedelta
 from django.conf import settings
 from django.utils import timezone
-from .managers import UserManager, ActiveUserManager
+from .cache import principal_cache
+from .managers import UserManager, UserQuerySet, ActiveUserManager, UserSessionManager, OneTimeTokenManager
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
-from core.constants import ROLE_CHOICES, LOGIN_TYPE_CHOICES, ROLE_USER, LOGIN_EMAIL_PASSWORD
+from core.constants import ROLE_CHOICES, LOGIN_TYPE_CHOICES, ROLE_USER, LOGIN_EMAIL_PASSWORD, TOKEN_PURPOSE_CHOICES
 
 def avatar_upload_path(instance, filename):
     return f"avatars/user_{instance.id}/{filename}"
@@ -28,17 +29,16 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
 
-    refresh_token = models.TextField(blank=True, null=True)
-    forgot_password_token = models.CharField(max_length=255, blank=True, null=True)
-    forgot_password_expiry = models.DateTimeField(blank=True, null=True)
-    email_verification_token = models.CharField(max_length=255, blank=True, null=True)
-    email_verification_expiry = models.DateTimeField(blank=True, null=True)
-
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
     objects = UserManager()
     active_objects = ActiveUserManager()
+    # Users are deactivated (`is_active`), never soft deleted: `objects` already
+    # returns every user, and BaseModel's SoftDeleteQuerySet would set a
+    # `deleted_at` nothing on User reads. UserQuerySet keeps bulk updates
+    # invalidating cached principals.
+    all_objects = UserQuerySet.as_manager()
 
     # ----------------------------
     # Avatar URL
@@ -59,6 +59,14 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    # ----------------------------
+    # Save
+    # ----------------------------
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Role, password and activation changes must not be served from a stale principal.
+        principal_cache.invalidate(self.pk)
+
     # ----------------------------
     # Soft delete
     # ----------------------------
@@ -80,7 +88,7 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
 
     def generate_refresh_token(self, days=7):
         exp_timestamp = int(time.time()) + days * 24 * 60 * 60
-        payload = {"id": str(self.id), "exp": exp_timestamp}
+        payload = {"id": str(self.id), "exp": exp_timestamp, "jti": secrets.token_hex(16)}
         return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
     # ----------------------------
@@ -91,4 +99,52 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
         hashed = hashlib.sha256(un_hashed.encode()).hexdigest()
         expiry = timezone.now() + timedelta(minutes=expiry_minutes)
         return un_hashed, hashed, expiry
-    
\ No newline at end of file
+
+# ----------------------------
+# Refresh Token Sessions
+# ----------------------------
+class UserSession(BaseModel):
+    """
+    A refresh-token session for one device. Rotated on every refresh.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sessions")
+    token_hash = models.CharField(max_length=64, unique=True)
+    user_agent = models.CharField(max_length=255, blank=True, default="")
+    ip_address = models.GenericIPAddressField(blank=True, null=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(blank=True, null=True)
+
+    objects = UserSessionManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "revoked_at"]),
+        ]
+
+    def __str__(self):
+        return f"Session of {self.user_id} ({self.user_agent or 'unknown device'})"
+
+
+# ----------------------------
+# One-Time Tokens
+# ----------------------------
+class OneTimeToken(BaseModel):
+    """
+    A single-use token emailed to a user, e.g. to verify their address or
+    reset their password. Consumed at most once, see OneTimeTokenManager.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="one_time_tokens")
+    purpose = models.CharField(max_length=32, choices=TOKEN_PURPOSE_CHOICES)
+    token_hash = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    used_at = models.DateTimeField(blank=True, null=True)
+
+    objects = OneTimeTokenManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "purpose"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_purpose_display()} token of {self.user_id}"
@@ -0,0 +1,100 @@
+import logging
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+
+from core.http_client import HTTPClientError, http_client
+
+logger = logging.getLogger(__name__)
+
+OAUTH_SETTINGS = {
+    # Base URL of a stand-in provider (`manage.py run_oauth_stub`). When set,
+    # every provider's endpoints are served from "<STUB_URL>/<provider>/".
+    "STUB_URL": "",
+    # Seconds discovered provider metadata is reused.
+    "METADATA_TTL": 3600,
+    # After a failed discovery, the built-in endpoints are used for this long before retrying.
+    "METADATA_RETRY": 60,
+    **getattr(settings, "OAUTH", {}),
+}
+
+# Built-in endpoints; providers with a `discovery` document (OpenID Connect)
+# override them with the discovered ones.
+PROVIDERS = {
+    "google": {
+        "discovery": "https://accounts.google.com/.well-known/openid-configuration",
+        "authorization_endpoint": "https://accounts.google.com/o/oauth2/v2/auth",
+        "token_endpoint": "https://oauth2.googleapis.com/token",
+        "userinfo_endpoint": "https://www.googleapis.com/oauth2/v3/userinfo",
+    },
+    "github": {
+        "authorization_endpoint": "https://github.com/login/oauth/authorize",
+        "token_endpoint": "https://github.com/login/oauth/access_token",
+        "userinfo_endpoint": "https://api.github.com/user",
+    },
+}
+
+ENDPOINTS = ("authorization_endpoint", "token_endpoint", "userinfo_endpoint")
+
+# ----------------------------
+# Provider Metadata
+# ----------------------------
+def get_builtin_metadata(provider):
+    stub_url = OAUTH_SETTINGS["STUB_URL"].rstrip("/")
+    if not stub_url:
+        return PROVIDERS[provider]
+    metadata = {
+        "authorization_endpoint": f"{stub_url}/{provider}/authorize",
+        "token_endpoint": f"{stub_url}/{provider}/token",
+        "userinfo_endpoint": f"{stub_url}/{provider}/userinfo",
+    }
+    if "discovery" in PROVIDERS[provider]:
+        metadata["discovery"] = f"{stub_url}/{provider}/.well-known/openid-configuration"
+    return metadata
+
+
+class ProviderMetadataCache:
+    """
+    Endpoints per provider, discovered at most once per METADATA_TTL per
+    process instead of hard-coded per request. A failed discovery falls back
+    to the built-in endpoints and is retried after METADATA_RETRY seconds.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.entries = {}
+
+    def get(self, provider):
+        """Returns {endpoint name: URL} for "google" or "github"."""
+        entry = self.entries.get(provider)
+        if entry is not None and entry[1] > monotonic():
+            return entry[0]
+        with self.lock:
+            entry = self.entries.get(provider)
+            if entry is None or entry[1] <= monotonic():
+                entry = self.entries[provider] = self.load(provider)
+        return entry[0]
+
+    @staticmethod
+    def load(provider):
+        """Returns (metadata, expires_at)."""
+        metadata = get_builtin_metadata(provider)
+        if "discovery" not in metadata:
+            return metadata, float("inf")
+        try:
+            response = http_client.get(metadata["discovery"])
+            response.raise_for_status()
+            discovered = response.json()
+        except (HTTPClientError, ValueError, OSError) as e:
+            logger.error(f"OAuth discovery failed for {provider}: {e}")
+            return metadata, monotonic() + OAUTH_SETTINGS["METADATA_RETRY"]
+        metadata = {**metadata, **{name: discovered[name] for name in ENDPOINTS if discovered.get(name)}}
+        return metadata, monotonic() + OAUTH_SETTINGS["METADATA_TTL"]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+provider_metadata = ProviderMetadataCache()
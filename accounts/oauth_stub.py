@@ -0,0 +1,98 @@
+import json
+import random
+import secrets
+import time
+from hashlib import blake2b
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# ----------------------------
+# Stand-in OAuth Provider
+# ----------------------------
+# Serves Google- and GitHub-shaped endpoints under /google/ and /github/ for
+# offline tests (see OAUTH["STUB_URL"]). It is stateless: the access token
+# is the authorization code, and the user is derived from it, so each
+# distinct `code` sent to a callback signs in a distinct user.
+class StubOAuthHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients' connection pools are exercised as against a real provider.
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # and delayed ACKs add ~40 ms to every response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def handle_request(self, method):
+        url = urlsplit(self.path)
+        provider, _, endpoint = url.path.strip("/").partition("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        # `latency` and `failure_rate` are set on the server by make_stub_server.
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if random.random() < self.server.failure_rate:
+            return self.send_json(503, {"error": "temporarily_unavailable"})
+
+        if provider not in ("google", "github"):
+            return self.send_json(404, {"error": "not_found"})
+        if method == "GET" and endpoint == ".well-known/openid-configuration" and provider == "google":
+            base = f"http://{self.headers.get('Host')}/{provider}"
+            return self.send_json(200, {
+                "issuer": base,
+                "authorization_endpoint": f"{base}/authorize",
+                "token_endpoint": f"{base}/token",
+                "userinfo_endpoint": f"{base}/userinfo",
+            })
+        if method == "GET" and endpoint == "authorize":
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            query = urlencode({"code": f"stub-{secrets.token_hex(8)}", "state": params.get("state", "")})
+            self.send_response(302)
+            self.send_header("Location", f"{params.get('redirect_uri', '/')}?{query}")
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+        if method == "POST" and endpoint == "token":
+            code = parse_qs(body.decode()).get("code", [""])[0]
+            if not code:
+                return self.send_json(400, {"error": "invalid_grant"})
+            return self.send_json(200, {"access_token": code, "token_type": "bearer", "expires_in": 3600})
+        if method == "GET" and endpoint == "userinfo":
+            token = self.headers.get("Authorization", "").partition(" ")[2]
+            if not token:
+                return self.send_json(401, {"error": "invalid_token"})
+            return self.send_json(200, self.get_user(provider, token))
+        return self.send_json(404, {"error": "not_found"})
+
+    @staticmethod
+    def get_user(provider, token):
+        name = token[:150]
+        if provider == "google":
+            return {"sub": token, "email": f"{name}@oauth.test", "email_verified": True, "name": name}
+        return {"id": int(blake2b(token.encode(), digest_size=4).hexdigest(), 16), "login": name, "email": f"{name}@oauth.test"}
+
+    def send_json(self, status_code, data):
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_stub_server(host="127.0.0.1", port=0, latency=0.0, failure_rate=0.0):
+    """
+    Returns a ThreadingHTTPServer (not started) answering after `latency`
+    seconds and with 503 for `failure_rate` of requests. Port 0 picks a free port.
+    """
+    server = ThreadingHTTPServer((host, port), StubOAuthHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.failure_rate = failure_rate
+    return server
@@ -1,11 +1,12 @@
 from rest_framework import permissions
+from core.constants import ROLE_ADMIN
 
 class IsAdminOrStaffOrSuperuser(permissions.BasePermission):
     """
     Allows access only to users who are:
     - Staff (is_staff=True)
     - Superuser (is_superuser=True)
-    - Role is 'admin' (role='admin')
+    - Role is admin (role=ROLE_ADMIN)
     """
 
     def has_permission(self, request, view):
@@ -13,4 +14,4 @@ class IsAdminOrStaffOrSuperuser(permissions.BasePermission):
         if not user or not user.is_authenticated:
             return False
 
-        return user.is_staff or user.is_superuser or getattr(user, "role", None) == "admin"
+        return user.is_staff or user.is_superuser or getattr(user, "role", None) == ROLE_ADMIN
@@ -1,6 +1,6 @@
 from .models import User
 from rest_framework import serializers
-from core.constants import ROLE_CHOICES
+from core.constants import ROLE_CHOICES, ROLE_USER
 
 # ----------------------------
 # Register Serializer
@@ -17,10 +17,35 @@ class RegisterSerializer(serializers.ModelSerializer):
             email=validated_data["email"],
             username=validated_data["username"]
         )
-        user.set_password(validated_data["password"])
+        # AsyncRegisterView hashes off the event loop and passes the result to save().
+        if validated_data.get("encoded_password"):
+            user.password = validated_data["encoded_password"]
+        else:
+            user.set_password(validated_data["password"])
         user.save()
         return user
 
+# ----------------------------
+# User Import Serializer
+# ----------------------------
+class UserImportSerializer(serializers.Serializer):
+    """
+    One row of a bulk import (see accounts.importing). Uniqueness is checked
+    per batch by the importer rather than per row. Without a password the
+    user gets an unusable one and signs in via password reset or OAuth.
+    Roles other than ROLE_USER need `allow_any_role` in the context.
+    """
+    email = serializers.EmailField()
+    username = serializers.CharField(max_length=150)
+    password = serializers.CharField(min_length=6, default="", allow_blank=True)
+    role = serializers.ChoiceField(choices=ROLE_CHOICES, default=ROLE_USER)
+    is_verified = serializers.BooleanField(default=False)
+
+    def validate_role(self, value):
+        if value != ROLE_USER and not self.context.get("allow_any_role"):
+            raise serializers.ValidationError(f"Only superusers can import users with the {value} role.")
+        return value
+
 # ----------------------------
 # Verify Email Serializer
 # ----------------------------
@@ -1,3 +1,345 @@
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.cache import PrincipalCache
+from accounts.hashers import PASSWORD_HASHING_SETTINGS
+from accounts.importing import USER_IMPORT_SETTINGS, UserImporter, read_csv, read_ndjson
+from accounts.models import OneTimeToken, User, UserSession
+from core.constants import ROLE_ADMIN, ROLE_USER, TOKEN_EMAIL_VERIFICATION, TOKEN_PASSWORD_RESET
+from core.models import OutboxEmail
+from core.throttling import rate_limiter
+from ecommerce.models import Profile
+
+# ----------------------------
+# Refresh Token Sessions
+# ----------------------------
+class RefreshTokenRotationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="rotate@example.com", username="rotate", password="password123")
+        cls.other = User.objects.create_user(email="other@example.com", username="other", password="password123")
+        cls.url = reverse("accounts:refresh_token")
+
+    def refresh(self, token):
+        return self.client.post(self.url, {"refresh": token}, content_type="application/json")
+
+    def test_refresh_rotates_the_token(self):
+        token, _ = UserSession.objects.issue(self.user)
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()["data"]["refresh"]
+        self.assertNotEqual(rotated, token)
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+
+    def test_replaying_a_rotated_token_revokes_every_session(self):
+        laptop, _ = UserSession.objects.issue(self.user)
+        phone, _ = UserSession.objects.issue(self.user)
+        other, _ = UserSession.objects.issue(self.other)
+        rotated = self.refresh(laptop).json()["data"]["refresh"]
+
+        self.assertEqual(self.refresh(laptop).status_code, 400)
+        self.assertFalse(UserSession.objects.filter(user=self.user, revoked_at__isnull=True).exists())
+        self.assertEqual(self.refresh(rotated).status_code, 400)
+        self.assertEqual(self.refresh(phone).status_code, 400)
+        # Other users' sessions are untouched.
+        self.assertEqual(self.refresh(other).status_code, 200)
+
+# ----------------------------
+# One-Time Tokens
+# ----------------------------
+class OneTimeTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="once@example.com", username="once", password="password123")
+
+    def test_token_is_consumed_once(self):
+        token = OneTimeToken.objects.issue(self.user, TOKEN_EMAIL_VERIFICATION)
+        self.assertEqual(OneTimeToken.objects.consume(token, TOKEN_EMAIL_VERIFICATION), self.user)
+        self.assertIsNone(OneTimeToken.objects.consume(token, TOKEN_EMAIL_VERIFICATION))
+
+    def test_token_is_bound_to_its_purpose(self):
+        token = OneTimeToken.objects.issue(self.user, TOKEN_EMAIL_VERIFICATION)
+        self.assertIsNone(OneTimeToken.objects.consume(token, TOKEN_PASSWORD_RESET))
+        self.assertEqual(OneTimeToken.objects.consume(token, TOKEN_EMAIL_VERIFICATION), self.user)
+
+    def test_expired_token_is_rejected(self):
+        token = OneTimeToken.objects.issue(self.user, TOKEN_PASSWORD_RESET)
+        OneTimeToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(OneTimeToken.objects.consume(token, TOKEN_PASSWORD_RESET))
+
+    def test_reissuing_invalidates_earlier_tokens(self):
+        first = OneTimeToken.objects.issue(self.user, TOKEN_PASSWORD_RESET)
+        second = OneTimeToken.objects.issue(self.user, TOKEN_PASSWORD_RESET)
+        self.assertIsNone(OneTimeToken.objects.consume(first, TOKEN_PASSWORD_RESET))
+        self.assertEqual(OneTimeToken.objects.consume(second, TOKEN_PASSWORD_RESET), self.user)
+
+    def test_reset_password_link_works_once(self):
+        token = OneTimeToken.objects.issue(self.user, TOKEN_PASSWORD_RESET)
+        url = reverse("accounts:reset_password")
+        data = {"token": token, "new_password": "new-password"}
+
+        self.assertEqual(self.client.post(url, data, content_type="application/json").status_code, 200)
+        data["new_password"] = "another-password"
+        self.assertEqual(self.client.post(url, data, content_type="application/json").status_code, 400)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-password"))
+
+# ----------------------------
+# Async Login & Register
+# ----------------------------
+class AsyncAuthViewTests(TestCase):
+    login_url = reverse("accounts:async_login")
+    register_url = reverse("accounts:async_register")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="async@example.com", username="async", password="password123", is_verified=True,
+        )
+
+    def setUp(self):
+        rate_limiter.local.buckets.clear()
+
+    def post(self, url, data):
+        return self.client.post(url, data, content_type="application/json")
+
+    def test_login(self):
+        response = self.post(self.login_url, {"email": "async@example.com", "password": "password123"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["user"]["email"], "async@example.com")
+        self.assertTrue(UserSession.objects.filter(user=self.user).exists())
+
+        response = self.post(self.login_url, {"email": "async@example.com", "password": "wrong-password"})
+        self.assertEqual(response.status_code, 401)
+        response = self.post(self.login_url, {"email": "nobody@example.com", "password": "password123"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_login_rehashes_outdated_passwords(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password("password123", hasher="pbkdf2_sha1"))
+        response = self.post(self.login_url, {"email": "async@example.com", "password": "password123"})
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(self.user.check_password("password123"))
+
+    def test_register(self):
+        response = self.post(self.register_url, {"email": "new@example.com", "username": "new", "password": "password123"})
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username="new")
+        self.assertTrue(user.check_password("password123"))
+        self.assertTrue(Profile.objects.filter(owner=user).exists())
+        self.assertTrue(OutboxEmail.objects.filter(to_email="new@example.com", template_name="email_verification").exists())
+
+        response = self.post(self.register_url, {"email": "new@example.com", "username": "new", "password": "password123"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json()["data"])
+
+    def test_full_hashing_pool_answers_503(self):
+        with mock.patch.dict(PASSWORD_HASHING_SETTINGS, MAX_PENDING=0):
+            login = self.post(self.login_url, {"email": "async@example.com", "password": "password123"})
+            register = self.post(self.register_url, {"email": "busy@example.com", "username": "busy", "password": "password123"})
+        for response in (login, register):
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(User.objects.filter(username="busy").exists())
+
+# ----------------------------
+# Principal Cache
+# ----------------------------
+class PrincipalCacheTests(TestCase):
+    def test_local_only_cache_expires_quickly(self):
+        self.assertEqual(PrincipalCache(maxsize=10, ttl=60, local_ttl=5).local.ttl, 5)
+        self.assertEqual(PrincipalCache(maxsize=10, ttl=60, shared_alias="default", local_ttl=5).local.ttl, 60)
+
+    def test_save_invalidates_the_cached_principal(self):
+        user = User.objects.create_user(email="cached@example.com", username="cached", password="password123")
+        cache = PrincipalCache(maxsize=10, ttl=60)
+        with mock.patch("accounts.models.principal_cache", cache):
+            cache.get_user(user.id, lambda: User.objects.get(id=user.id))
+            user.is_active = False
+            user.save()
+            reloaded = cache.get_user(user.id, lambda: User.objects.get(id=user.id))
+        self.assertFalse(reloaded.is_active)
+
+    def test_bulk_updates_invalidate_the_cached_principals(self):
+        user = User.objects.create_user(email="bulk@example.com", username="bulk", password="password123")
+        cache = PrincipalCache(maxsize=10, ttl=60)
+
+        def load():
+            return cache.get_user(user.id, lambda: User.objects.get(id=user.id))
+
+        with mock.patch("accounts.managers.principal_cache", cache):
+            load()
+            User.objects.filter(pk=user.pk).update(role=ROLE_ADMIN)
+            self.assertEqual(load().role, ROLE_ADMIN)
+
+            # The update changes the field it filters on.
+            User.active_objects.filter(pk=user.pk).update(is_active=False)
+            self.assertFalse(load().is_active)
+
+            user.is_staff = True
+            User.all_objects.bulk_update([user], ["is_staff"])
+            self.assertTrue(load().is_staff)
+
+# ----------------------------
+# User Deactivation
+# ----------------------------
+class UserDeactivationTests(TestCase):
+    def test_delete_deactivates_instead_of_soft_deleting(self):
+        user = User.objects.create_user(email="leaving@example.com", username="leaving", password="password123")
+        user.delete()
+        user = User.all_objects.get(pk=user.pk)
+        self.assertFalse(user.is_active)
+        self.assertIsNone(user.deleted_at)
+        self.assertTrue(User.objects.filter(pk=user.pk).exists())
+        self.assertFalse(User.active_objects.filter(pk=user.pk).exists())
+        user.restore()
+        self.assertTrue(User.active_objects.filter(pk=user.pk).exists())
+
+# ----------------------------
+# Bulk User Import
+# ----------------------------
+def to_lines(text):
+    return [line.encode() for line in text.splitlines(keepends=True)]
+
+
+class UserImporterTests(TestCase):
+    def test_valid_rows_are_created_with_profiles(self):
+        rows = read_csv(to_lines(
+            "email,username,password,is_verified\n"
+            "Ana@Example.com,ana,secret-password,true\n"
+            "ben@example.com,ben,,\n"
+        ))
+        result = UserImporter(batch_size=1).run(rows)
+
+        self.assertEqual((result.created, result.failed), (2, 0))
+        ana = User.objects.get(username="ana")
+        self.assertEqual(ana.email, "Ana@example.com")
+        self.assertTrue(ana.check_password("secret-password"))
+        self.assertTrue(ana.is_verified)
+        self.assertEqual(ana.role, ROLE_USER)
+        self.assertFalse(User.objects.get(username="ben").has_usable_password())
+        self.assertEqual(Profile.objects.filter(owner__username__in=["ana", "ben"]).count(), 2)
+
+    def test_bad_rows_are_reported_and_skipped(self):
+        User.objects.create_user(email="taken@example.com", username="taken", password="password123")
+        rows = read_ndjson(to_lines(
+            '{"email": "one@example.com", "username": "one"}\n'
+            "not json\n"
+            "[1, 2]\n"
+            '{"email": "not-an-email", "username": "two"}\n'
+            '{"email": "one@example.com", "username": "again"}\n'
+            '{"email": "taken@example.com", "username": "three"}\n'
+            '{"email": "four@example.com", "username": "taken"}\n'
+        ))
+        result = UserImporter().run(rows)
+
+        self.assertEqual((result.created, result.failed), (1, 6))
+        self.assertEqual([error["line"] for error in result.errors], [2, 3, 4, 5, 6, 7])
+        self.assertIn("email", result.errors[2]["errors"])
+        self.assertTrue(User.objects.filter(username="one").exists())
+
+    def test_admin_role_needs_allow_any_role(self):
+        row = '{"email": "boss@example.com", "username": "boss", "role": "ADMIN"}\n'
+        result = UserImporter().run(read_ndjson(to_lines(row)))
+        self.assertEqual((result.created, result.failed), (0, 1))
+        self.assertIn("role", result.errors[0]["errors"])
+
+        result = UserImporter(allow_any_role=True).run(read_ndjson(to_lines(row)))
+        self.assertEqual(result.created, 1)
+        self.assertEqual(User.objects.get(username="boss").role, ROLE_ADMIN)
+
+    def test_rows_past_max_rows_are_not_read(self):
+        rows = read_csv(to_lines("email,username\n" + "".join(f"u{i}@example.com,u{i}\n" for i in range(5))))
+        result = UserImporter().run(rows, max_rows=3)
+        self.assertEqual(result.created, 3)
+        self.assertTrue(result.truncated)
+
+    def test_command_imports_a_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as f:
+            f.write(json.dumps({"email": "cli@example.com", "username": "cli", "role": "ADMIN"}) + "\n")
+            f.flush()
+            out = StringIO()
+            call_command("import_users", f.name, workers=0, stdout=out, stderr=StringIO())
+        self.assertIn("Imported 1 users (0 rows failed)", out.getvalue())
+        self.assertEqual(User.objects.get(username="cli").role, ROLE_ADMIN)
+
+
+@mock.patch.dict(USER_IMPORT_SETTINGS, WORKERS=0)
+class ImportUsersViewTests(TestCase):
+    url = reverse("accounts:import_users")
+    csv = "email,username,role\nnew@example.com,new,USER\nboss@example.com,boss,ADMIN\n"
+
+    def post(self, user, body, content_type="text/csv"):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {user.generate_access_token()}"
+        return self.client.post(self.url, body, content_type=content_type)
+
+    def create_user(self, username, **fields):
+        return User.objects.create_user(
+            email=f"{username}@example.com", username=username, password="password123", **fields
+        )
+
+    def test_regular_users_are_forbidden(self):
+        response = self.post(self.create_user("regular"), self.csv)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(User.objects.filter(username="new").exists())
+
+    def test_staff_can_only_import_regular_users(self):
+        response = self.post(self.create_user("staff", is_staff=True), self.csv)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual((data["created"], data["failed"]), (1, 1))
+        self.assertEqual(data["errors"][0]["line"], 3)
+        self.assertIn("role", data["errors"][0]["errors"])
+        self.assertFalse(User.objects.filter(username="boss").exists())
+
+    def test_superusers_can_import_admins(self):
+        superuser = User.objects.create_superuser(email="root@example.com", username="root", password="password123")
+        response = self.post(superuser, self.csv)
+        self.assertEqual(response.json()["data"]["created"], 2)
+        self.assertEqual(User.objects.get(username="boss").role, ROLE_ADMIN)
+
+    def test_ndjson_is_accepted(self):
+        body = '{"email": "nd@example.com", "username": "nd"}\n'
+        response = self.post(self.create_user("staff", is_staff=True), body, "application/x-ndjson")
+        self.assertEqual(response.json()["data"]["created"], 1)
+
+    def test_other_content_types_are_rejected(self):
+        response = self.post(self.create_user("staff", is_staff=True), {"email": "x"}, "application/json")
+        self.assertEqual(response.status_code, 415)
+
+    @mock.patch.dict(USER_IMPORT_SETTINGS, MAX_ROWS=1)
+    def test_rows_past_max_rows_are_truncated(self):
+        response = self.post(self.create_user("staff", is_staff=True), self.csv)
+        data = response.json()
+        self.assertFalse(data["success"])
+        self.assertTrue(data["data"]["truncated"])
+        self.assertEqual(data["data"]["created"], 1)
+
+# ----------------------------
+# Admin Permission
+# ----------------------------
+class AdminPermissionTests(TestCase):
+    url = reverse("accounts:change_role")
+
+    def change_role(self, user):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {user.generate_access_token()}"
+        return self.client.patch(self.url, {"role": ROLE_USER}, content_type="application/json")
+
+    def test_admin_role_is_allowed(self):
+        admin = User.objects.create_user(email="admin@example.com", username="admin", password="password123", role=ROLE_ADMIN)
+        self.assertEqual(self.change_role(admin).status_code, 200)
 
-# Create your tests here.
+    def test_user_role_is_forbidden(self):
+        user = User.objects.create_user(email="user@example.com", username="user", password="password123")
+        self.assertEqual(self.change_role(user).status_code, 403)
@@ -4,6 +4,8 @@ from .views import (
     RegisterView,
     VerifyEmailView,
     LoginView,
+    AsyncLoginView,
+    AsyncRegisterView,
     LogoutView,
     RefreshTokenView,
     ForgotPasswordView,
@@ -17,6 +19,7 @@ from .views import (
     GitHubLoginView,
     GitHubLoginCallbackView,
     ChangeRoleView,
+    ImportUsersView,
 )
 from django.conf.urls.static import static
 
@@ -26,11 +29,14 @@ from django.conf.urls.static import static
 urlpatterns = [
     # Registration & Email Verification
     path("register/", RegisterView.as_view(), name="register"),
+    path("register/async/", AsyncRegisterView.as_view(), name="async_register"),
     path("verify-email/", VerifyEmailView.as_view(), name="verify_email"),
     path("resend-email-verification/", ResendEmailVerificationView.as_view(), name="resend_email_verification"),
 
     # Authentication
     path("login/", LoginView.as_view(), name="login"),
+    # Async variant for ASGI servers; the password is checked off the event loop.
+    path("login/async/", AsyncLoginView.as_view(), name="async_login"),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("refresh-token/", RefreshTokenView.as_view(), name="refresh_token"),
 
@@ -43,6 +49,7 @@ urlpatterns = [
     path("current/", CurrentUserView.as_view(), name="current_user"),
     path("update-avatar/", UpdateAvatarView.as_view(), name="update_avatar"),
     path("change-role/", ChangeRoleView.as_view(), name="change_role"),
+    path("import/", ImportUsersView.as_view(), name="import_users"),
 
     # Google OAuth
     path("google/", GoogleLoginView.as_view(), name="google_login"),
@@ -1,11 +1,17 @@
+import json
+import math
 import urllib.parse
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate
-from django.utils import timezone
+from django.db import transaction
 from django.conf import settings
-import jwt, hashlib, secrets, requests
-from .models import User
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+import jwt
+from .models import User, UserSession, OneTimeToken
 from .serializers import (
     RegisterSerializer, 
     LoginSerializer, 
@@ -19,13 +25,28 @@ from .serializers import (
     ChangeRoleSerializer,
     OAuthCallbackSerializer
 )
-from core.utils import send_email, api_response
+from .hashers import HashingPoolFull, aauthenticate, ahash_password
+from .importing import FORMATS as IMPORT_FORMATS, READERS as IMPORT_READERS, USER_IMPORT_SETTINGS, UserImporter, get_hashing_pool
+from .oauth import provider_metadata
+from core.http_client import HTTPClientError, http_client
+from core.throttling import check_rate_limit, get_client_ident
+from core.utils import send_email, api_response, json_response
 from .permissions import IsAdminOrStaffOrSuperuser
-from core.constants import LOGIN_GOOGLE, LOGIN_GITHUB
+from core.constants import LOGIN_GOOGLE, LOGIN_GITHUB, TOKEN_EMAIL_VERIFICATION, TOKEN_PASSWORD_RESET
 
 # ----------------------
 # Register with email verification
 # ----------------------
+def send_verification_email(user):
+    un_hashed = OneTimeToken.objects.issue(user, TOKEN_EMAIL_VERIFICATION)
+    send_email(
+        to_email=user.email,
+        subject="Verify your email",
+        template_name="email_verification",
+        context={"username": user.username, "verification_code": un_hashed}
+    )
+
+
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
@@ -34,22 +55,7 @@ class RegisterView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-
-        un_hashed = secrets.token_hex(20)
-        hashed = hashlib.sha256(un_hashed.encode()).hexdigest()
-        expiry = timezone.now() + timezone.timedelta(minutes=10)
-
-        user.email_verification_token = hashed
-        user.email_verification_expiry = expiry
-        user.save(update_fields=["email_verification_token", "email_verification_expiry"])
-
-        verify_link = f"{settings.FRONTEND_URL}/verify-email/{un_hashed}"
-        send_email(
-            to_email=user.email,
-            subject="Verify your email",
-            template_name="email_verification",
-            context={"username": user.username, "verification_code": un_hashed}
-        )
+        send_verification_email(user)
 
         return api_response(
             success=True,
@@ -69,21 +75,13 @@ class VerifyEmailView(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        token = serializer.validated_data["token"]
-        hashed_token = hashlib.sha256(token.encode()).hexdigest()
+        with transaction.atomic():
+            user = OneTimeToken.objects.consume(serializer.validated_data["token"], TOKEN_EMAIL_VERIFICATION)
+            if not user:
+                return api_response(success=False, message="Invalid or expired token", status_code=status.HTTP_400_BAD_REQUEST)
 
-        user = User.objects.filter(
-            email_verification_token=hashed_token,
-            email_verification_expiry__gt=timezone.now()
-        ).first()
-
-        if not user:
-            return api_response(success=False, message="Invalid or expired token", status_code=status.HTTP_400_BAD_REQUEST)
-
-        user.is_verified = True
-        user.email_verification_token = None
-        user.email_verification_expiry = None
-        user.save(update_fields=["is_verified", "email_verification_token", "email_verification_expiry"])
+            user.is_verified = True
+            user.save(update_fields=["is_verified"])
 
         return api_response(success=True, message="Email verified successfully")
 
@@ -106,9 +104,7 @@ class LoginView(generics.GenericAPIView):
             return api_response(success=False, message="Email not verified", status_code=status.HTTP_403_FORBIDDEN)
 
         access_token = user.generate_access_token()
-        refresh_token = user.generate_refresh_token()
-        user.refresh_token = refresh_token
-        user.save(update_fields=["refresh_token"])
+        refresh_token, _ = UserSession.objects.issue(user, request)
 
         return api_response(
             success=True,
@@ -117,6 +113,93 @@ class LoginView(generics.GenericAPIView):
             status_code=status.HTTP_200_OK
         )
 
+# ----------------------
+# Async Login & Register (ASGI)
+# ----------------------
+@method_decorator(csrf_exempt, name="dispatch")
+class BaseAsyncAuthView(View):
+    """
+    Async counterparts of LoginView and RegisterView for ASGI servers, where
+    sync views share one thread and a hashing-bound login would stall them
+    all. Passwords are hashed in accounts.hashers.hashing_pool.
+
+    DRF's APIView is sync-only, so these are plain Django views: they parse
+    JSON bodies, run the serializer and apply THROTTLING policies themselves.
+    Subclasses implement `async def handle(self, request, serializer)`,
+    called with a validated serializer.
+    """
+    serializer_class = None
+
+    async def post(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return json_response(success=False, message="JSON parse error", status_code=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(payload, dict):
+            payload = {}
+
+        email = payload.get("email")
+        rate_limit = check_rate_limit(request, get_client_ident(request), email=email if isinstance(email, str) else None)
+        if rate_limit is not None and not rate_limit.allowed:
+            return json_response(
+                success=False,
+                message=f"Request was throttled. Expected available in {math.ceil(rate_limit.reset)} seconds.",
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+
+        serializer = self.serializer_class(data=payload)
+        if not await sync_to_async(serializer.is_valid)():
+            return json_response(
+                success=False, message="Invalid data", data=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            return await self.handle(request, serializer)
+        except HashingPoolFull:
+            response = json_response(
+                success=False, message="Server busy, please retry", status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response["Retry-After"] = "1"
+            return response
+
+
+class AsyncLoginView(BaseAsyncAuthView):
+    serializer_class = LoginSerializer
+
+    async def handle(self, request, serializer):
+        data = serializer.validated_data
+        user = await aauthenticate(data["email"], data["password"])
+        if not user:
+            return json_response(success=False, message="Invalid credentials", status_code=status.HTTP_401_UNAUTHORIZED)
+
+        if not user.is_verified:
+            return json_response(success=False, message="Email not verified", status_code=status.HTTP_403_FORBIDDEN)
+
+        access_token = user.generate_access_token()
+        refresh_token, _ = await sync_to_async(UserSession.objects.issue)(user, request)
+
+        return json_response(
+            success=True,
+            message="Login successful",
+            data={"user": UserSerializer(user).data, "access": access_token, "refresh": refresh_token},
+        )
+
+
+class AsyncRegisterView(BaseAsyncAuthView):
+    serializer_class = RegisterSerializer
+
+    async def handle(self, request, serializer):
+        encoded_password = await ahash_password(serializer.validated_data["password"])
+        user = await sync_to_async(serializer.save)(encoded_password=encoded_password)
+        await sync_to_async(send_verification_email)(user)
+
+        return json_response(
+            success=True,
+            message="User registered successfully. Please verify your email.",
+            data={"user": UserSerializer(user).data},
+            status_code=status.HTTP_201_CREATED
+        )
+
 # ----------------------
 # Logout
 # ----------------------
@@ -128,8 +211,12 @@ class LogoutView(generics.GenericAPIView):
         return None 
 
     def post(self, request):
-        request.user.refresh_token = None
-        request.user.save(update_fields=["refresh_token"])
+        # Logs out the session of the given refresh token, or every device if none is given.
+        refresh = request.data.get("refresh")
+        if refresh:
+            UserSession.objects.revoke(refresh, user=request.user)
+        else:
+            UserSession.objects.revoke_all(request.user.id)
         return api_response(success=True, message="Logged out successfully")
 
 # ----------------------
@@ -143,13 +230,18 @@ class RefreshTokenView(generics.GenericAPIView):
         if not refresh:
             return api_response(success=False, message="Refresh token required", status_code=status.HTTP_400_BAD_REQUEST)
         try:
-            payload = jwt.decode(refresh, settings.SECRET_KEY, algorithms=["HS256"])
-            user = User.objects.get(id=payload["id"], refresh_token=refresh)
-            access = user.generate_access_token()
-            return api_response(success=True, message="Access token generated", data={"access": access})
-        except:
+            jwt.decode(refresh, settings.SECRET_KEY, algorithms=["HS256"])
+        except jwt.InvalidTokenError:
+            return api_response(success=False, message="Invalid refresh token", status_code=status.HTTP_400_BAD_REQUEST)
+
+        rotated = UserSession.objects.rotate(refresh, request)
+        if not rotated:
             return api_response(success=False, message="Invalid refresh token", status_code=status.HTTP_400_BAD_REQUEST)
 
+        refresh, session = rotated
+        access = session.user.generate_access_token()
+        return api_response(success=True, message="Access token generated", data={"access": access, "refresh": refresh})
+
 # ----------------------
 # Forgot Password
 # ----------------------
@@ -163,13 +255,7 @@ class ForgotPasswordView(generics.GenericAPIView):
         user = User.objects.filter(email=serializer.validated_data["email"]).first()
 
         if user:
-            un_hashed = secrets.token_hex(20)
-            hashed = hashlib.sha256(un_hashed.encode()).hexdigest()
-            expiry = timezone.now() + timezone.timedelta(minutes=10)
-
-            user.forgot_password_token = hashed
-            user.forgot_password_expiry = expiry
-            user.save(update_fields=["forgot_password_token", "forgot_password_expiry"])
+            un_hashed = OneTimeToken.objects.issue(user, TOKEN_PASSWORD_RESET)
 
             reset_link = f"{settings.FRONTEND_URL}/reset-password/{un_hashed}"
             send_email(to_email=user.email, subject="Reset Password", template_name="reset_password",
@@ -188,17 +274,13 @@ class ResetPasswordView(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        token = serializer.validated_data["token"]
-        hashed_token = hashlib.sha256(token.encode()).hexdigest()
-        user = User.objects.filter(forgot_password_token=hashed_token, forgot_password_expiry__gt=timezone.now()).first()
+        with transaction.atomic():
+            user = OneTimeToken.objects.consume(serializer.validated_data["token"], TOKEN_PASSWORD_RESET)
+            if not user:
+                return api_response(success=False, message="Invalid or expired token", status_code=status.HTTP_400_BAD_REQUEST)
 
-        if not user:
-            return api_response(success=False, message="Invalid or expired token", status_code=status.HTTP_400_BAD_REQUEST)
-
-        user.set_password(serializer.validated_data["new_password"])
-        user.forgot_password_token = None
-        user.forgot_password_expiry = None
-        user.save(update_fields=["password", "forgot_password_token", "forgot_password_expiry"])
+            user.set_password(serializer.validated_data["new_password"])
+            user.save(update_fields=["password"])
 
         return api_response(success=True, message="Password reset successful")
 
@@ -233,13 +315,7 @@ class ResendEmailVerificationView(generics.GenericAPIView):
 
         user = serializer.validated_data["user"]
 
-        un_hashed = secrets.token_hex(20)
-        hashed = hashlib.sha256(un_hashed.encode()).hexdigest()
-        expiry = timezone.now() + timezone.timedelta(minutes=10)
-
-        user.email_verification_token = hashed
-        user.email_verification_expiry = expiry
-        user.save(update_fields=["email_verification_token", "email_verification_expiry"])
+        un_hashed = OneTimeToken.objects.issue(user, TOKEN_EMAIL_VERIFICATION)
 
         verify_link = f"{settings.FRONTEND_URL}/verify-email/{un_hashed}"
 
@@ -306,6 +382,15 @@ class UpdateAvatarView(generics.UpdateAPIView):
 # ----------------------
 # Google OAuth Login
 # ----------------------
+def oauth_unavailable(provider):
+    """Response for a provider that timed out, could not be reached or sent a malformed reply."""
+    return api_response(
+        success=False,
+        message=f"{provider} is unavailable, please try again",
+        status_code=status.HTTP_502_BAD_GATEWAY
+    )
+
+
 class GoogleLoginView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
     
@@ -315,7 +400,7 @@ class GoogleLoginView(generics.GenericAPIView):
         scope = urllib.parse.quote("openid email profile")
 
         auth_url = (
-            f"https://accounts.google.com/o/oauth2/v2/auth?"
+            f"{provider_metadata.get('google')['authorization_endpoint']}?"
             f"response_type=code&client_id={google_client_id}"
             f"&redirect_uri={redirect_uri}"
             f"&scope={scope}"
@@ -341,7 +426,7 @@ class GoogleLoginCallbackView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         code = serializer.validated_data["code"]
 
-        token_url = "https://oauth2.googleapis.com/token"
+        metadata = provider_metadata.get("google")
         data = {
             "code": code,
             "client_id": settings.GOOGLE_CLIENT_ID,
@@ -350,7 +435,10 @@ class GoogleLoginCallbackView(generics.GenericAPIView):
             "grant_type": "authorization_code",
         }
 
-        token_res = requests.post(token_url, data=data).json()
+        try:
+            token_res = http_client.post(metadata["token_endpoint"], data=data).json()
+        except (HTTPClientError, ValueError):
+            return oauth_unavailable("Google")
         google_access_token = token_res.get("access_token")
 
         if not google_access_token:
@@ -360,9 +448,11 @@ class GoogleLoginCallbackView(generics.GenericAPIView):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
 
-        user_info_url = "https://www.googleapis.com/oauth2/v3/userinfo"
         headers = {"Authorization": f"Bearer {google_access_token}"}
-        user_info = requests.get(user_info_url, headers=headers).json()
+        try:
+            user_info = http_client.get(metadata["userinfo_endpoint"], headers=headers).json()
+        except (HTTPClientError, ValueError):
+            return oauth_unavailable("Google")
 
         email = user_info.get("email")
         name = user_info.get("name")
@@ -383,9 +473,7 @@ class GoogleLoginCallbackView(generics.GenericAPIView):
             user.save(update_fields=["username", "is_verified"])
 
         access = user.generate_access_token()
-        refresh = user.generate_refresh_token()
-        user.refresh_token = refresh
-        user.save(update_fields=["refresh_token"])
+        refresh, _ = UserSession.objects.issue(user, request)
 
         return api_response(
             success=True,
@@ -407,7 +495,7 @@ class GitHubLoginView(APIView):
     def get(self, request):
         client_id = settings.GITHUB_CLIENT_ID
         redirect_uri = settings.GITHUB_REDIRECT_URI
-        auth_url = f"https://github.com/login/oauth/authorize?client_id={client_id}&redirect_uri={redirect_uri}&scope=user:email"
+        auth_url = f"{provider_metadata.get('github')['authorization_endpoint']}?client_id={client_id}&redirect_uri={redirect_uri}&scope=user:email"
         
         return api_response(
             success=True,
@@ -428,14 +516,17 @@ class GitHubLoginCallbackView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         code = serializer.validated_data["code"]
 
-        token_url = "https://github.com/login/oauth/access_token"
+        metadata = provider_metadata.get("github")
         data = {
             "client_id": settings.GITHUB_CLIENT_ID,
             "client_secret": settings.GITHUB_CLIENT_SECRET,
             "code": code,
         }
         headers = {"Accept": "application/json"}
-        token_res = requests.post(token_url, data=data, headers=headers).json()
+        try:
+            token_res = http_client.post(metadata["token_endpoint"], data=data, headers=headers).json()
+        except (HTTPClientError, ValueError):
+            return oauth_unavailable("GitHub")
 
         access_token = token_res.get("access_token")
         if not access_token:
@@ -445,9 +536,11 @@ class GitHubLoginCallbackView(generics.GenericAPIView):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
 
-        user_info_url = "https://api.github.com/user"
         headers = {"Authorization": f"token {access_token}"}
-        user_info = requests.get(user_info_url, headers=headers).json()
+        try:
+            user_info = http_client.get(metadata["userinfo_endpoint"], headers=headers).json()
+        except (HTTPClientError, ValueError):
+            return oauth_unavailable("GitHub")
 
         email = user_info.get("email")
         username = user_info.get("login")
@@ -469,9 +562,7 @@ class GitHubLoginCallbackView(generics.GenericAPIView):
             user.save(update_fields=["username", "is_verified"])
 
         access = user.generate_access_token()
-        refresh = user.generate_refresh_token()
-        user.refresh_token = refresh
-        user.save(update_fields=["refresh_token"])
+        refresh, _ = UserSession.objects.issue(user, request)
 
         return api_response(
             success=True,
@@ -507,3 +598,50 @@ class ChangeRoleView(generics.GenericAPIView):
             data={"role": user.role},
             status_code=status.HTTP_200_OK
         )
+
+# ----------------------
+# Bulk User Import
+# ----------------------
+class ImportUsersView(APIView):
+    """
+    Creates users from a CSV (text/csv) or NDJSON (application/x-ndjson)
+    request body, read as a stream; see accounts.importing. At most
+    USER_IMPORT["MAX_ROWS"] rows are read per request; use `manage.py
+    import_users` for larger files. Only superusers may import users with
+    a role other than USER.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrStaffOrSuperuser]
+    # The body is read row by row below, never parsed as a whole.
+    parser_classes = []
+
+    def post(self, request):
+        fmt = next((fmt for fmt, content_type in IMPORT_FORMATS.items() if content_type == request.content_type), None)
+        if fmt is None:
+            return api_response(
+                success=False,
+                message=f"Content-Type must be one of: {', '.join(IMPORT_FORMATS.values())}",
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        importer = UserImporter(
+            executor=get_hashing_pool(),
+            max_errors=USER_IMPORT_SETTINGS["MAX_ERRORS"],
+            allow_any_role=request.user.is_superuser,
+        )
+        result = importer.run(IMPORT_READERS[fmt](request._request), max_rows=USER_IMPORT_SETTINGS["MAX_ROWS"])
+
+        message = f"{result.created} users created, {result.failed} rows failed."
+        if result.truncated:
+            message += f" Only the first {USER_IMPORT_SETTINGS['MAX_ROWS']} rows were read."
+        return api_response(
+            success=result.failed == 0 and not result.truncated,
+            message=message,
+            data={
+                "created": result.created,
+                "failed": result.failed,
+                "truncated": result.truncated,
+                "errors": result.errors,
+                "elapsed_ms": round(result.elapsed * 1000, 1),
+            },
+            status_code=status.HTTP_200_OK,
+        )
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class ApisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apis'
+
+    def ready(self):
+        from apis.catalog import status_code_catalog
+
+        # Build the catalog at startup rather than on the first request.
+        try:
+            status_code_catalog.get_all()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,164 @@
+import mmap
+import os
+import re
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+ASSET_SETTINGS = {
+    "DIRECTORY": os.path.join(settings.BASE_DIR, "static", "assets", "images"),
+    "MEMORY_LIMIT": 256 * 1024,
+    "MAX_AGE": 86400,
+    "CHUNK_SIZE": 64 * 1024,
+    "CHECK_INTERVAL": 1.0,
+    **getattr(settings, "ASSET_SERVING", {}),
+}
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# ----------------------------
+# Cached Assets
+# ----------------------------
+class Asset:
+    """
+    Bytes plus validators for one response body. Files up to MEMORY_LIMIT are
+    held as bytes; larger ones are memory-mapped, so neither opens a file per request.
+    """
+
+    def __init__(self, data, content_type, last_modified, path=None, mtime_ns=None):
+        self.data = data
+        self.path = path
+        self.content_type = content_type
+        self.last_modified = last_modified
+        self.mtime_ns = mtime_ns
+        self.size = len(data)
+
+        digest = blake2b(digest_size=16)
+        for start in range(0, self.size, ASSET_SETTINGS["CHUNK_SIZE"]):
+            digest.update(self.data[start:start + ASSET_SETTINGS["CHUNK_SIZE"]])
+        self.etag = f'"{digest.hexdigest()}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Last-Modified": http_date(self.last_modified),
+            "Cache-Control": f"public, max-age={ASSET_SETTINGS['MAX_AGE']}",
+            "Accept-Ranges": "bytes",
+        }
+
+    @classmethod
+    def from_file(cls, path, content_type):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size <= ASSET_SETTINGS["MEMORY_LIMIT"]:
+                data = f.read()
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, content_type, stat.st_mtime, path, stat.st_mtime_ns)
+
+    def read(self, start, end):
+        """Yields bytes [start, end) of a memory-mapped file in CHUNK_SIZE pieces."""
+        for offset in range(start, end, ASSET_SETTINGS["CHUNK_SIZE"]):
+            yield self.data[offset:min(offset + ASSET_SETTINGS["CHUNK_SIZE"], end)]
+
+
+class AssetCache:
+    """Assets by filename. A file is re-read when its mtime changes, checked at most every CHECK_INTERVAL seconds."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.lock = Lock()
+        self.assets = {}
+
+    def get(self, filename, content_type):
+        """Returns the cached Asset. Raises FileNotFoundError if the file is missing."""
+        entry = self.assets.get(filename)
+        if entry is not None and monotonic() - entry[1] < ASSET_SETTINGS["CHECK_INTERVAL"]:
+            return entry[0]
+
+        path = os.path.join(self.directory, filename)
+        with self.lock:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                self.assets.pop(filename, None)
+                raise
+            asset = entry[0] if entry is not None else None
+            if asset is None or asset.mtime_ns != mtime_ns or asset.content_type != content_type:
+                asset = Asset.from_file(path, content_type)
+            self.assets[filename] = (asset, monotonic())
+            return asset
+
+
+asset_cache = AssetCache(ASSET_SETTINGS["DIRECTORY"])
+
+# ----------------------------
+# Responses
+# ----------------------------
+def is_not_modified(request, asset):
+    """If-None-Match wins over If-Modified-Since (RFC 9110 §13.2.2)."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        return "*" in etags or asset.etag in etags or f"W/{asset.etag}" in etags
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    return if_modified_since is not None and int(asset.last_modified) <= if_modified_since
+
+
+def get_range(request, asset):
+    """
+    Returns (start, end) for a single satisfiable `bytes=` range, "invalid" if
+    it cannot be satisfied, or None to send the whole file (no Range header,
+    multiple ranges, or a stale If-Range).
+    """
+    header = request.headers.get("Range")
+    if not header or request.method != "GET":
+        return None
+
+    if_range = request.headers.get("If-Range")
+    if if_range is not None and if_range != asset.etag:
+        if_range_date = parse_http_date_safe(if_range)
+        if if_range_date is None or int(asset.last_modified) > if_range_date:
+            return None
+
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last) + 1, asset.size) if last else asset.size
+        if start >= asset.size or (last and int(last) < start):
+            return "invalid"
+    else:
+        suffix = int(last)
+        if suffix == 0:
+            return "invalid"
+        start, end = max(asset.size - suffix, 0), asset.size
+    return start, end
+
+
+def serve_asset(request, asset):
+    """Returns a 200, 206, 304 or 416 response for `asset`."""
+    headers = dict(asset.headers)
+    if is_not_modified(request, asset):
+        response = HttpResponseNotModified()
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    byte_range = get_range(request, asset)
+    if byte_range == "invalid":
+        return HttpResponse(status=416, headers={**headers, "Content-Range": f"bytes */{asset.size}"})
+
+    status, (start, end) = (200, (0, asset.size)) if byte_range is None else (206, byte_range)
+    if status == 206:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{asset.size}"
+    headers["Content-Length"] = str(end - start)
+
+    if isinstance(asset.data, bytes):
+        return HttpResponse(asset.data[start:end], status=status, content_type=asset.content_type, headers=headers)
+    return StreamingHttpResponse(asset.read(start, end), status=status, content_type=asset.content_type, headers=headers)
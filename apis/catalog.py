@@ -0,0 +1,101 @@
+import json
+import os
+from collections import namedtuple
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+
+from core.utils import build_cached_response
+
+# Conflict with HTTP semantics (no body, or an interim response), so they are served as 200.
+CONFLICTING_CODES = {100, 102, 103, 204, 205, 304}
+
+# ----------------------------
+# Precomputed Responses
+# ----------------------------
+# `cached` is the JSON response rendered once; the other fields rebuild it
+# through `api_response` for the other negotiated renderers (MessagePack,
+# CBOR, browsable API).
+CatalogEntry = namedtuple("CatalogEntry", ["message", "data", "status", "cached"])
+
+
+def get_json_renderer():
+    """The first JSON renderer of DEFAULT_RENDERER_CLASSES, i.e. the one negotiated for compact JSON."""
+    return next(renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES if renderer.format == "json")()
+
+
+def build_entry(message, data, status):
+    """
+    Renders an `api_response` envelope once with the configured JSON renderer,
+    so the bytes and ETag match what it would produce per request.
+    """
+    body = get_json_renderer().render({"success": True, "message": message, "data": data})
+    return CatalogEntry(message, data, status, build_cached_response(body, status))
+
+# ----------------------------
+# Status Code Catalog
+# ----------------------------
+class StatusCodeCatalog:
+    """
+    `data/status-codes.json` loaded once into an int-keyed index with every
+    JSON response pre-rendered. The file is re-read when its mtime changes (checked
+    at most every `check_interval` seconds) and the index swapped in one
+    assignment, so readers never see a half-built catalog.
+    """
+
+    check_interval = 1.0
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+        self.snapshot = None
+        self.checked_at = 0.0
+
+    def get_all(self):
+        """CatalogEntry for the whole catalog. Raises FileNotFoundError if the file is missing."""
+        return self.get_snapshot()["all"]
+
+    def get(self, code):
+        """CatalogEntry for one code, or None if the code is unknown. Raises FileNotFoundError if the file is missing."""
+        return self.get_snapshot()["codes"].get(code)
+
+    def get_snapshot(self):
+        snapshot = self.snapshot
+        if snapshot is not None and monotonic() - self.checked_at < self.check_interval:
+            return snapshot
+
+        with self.lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                self.snapshot = None
+                raise
+            if self.snapshot is None or self.snapshot["mtime"] != mtime:
+                self.snapshot = self.load(mtime)
+            self.checked_at = monotonic()
+            return self.snapshot
+
+    def load(self, mtime):
+        with open(self.path, "r") as f:
+            status_codes = json.load(f)
+
+        codes = {}
+        for category, entries in status_codes.items():
+            for code, payload in entries.items():
+                code = int(code)
+                codes[code] = build_entry(
+                    message=f"{code}: {payload['phrase']}",
+                    data={**payload, "statusCode": code, "category": category},
+                    status=200 if code in CONFLICTING_CODES else code,
+                )
+
+        return {
+            "mtime": mtime,
+            "all": build_entry("Status codes fetched.", status_codes, 200),
+            "codes": codes,
+        }
+
+
+status_code_catalog = StatusCodeCatalog(os.path.join(settings.BASE_DIR, "data", "status-codes.json"))
@@ -0,0 +1,183 @@
+import mmap
+import os
+import socket
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+
+GEOIP_SETTINGS = {
+    "PATH": os.path.join(settings.BASE_DIR, "data", "geoip.bin"),
+    "CHECK_INTERVAL": 5.0,
+    **getattr(settings, "GEOIP", {}),
+}
+
+# ----------------------------
+# Binary Range Index
+# ----------------------------
+# Little-endian layout, all sections 8-byte aligned:
+#   header    MAGIC, IPv4 ranges, IPv6 ranges, records, string bytes
+#   IPv4      start u32[n4] | end u32[n4] | record u32[n4]
+#   IPv6      start_hi u64[n6] | start_lo u64[n6] | end_hi u64[n6] | end_lo u64[n6] | record u32[n6]
+#   records   (country 2s, asn u32, name offset u32, name length u16)[n]
+#   strings   UTF-8 AS names
+# Ranges are sorted by start and do not overlap. The arrays are read through
+# memoryview casts of one shared read-only mmap, so every worker maps the same
+# page-cache pages and a lookup allocates nothing but its result.
+MAGIC = b"APIVGEO1"
+HEADER = struct.Struct("<8sIIII")
+RECORD = struct.Struct("<2sIIH")
+
+
+def align(offset):
+    return (offset + 7) & ~7
+
+
+def write_index(path, ipv4_ranges, ipv6_ranges, records):
+    """
+    Writes an index atomically. `ipv*_ranges` are sorted, non-overlapping
+    (start, end, record index) tuples; `records` are (country, asn, as_name).
+    """
+    names = bytearray()
+    record_rows = []
+    for country, asn, as_name in records:
+        encoded = as_name.encode()[:0xFFFF]
+        record_rows.append(RECORD.pack(country.encode()[:2].ljust(2), asn, len(names), len(encoded)))
+        names += encoded
+
+    sections = [
+        array("I", [r[0] for r in ipv4_ranges]),
+        array("I", [r[1] for r in ipv4_ranges]),
+        array("I", [r[2] for r in ipv4_ranges]),
+        array("Q", [r[0] >> 64 for r in ipv6_ranges]),
+        array("Q", [r[0] & 0xFFFFFFFFFFFFFFFF for r in ipv6_ranges]),
+        array("Q", [r[1] >> 64 for r in ipv6_ranges]),
+        array("Q", [r[1] & 0xFFFFFFFFFFFFFFFF for r in ipv6_ranges]),
+        array("I", [r[2] for r in ipv6_ranges]),
+        b"".join(record_rows),
+        bytes(names),
+    ]
+    if sys.byteorder != "little":
+        for section in sections:
+            if isinstance(section, array):
+                section.byteswap()
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(ipv4_ranges), len(ipv6_ranges), len(records), len(names)))
+        for section in sections:
+            f.write(b"\0" * (align(f.tell()) - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+
+
+class GeoIPIndex:
+    """A memory-mapped index file; see the layout above."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n4, n6, n_records, _ = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a GeoIP index")
+        if sys.byteorder != "little":
+            raise ValueError("GeoIP indexes can only be memory-mapped on little-endian hosts")
+
+        view = memoryview(self.map)
+        offset = HEADER.size
+
+        def section(count, fmt):
+            nonlocal offset
+            offset = align(offset)
+            size = count * (4 if fmt == "I" else 8)
+            data = view[offset:offset + size].cast(fmt)
+            offset += size
+            return data
+
+        self.v4_start, self.v4_end, self.v4_record = section(n4, "I"), section(n4, "I"), section(n4, "I")
+        self.v6_start_hi, self.v6_start_lo = section(n6, "Q"), section(n6, "Q")
+        self.v6_end_hi, self.v6_end_lo = section(n6, "Q"), section(n6, "Q")
+        self.v6_record = section(n6, "I")
+        self.records_offset = align(offset)
+        self.strings_offset = align(self.records_offset + n_records * RECORD.size)
+
+    def lookup_v4(self, ip):
+        index = bisect_right(self.v4_start, ip) - 1
+        if index < 0 or ip > self.v4_end[index]:
+            return None
+        return self.get_record(self.v4_record[index])
+
+    def lookup_v6(self, ip):
+        hi, lo = ip >> 64, ip & 0xFFFFFFFFFFFFFFFF
+        index = bisect_right(self.v6_start_hi, hi) - 1
+        # Ranges sharing the high 64 bits of their start are ordered by the low bits.
+        while index >= 0 and self.v6_start_hi[index] == hi and self.v6_start_lo[index] > lo:
+            index -= 1
+        if index < 0:
+            return None
+        end_hi = self.v6_end_hi[index]
+        if hi > end_hi or (hi == end_hi and lo > self.v6_end_lo[index]):
+            return None
+        return self.get_record(self.v6_record[index])
+
+    def get_record(self, index):
+        country, asn, name_offset, name_length = RECORD.unpack_from(self.map, self.records_offset + index * RECORD.size)
+        start = self.strings_offset + name_offset
+        return {
+            "country": country.decode(),
+            "asn": asn,
+            "as_name": self.map[start:start + name_length].decode(),
+        }
+
+# ----------------------------
+# Lookup
+# ----------------------------
+class GeoIP:
+    """
+    Lazily opens the index at GEOIP["PATH"] and re-opens it when the file is
+    replaced (checked at most every CHECK_INTERVAL seconds), e.g. by
+    `manage.py build_geoip`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+        self.index = None
+        self.checked_at = None
+
+    def lookup(self, ip):
+        """Returns {"country", "asn", "as_name"} for an IP string, or None if unknown or no index is installed."""
+        index = self.get_index()
+        if index is None:
+            return None
+        try:
+            if ":" in ip:
+                return index.lookup_v6(int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big"))
+            return index.lookup_v4(int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big"))
+        except OSError:
+            return None
+
+    def get_index(self):
+        checked_at = self.checked_at
+        if checked_at is not None and monotonic() - checked_at < GEOIP_SETTINGS["CHECK_INTERVAL"]:
+            return self.index
+
+        with self.lock:
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                self.index = None
+            else:
+                if self.index is None or self.index.mtime_ns != mtime_ns:
+                    self.index = GeoIPIndex(self.path)
+            self.checked_at = monotonic()
+            return self.index
+
+
+geoip = GeoIP(GEOIP_SETTINGS["PATH"])
@@ -0,0 +1,36 @@
+from io import BytesIO
+
+from PIL import Image
+
+# ----------------------------
+# Image Rendering
+# ----------------------------
+# Runs in the transform process pool, so this module must not import Django.
+PIL_FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+
+
+def render_image(path, width, height, fmt, quality):
+    """
+    Resizes the image at `path` to fit within width x height (either may be
+    None to scale by the other), never upscaling, and encodes it as `fmt`.
+    Returns the encoded bytes.
+    """
+    with Image.open(path) as image:
+        image.load()
+        if width or height:
+            box = (width or image.width, height or image.height)
+            if not width:
+                box = (max(1, round(image.width * height / image.height)), height)
+            elif not height:
+                box = (width, max(1, round(image.height * width / image.width)))
+            image.thumbnail(box, Image.Resampling.LANCZOS)
+
+        if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode == "P":
+            image = image.convert("RGBA")
+
+        output = BytesIO()
+        options = {"optimize": True} if fmt == "png" else {"quality": quality}
+        image.save(output, PIL_FORMATS[fmt], **options)
+        return output.getvalue()
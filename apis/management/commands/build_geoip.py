@@ -0,0 +1,74 @@
+import csv
+import gzip
+import ipaddress
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apis.geoip import GEOIP_SETTINGS, write_index
+
+# ----------------------------
+# Build GeoIP Index
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Builds the memory-mapped GeoIP index used by /kitchen-sink/request/ip/ from a CIDR "
+        "CSV (optionally gzipped) with the columns network,country,asn,as_name. Running "
+        "servers pick up the new index within a few seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "source", nargs="?", default=os.path.join(settings.BASE_DIR, "data", "geoip.csv"),
+            help="CIDR CSV to index (default: the bundled data/geoip.csv).",
+        )
+        parser.add_argument("--output", default=GEOIP_SETTINGS["PATH"], help="Index file to write.")
+
+    def handle(self, *args, **options):
+        records, record_ids = [], {}
+        ranges = {4: [], 6: []}
+
+        opener = gzip.open if options["source"].endswith(".gz") else open
+        try:
+            with opener(options["source"], "rt", newline="", encoding="utf-8") as f:
+                for line, row in enumerate(csv.DictReader(f), start=2):
+                    try:
+                        network = ipaddress.ip_network(row["network"].strip(), strict=False)
+                        record = (row["country"].strip().upper() or "ZZ", int(row["asn"] or 0), row["as_name"].strip())
+                    except (KeyError, ValueError) as e:
+                        raise CommandError(f"{options['source']}:{line}: {e}")
+                    record_id = record_ids.get(record)
+                    if record_id is None:
+                        record_id = record_ids[record] = len(records)
+                        records.append(record)
+                    start = int(network.network_address)
+                    ranges[network.version].append((start, start + network.num_addresses - 1, record_id))
+        except FileNotFoundError:
+            raise CommandError(f"{options['source']} not found.")
+
+        ipv4_ranges, ipv6_ranges = self.compact(ranges[4], 4), self.compact(ranges[6], 6)
+        write_index(options["output"], ipv4_ranges, ipv6_ranges, records)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {options['output']}: {len(ipv4_ranges):,} IPv4 and {len(ipv6_ranges):,} IPv6 ranges, "
+            f"{len(records):,} records ({os.path.getsize(options['output']):,} bytes)."
+        ))
+
+    @staticmethod
+    def compact(ranges, version):
+        """Sorts ranges, rejects overlaps and merges adjacent ranges that share a record."""
+        address = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+        compacted = []
+        for start, end, record_id in sorted(ranges):
+            if compacted:
+                last_start, last_end, last_id = compacted[-1]
+                if start <= last_end:
+                    raise CommandError(
+                        f"Overlapping networks: {address(start)} is already covered by "
+                        f"{address(last_start)}-{address(last_end)}."
+                    )
+                if start == last_end + 1 and record_id == last_id:
+                    compacted[-1] = (last_start, end, record_id)
+                    continue
+            compacted.append((start, end, record_id))
+        return compacted
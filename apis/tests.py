@@ -1,3 +1,292 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import zlib
+from concurrent.futures import Future
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from apis.assets import ASSET_SETTINGS
+from apis.catalog import build_entry, status_code_catalog
+from apis.transforms import TRANSFORM_SETTINGS, RenderCache, RenderTimeout
+from apis.views import MAX_BYTES, MAX_DELAY, MAX_STREAM_LINES
+from core.renderers import FastJSONRenderer
+from core.throttling import rate_limiter
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# ----------------------------
+# Status Codes
+# ----------------------------
+class MarkerJSONRenderer(FastJSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"marker"
+
+
+class StatusCodeNegotiationTests(TestCase):
+    url = reverse("kitchen_sink:get-status-code", kwargs={"status_code": 418})
+
+    def test_json_is_served_pre_rendered(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 418)
+        self.assertIn("ETag", response)
+        self.assertEqual(response.json()["data"]["statusCode"], 418)
+        revalidated = self.client.get(reverse("kitchen_sink:get-all-status-codes"), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(revalidated.status_code, 304)
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_msgpack_is_negotiated(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response.status_code, 418)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content)["data"]["statusCode"], 418)
+
+    def test_indented_json_matches_the_pre_rendered_body(self):
+        compact = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        indented = self.client.get(self.url, HTTP_ACCEPT="application/json; indent=2")
+        self.assertIn(b'\n  "success"', indented.content)
+        self.assertEqual(json.loads(indented.content), compact.json())
+
+    def test_pre_rendered_body_matches_the_configured_renderer(self):
+        entry = status_code_catalog.get(418)
+        envelope = {"success": True, "message": entry.message, "data": entry.data}
+        self.assertEqual(entry.cached.body.body, FastJSONRenderer().render(envelope))
+
+        renderers = {"DEFAULT_RENDERER_CLASSES": ["apis.tests.MarkerJSONRenderer"]}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, **renderers}):
+            self.assertEqual(build_entry("418: I'm a teapot", {}, 418).cached.body.body, b"marker")
+
+    def test_browsable_api_is_served(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/html")
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+
+# ----------------------------
+# Image Transforms
+# ----------------------------
+class FakePool:
+    """Renders in the calling thread, or leaves every render pending with `hold`."""
+
+    def __init__(self, hold=False):
+        self.hold = hold
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        if not self.hold:
+            future.set_result(fn(*args))
+        return future
+
+
+class TransformTestMixin:
+    png_path = os.path.join(ASSET_SETTINGS["DIRECTORY"], "image.png")
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = mock.patch.dict(TRANSFORM_SETTINGS, DISK_CACHE_DIR=directory.name)
+        settings.start()
+        self.addCleanup(settings.stop)
+        self.cache = self.create_cache()
+
+    def create_cache(self, pool=None):
+        cache = RenderCache()
+        cache.pool = pool or FakePool()
+        return cache
+
+
+class RenderCacheTests(TransformTestMixin, TestCase):
+    source = SimpleNamespace(etag='"png"', path=TransformTestMixin.png_path, last_modified=0)
+
+    async def render(self, cache=None, width=16):
+        return await (cache or self.cache).get(self.source, width, None, "webp", 80)
+
+    async def test_renders_are_cached_in_memory_then_on_disk(self):
+        first = await self.render()
+        self.assertIs(await self.render(), first)
+        self.assertEqual(len(self.cache.pool.futures), 1)
+        self.assertEqual(Image.open(BytesIO(first.data)).width, 16)
+
+        # Another worker on the host reads the render from disk.
+        other = self.create_cache()
+        self.assertEqual((await self.render(other)).data, first.data)
+        self.assertEqual(other.pool.futures, [])
+
+        await self.render(width=8)
+        self.assertEqual(len(self.cache.pool.futures), 2)
+
+    async def test_caches_are_bounded(self):
+        first = await self.render()
+        with mock.patch.dict(TRANSFORM_SETTINGS, MEMORY_CACHE_BYTES=first.size, DISK_CACHE_BYTES=first.size):
+            second = await self.render(width=8)
+        self.assertEqual(list(self.cache.memory.values()), [second])
+        self.assertEqual(os.listdir(TRANSFORM_SETTINGS["DISK_CACHE_DIR"]), list(self.cache.disk))
+        self.assertEqual(len(self.cache.disk), 1)
+
+    async def start_renders(self, count):
+        tasks = [asyncio.create_task(self.render()) for _ in range(count)]
+        for _ in range(100):
+            if self.cache.pool.futures and self.cache.inflight:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        return tasks
+
+    async def test_concurrent_requests_share_one_render(self):
+        self.cache.pool.hold = True
+        tasks = await self.start_renders(3)
+        [future] = self.cache.pool.futures
+        future.set_result(b"rendered")
+
+        assets = await asyncio.gather(*tasks)
+        self.assertEqual({asset.data for asset in assets}, {b"rendered"})
+        self.assertEqual(self.cache.inflight, {})
+
+    async def test_slow_renders_time_out(self):
+        self.cache.pool.hold = True
+        with mock.patch.dict(TRANSFORM_SETTINGS, TIMEOUT=0.2):
+            tasks = await self.start_renders(2)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertEqual([type(result) for result in results], [RenderTimeout, RenderTimeout])
+        self.assertEqual(self.cache.inflight, {})
+
+
+class TransformImageViewTests(TransformTestMixin, TestCase):
+    url = reverse("kitchen_sink:transform-image")
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("apis.views.render_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rate_limiter.local.buckets.clear()
+
+    def test_image_is_resized_and_re_encoded(self):
+        response = self.client.get(self.url, {"src": "png", "w": 20, "h": 10, "format": "jpeg"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        image = Image.open(BytesIO(response.content))
+        self.assertEqual(image.format, "JPEG")
+        self.assertLessEqual(image.size[0], 20)
+        self.assertLessEqual(image.size[1], 10)
+
+        revalidated = self.client.get(
+            self.url, {"src": "png", "w": 20, "h": 10, "format": "jpeg"}, HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(len(self.cache.pool.futures), 1)
+
+    def test_parameters_are_validated(self):
+        params = [
+            {},
+            {"src": "svg"},
+            {"src": "png", "format": "gif"},
+            {"src": "png", "w": "0"},
+            {"src": "png", "h": str(TRANSFORM_SETTINGS["MAX_DIMENSION"] + 1)},
+            {"src": "png", "w": "-5"},
+            {"src": "jpeg", "q": "101"},
+            {"src": "jpeg", "q": "high"},
+        ]
+        for params in params:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.cache.pool.futures, [])
+
+    def test_render_timeout_is_503(self):
+        self.cache.pool.hold = True
+        with mock.patch.dict(TRANSFORM_SETTINGS, TIMEOUT=0.05):
+            response = self.client.get(self.url, {"src": "png", "w": 20})
+        self.assertEqual(response.status_code, 503)
+
+# ----------------------------
+# Async Load Testing
+# ----------------------------
+@mock.patch("apis.views.asyncio.sleep")
+class AsyncEndpointTests(TestCase):
+    def setUp(self):
+        rate_limiter.local.buckets.clear()
+
+    async def get(self, name, params=None, **kwargs):
+        return await self.async_client.get(reverse(f"kitchen_sink:{name}", kwargs=kwargs), params or {})
+
+    async def read(self, response):
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    async def test_delay_is_capped(self, sleep):
+        response = await self.get("delay", seconds=2)
+        self.assertEqual(response.json()["data"]["delay"], 2)
+        sleep.assert_awaited_once_with(2)
+
+        response = await self.get("delay", seconds=MAX_DELAY + 50)
+        self.assertEqual(response.json()["data"]["delay"], MAX_DELAY)
+        sleep.assert_awaited_with(MAX_DELAY)
+
+    async def test_stream_sends_n_json_lines(self, sleep):
+        response = await self.get("stream", n=3)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in (await self.read(response)).splitlines()]
+        self.assertEqual([line["id"] for line in lines], [0, 1, 2])
+        self.assertEqual(lines[0]["method"], "GET")
+
+        response = await self.get("stream", n=MAX_STREAM_LINES + 1)
+        self.assertEqual(len((await self.read(response)).splitlines()), MAX_STREAM_LINES)
+
+    async def test_bytes_with_a_seed_are_reproducible(self, sleep):
+        first = await self.read(await self.get("bytes", {"seed": 42}, n=1000))
+        again = await self.read(await self.get("bytes", {"seed": 42, "chunk_size": 7}, n=1000))
+        other = await self.read(await self.get("bytes", {"seed": 43}, n=1000))
+        self.assertEqual(len(first), 1000)
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+
+    async def test_bytes_are_capped(self, sleep):
+        response = await self.get("bytes", n=MAX_BYTES + 1)
+        self.assertEqual(response["Content-Length"], str(MAX_BYTES))
+        self.assertEqual(len(await self.read(response)), MAX_BYTES)
+
+    async def test_bytes_validates_parameters(self, sleep):
+        for params in ({"seed": "abc"}, {"seed": "-1"}, {"chunk_size": MAX_BYTES + 1}):
+            with self.subTest(params=params):
+                response = await self.get("bytes", params, n=10)
+                self.assertEqual(response.status_code, 400)
+
+    async def test_drip_spreads_bytes_over_the_duration(self, sleep):
+        response = await self.get("drip", {"numbytes": 4, "duration": 2, "delay": 1, "code": 201})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Length"], "4")
+        self.assertEqual(await self.read(response), b"****")
+        self.assertEqual([call.args[0] for call in sleep.await_args_list], [1.0, 0.5, 0.5, 0.5, 0.5])
+
+    async def test_drip_validates_parameters(self, sleep):
+        params = [
+            {"numbytes": MAX_BYTES + 1},
+            {"duration": "soon"},
+            {"delay": MAX_DELAY + 1},
+            {"code": 600},
+            {"code": 100},
+        ]
+        for params in params:
+            with self.subTest(params=params):
+                response = await self.get("drip", params)
+                self.assertEqual(response.status_code, 400)
+        sleep.assert_not_awaited()
+
+    async def test_encoded_responses(self, sleep):
+        for name, decompress in (("gzip", gzip.decompress), ("deflate", zlib.decompress)):
+            with self.subTest(encoding=name):
+                response = await self.get(name)
+                self.assertEqual(response["Content-Encoding"], name)
+                body = json.loads(decompress(response.content))
+                self.assertTrue(body["data"][name])
@@ -0,0 +1,202 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import blake2b
+from threading import Lock
+
+from django.conf import settings
+
+from apis.assets import Asset
+from apis.imaging import render_image
+from core.metrics import registry
+
+TRANSFORM_SETTINGS = {
+    "WORKERS": 2,
+    "MEMORY_CACHE_BYTES": 32 * 1024 * 1024,
+    "DISK_CACHE_DIR": os.path.join(tempfile.gettempdir(), "apiverse-images"),
+    "DISK_CACHE_BYTES": 256 * 1024 * 1024,
+    "MAX_DIMENSION": 4096,
+    "DEFAULT_QUALITY": 80,
+    "TIMEOUT": 30,
+    **getattr(settings, "IMAGE_TRANSFORMS", {}),
+}
+
+# Transformable sources (`src=`) and output formats (`format=`). SVG is not rasterized.
+SOURCES = {
+    "jpeg": ("image.jpeg", "image/jpeg"),
+    "jpg": ("image.jpg", "image/jpeg"),
+    "png": ("image.png", "image/png"),
+    "webp": ("image.webp", "image/webp"),
+}
+FORMATS = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+
+class RenderTimeout(Exception):
+    pass
+
+# ----------------------------
+# Render Cache
+# ----------------------------
+class RenderCache:
+    """
+    Rendered images keyed by source ETag and parameters, in an in-memory LRU
+    backed by an on-disk LRU shared by all workers on the host; both are
+    bounded in bytes.
+
+    Misses render in a process pool. `get` is a coroutine: callers await the
+    render instead of holding a thread, and concurrent requests for the same
+    key await a single render instead of starting their own.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        self.disk = None
+        self.disk_size = 0
+        self.inflight = {}
+        self.pool = None
+
+    async def get(self, source, width, height, fmt, quality):
+        """Returns the rendered Asset. Raises RenderTimeout if the render takes longer than TIMEOUT."""
+        key = blake2b(f"{source.etag}:{width}:{height}:{fmt}:{quality}".encode(), digest_size=16).hexdigest()
+
+        with self.lock:
+            asset = self.memory.get(key)
+            if asset is not None:
+                self.memory.move_to_end(key)
+                registry.inc("apiverse_image_transforms_total", result="memory")
+                return asset
+
+        asset = await asyncio.to_thread(self.read_disk, key, fmt, source)
+        if asset is not None:
+            self.remember(key, asset)
+            registry.inc("apiverse_image_transforms_total", result="disk")
+            return asset
+
+        # A concurrent.futures.Future, so requests served on other threads'
+        # event loops (WSGI runs each async view in its own) can await it too.
+        with self.lock:
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+
+        if not leader:
+            registry.inc("apiverse_image_transforms_total", result="coalesced")
+            return await self.wait(future, shield=True)
+
+        try:
+            data = await self.render(source.path, width, height, fmt, quality)
+            asset = Asset(data, FORMATS[fmt], source.last_modified)
+            await asyncio.to_thread(self.write_disk, key, fmt, data)
+            self.remember(key, asset)
+            future.set_result(asset)
+            registry.inc("apiverse_image_transforms_total", result="rendered")
+            return asset
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    @staticmethod
+    async def wait(future, shield=False):
+        """
+        Awaits a concurrent Future for up to TIMEOUT. Shielded waits give up
+        without cancelling it, as other requests share it.
+        """
+        awaitable = asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(awaitable) if shield else awaitable, TRANSFORM_SETTINGS["TIMEOUT"])
+        except TimeoutError:
+            # Nobody awaits the shielded render any more; don't log its outcome as unretrieved.
+            awaitable.add_done_callback(lambda done: done.cancelled() or done.exception())
+            raise RenderTimeout()
+
+    async def render(self, path, width, height, fmt, quality):
+        with self.lock:
+            if self.pool is None:
+                # Spawned, not forked: request workers may be multi-threaded.
+                self.pool = ProcessPoolExecutor(
+                    max_workers=TRANSFORM_SETTINGS["WORKERS"], mp_context=multiprocessing.get_context("spawn"),
+                )
+            pool = self.pool
+        try:
+            return await self.wait(pool.submit(render_image, path, width, height, fmt, quality))
+        except BrokenProcessPool:
+            with self.lock:
+                if self.pool is pool:
+                    self.pool = None
+            raise
+
+    def remember(self, key, asset):
+        with self.lock:
+            if key in self.memory:
+                return
+            self.memory[key] = asset
+            self.memory_size += asset.size
+            while self.memory_size > TRANSFORM_SETTINGS["MEMORY_CACHE_BYTES"] and self.memory:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_size -= evicted.size
+
+    # ----------------------------
+    # Disk Cache
+    # ----------------------------
+    def load_disk(self):
+        """Indexes files already in DISK_CACHE_DIR, least recently used first. Called with the lock held."""
+        directory = TRANSFORM_SETTINGS["DISK_CACHE_DIR"]
+        os.makedirs(directory, exist_ok=True)
+        entries = sorted(
+            (entry.stat().st_mtime, entry.name, entry.stat().st_size)
+            for entry in os.scandir(directory)
+            if entry.is_file() and not entry.name.startswith(".")
+        )
+        self.disk = OrderedDict((name, size) for _, name, size in entries)
+        self.disk_size = sum(self.disk.values())
+
+    def read_disk(self, key, fmt, source):
+        name = f"{key}.{fmt}"
+        path = os.path.join(TRANSFORM_SETTINGS["DISK_CACHE_DIR"], name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self.lock:
+            if self.disk is not None and name in self.disk:
+                self.disk.move_to_end(name)
+        return Asset(data, FORMATS[fmt], source.last_modified)
+
+    def write_disk(self, key, fmt, data):
+        name = f"{key}.{fmt}"
+        directory = TRANSFORM_SETTINGS["DISK_CACHE_DIR"]
+        with self.lock:
+            if self.disk is None:
+                self.load_disk()
+
+        # Write then rename, so other workers never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, name))
+
+        with self.lock:
+            self.disk_size += len(data) - self.disk.pop(name, 0)
+            self.disk[name] = len(data)
+            while self.disk_size > TRANSFORM_SETTINGS["DISK_CACHE_BYTES"] and self.disk:
+                evicted, size = self.disk.popitem(last=False)
+                self.disk_size -= size
+                try:
+                    os.remove(os.path.join(directory, evicted))
+                except FileNotFoundError:
+                    pass
+
+
+render_cache = RenderCache()
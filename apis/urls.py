@@ -47,5 +47,16 @@ urlpatterns = [
     path('images/jpg/', views.SendJPGImageView.as_view(), name='send-jpg-image'),
     path('images/png/', views.SendPNGImageView.as_view(), name='send-png-image'),
     path('images/webp/', views.SendWEBPImageView.as_view(), name='send-webp-image'),
-    path('images/svg/', views.SendSVGImageView.as_view(), name='send-svg-image')
+    path('images/svg/', views.SendSVGImageView.as_view(), name='send-svg-image'),
+    path('images/transform/', views.TransformImageView.as_view(), name='transform-image'),
+
+    # ----------------------
+    # Async Load Testing
+    # ----------------------
+    path('delay/<int:seconds>/', views.DelayView.as_view(), name='delay'),
+    path('stream/<int:n>/', views.StreamView.as_view(), name='stream'),
+    path('bytes/<int:n>/', views.BytesView.as_view(), name='bytes'),
+    path('drip/', views.DripView.as_view(), name='drip'),
+    path('gzip/', views.GzipView.as_view(), name='gzip'),
+    path('deflate/', views.DeflateView.as_view(), name='deflate'),
 ]
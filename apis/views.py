@@ -1,11 +1,21 @@
+import asyncio
+import gzip
 import json
-import os
+import math
+import random
+import zlib
 import ipaddress
-from django.conf import settings
-from core.utils import api_response
+from core.throttling import check_rate_limit, get_client_ident
+from core.useragent import parse_user_agent
+from core.utils import api_response, json_response, serve_cached, wants_compact_json
+from apis.assets import asset_cache, serve_asset
+from apis.catalog import status_code_catalog
+from apis.geoip import geoip
+from apis.transforms import FORMATS, SOURCES, TRANSFORM_SETTINGS, RenderTimeout, render_cache
 from rest_framework.views import APIView
 from rest_framework import status, permissions
-from django.http import FileResponse, HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.views import View
 
 # ----------------------
 # Base methods
@@ -26,7 +36,54 @@ class BaseAPIView(APIView):
         if request.method != "GET":
             payload["body"] = request.data
         return payload
-        
+
+
+class BaseAsyncView(View):
+    """
+    Base for async kitchen-sink views. DRF's APIView is sync-only, so these
+    are plain Django views answering with `json_response`, and are
+    throttled here rather than by DRF's throttle classes.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        rate_limit = check_rate_limit(request, get_client_ident(request))
+        if rate_limit is None or rate_limit.allowed:
+            return super().dispatch(request, *args, **kwargs)
+
+        response = json_response(
+            success=False,
+            message=f"Request was throttled. Expected available in {math.ceil(rate_limit.reset)} seconds.",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        if self.view_is_async:
+            async def throttled():
+                return response
+            return throttled()
+        return response
+
+    def get_request_payload(self, request):
+        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+        ip = x_forwarded_for.split(',')[0] if x_forwarded_for else request.META.get("REMOTE_ADDR")
+        return {
+            "method": request.method,
+            "headers": dict(request.headers),
+            "origin": ip,
+            "url": request.build_absolute_uri(),
+        }
+
+    @staticmethod
+    def get_number(params, name, default, high, cast=int):
+        """Reads a non-negative query parameter; raises ValueError if it is malformed or above `high`."""
+        value = params.get(name)
+        if value in (None, ""):
+            return default
+        try:
+            number = cast(value)
+        except ValueError:
+            number = -1
+        if not 0 <= number <= high:
+            raise ValueError(f"{name} must be a number between 0 and {high}")
+        return number
+
 # ----------------------
 # HTTP Methods
 # ----------------------
@@ -88,25 +145,24 @@ class DeleteRequestView(BaseAPIView):
 # ----------------------
 # Status Codes
 # ----------------------
+def serve_catalog_entry(request, entry):
+    """The pre-rendered JSON when JSON was negotiated, else an `api_response` for the negotiated renderer."""
+    if wants_compact_json(request):
+        return serve_cached(request, entry.cached)
+    return api_response(success=True, message=entry.message, data=entry.data, status_code=entry.status)
+
 class GetAllStatusCodesView(APIView):
     permission_classes = [permissions.AllowAny]
     def get(self, request):
-        json_path = os.path.join(settings.BASE_DIR, 'data', 'status-codes.json')
         try:
-            with open(json_path, 'r') as f:
-                status_codes = json.load(f)
+            entry = status_code_catalog.get_all()
         except FileNotFoundError:
             return api_response(
                 success=False,
                 message="Status codes file not found",
                 status_code=status.HTTP_404_NOT_FOUND
-            )   
-        return api_response(
-            success=True,
-            message="Status codes fetched.",
-            data=status_codes,
-            status_code=status.HTTP_200_OK
-        )
+            )
+        return serve_catalog_entry(request, entry)
 
 class GetStatusCodeView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -120,10 +176,8 @@ class GetStatusCodeView(APIView):
                 status_code=status.HTTP_400_BAD_REQUEST
             )
 
-        json_path = os.path.join(settings.BASE_DIR, 'data', 'status-codes.json')
         try:
-            with open(json_path, 'r') as f:
-                status_codes = json.load(f)
+            entry = status_code_catalog.get(status_code)
         except FileNotFoundError:
             return api_response(
                 success=False,
@@ -131,27 +185,13 @@ class GetStatusCodeView(APIView):
                 status_code=status.HTTP_404_NOT_FOUND
             )
 
-        category = f"{str(status_code)[0]}xx"
-        if category not in status_codes or str(status_code) not in status_codes[category]:
+        if entry is None:
             return api_response(
                 success=False,
                 message="Invalid status code",
                 status_code=status.HTTP_404_NOT_FOUND
             )
-
-        payload = status_codes[category][str(status_code)]
-        conflicting_codes = [100, 102, 103, 204, 205, 304]
-
-        message = f"{status_code}: {payload['phrase']}"
-
-        response_status = status.HTTP_200_OK if status_code in conflicting_codes else status_code
-
-        return api_response(
-            success=True,
-            message=message,
-            status_code=response_status,
-            data={**payload, "statusCode": status_code, "category": category}  
-        )
+        return serve_catalog_entry(request, entry)
     
 # ----------------------
 # Request Information
@@ -180,11 +220,13 @@ class GetClientIPView(APIView):
         except ValueError:
             ip_version = "Unknown"
 
+        location = geoip.lookup(ip) if ip_version != "Unknown" else None
+
         return api_response(
             success=True,
             message="IP information returned",
             status_code=status.HTTP_200_OK,
-            data={"ip": ip, "ipv": ip_version}
+            data={"ip": ip, "ipv": ip_version, **(location or {"country": None, "asn": None, "as_name": None})}
         )
 
 class GetUserAgentView(APIView):
@@ -196,7 +238,7 @@ class GetUserAgentView(APIView):
             success=True,
             message="User agent returned",
             status_code=status.HTTP_200_OK,
-            data={"userAgent": user_agent}
+            data={"userAgent": user_agent, **parse_user_agent(user_agent).as_dict()}
         )
 
 class GetPathVariableView(APIView):
@@ -304,14 +346,14 @@ class BaseImageView(APIView):
     
     def get(self, request):
         try:
-            path = os.path.join(settings.BASE_DIR, 'static', 'assets', 'images', self.filename)
-            return FileResponse(open(path, 'rb'), content_type=self.content_type)
+            asset = asset_cache.get(self.filename, self.content_type)
         except FileNotFoundError:
             return api_response(
-            success=False,
-            message="URL parameter is required",
-            status_code=status.HTTP_400_BAD_REQUEST,
-        )
+                success=False,
+                message="Image not found",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        return serve_asset(request, asset)
 
 class SendJPEGImageView(BaseImageView):
     permission_classes = [permissions.AllowAny]
@@ -345,4 +387,173 @@ class SendSVGImageView(BaseImageView):
     permission_classes = [permissions.AllowAny]
     
     filename = "image.svg"
-    content_type = "image/svg+xml"
\ No newline at end of file
+    content_type = "image/svg+xml"
+
+class TransformImageView(BaseAsyncView):
+    """
+    Resized / re-encoded sample images, e.g.
+    `?src=png&w=320&h=240&format=webp&q=80`. The image fits within w x h
+    (either may be omitted) and is never upscaled. Async, so a request
+    waiting on a render does not hold a worker thread.
+    """
+    async def get(self, request):
+        try:
+            src, width, height, fmt, quality = self.get_params(request.GET)
+        except ValueError as e:
+            return json_response(success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+
+        filename, content_type = SOURCES[src]
+        try:
+            source = asset_cache.get(filename, content_type)
+        except FileNotFoundError:
+            return json_response(success=False, message="Image not found", status_code=status.HTTP_404_NOT_FOUND)
+
+        try:
+            rendered = await render_cache.get(source, width, height, fmt, quality)
+        except RenderTimeout:
+            return json_response(
+                success=False, message="Image render timed out", status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return serve_asset(request, rendered)
+
+    @staticmethod
+    def get_params(params):
+        src = params.get("src", "")
+        if src not in SOURCES:
+            raise ValueError(f"src must be one of: {', '.join(SOURCES)}")
+
+        fmt = params.get("format", "jpeg" if src == "jpg" else src)
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+
+        def get_int(name, default, low, high):
+            value = params.get(name)
+            if value in (None, ""):
+                return default
+            if not value.isdigit() or not low <= int(value) <= high:
+                raise ValueError(f"{name} must be an integer between {low} and {high}")
+            return int(value)
+
+        max_dimension = TRANSFORM_SETTINGS["MAX_DIMENSION"]
+        width = get_int("w", None, 1, max_dimension)
+        height = get_int("h", None, 1, max_dimension)
+        # Quality does not apply to PNG; normalizing it avoids duplicate renders.
+        quality = None if fmt == "png" else get_int("q", TRANSFORM_SETTINGS["DEFAULT_QUALITY"], 1, 100)
+        return src, width, height, fmt, quality
+
+# ----------------------
+# Async Load Testing
+# ----------------------
+# Native async views: under ASGI (apiverse.asgi) a sleeping or streaming
+# request is a suspended coroutine, not a blocked worker thread.
+MAX_DELAY = 10
+MAX_STREAM_LINES = 100
+MAX_BYTES = 100 * 1024
+MAX_DRIP_DURATION = 60
+
+
+class DelayView(BaseAsyncView):
+    async def get(self, request, seconds):
+        seconds = min(seconds, MAX_DELAY)
+        await asyncio.sleep(seconds)
+        return json_response(
+            success=True,
+            message=f"Response delayed by {seconds} second(s).",
+            data={**self.get_request_payload(request), "delay": seconds},
+        )
+
+
+class StreamView(BaseAsyncView):
+    """Streams `n` JSON lines (NDJSON), one per request-info object."""
+    async def get(self, request, n):
+        payload = self.get_request_payload(request)
+
+        async def lines():
+            for index in range(min(n, MAX_STREAM_LINES)):
+                yield json.dumps({"id": index, **payload}) + "\n"
+
+        return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+
+class BytesView(BaseAsyncView):
+    """
+    Streams `n` random bytes in `chunk_size` pieces. The same `seed` always
+    yields the same bytes, whatever the chunk size.
+    """
+    async def get(self, request, n):
+        try:
+            seed = self.get_number(request.GET, "seed", None, 2 ** 64)
+            chunk_size = self.get_number(request.GET, "chunk_size", 10 * 1024, MAX_BYTES) or 1
+        except ValueError as e:
+            return json_response(success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+
+        data = random.Random(seed).randbytes(min(n, MAX_BYTES))
+
+        async def chunks():
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+
+        response = StreamingHttpResponse(chunks(), content_type="application/octet-stream")
+        response["Content-Length"] = len(data)
+        return response
+
+
+class DripView(BaseAsyncView):
+    """
+    Sends `numbytes` asterisks spread evenly over `duration` seconds after an
+    initial `delay`, with status `code`.
+    """
+    async def get(self, request):
+        try:
+            numbytes = self.get_number(request.GET, "numbytes", 10, MAX_BYTES)
+            duration = self.get_number(request.GET, "duration", 2, MAX_DRIP_DURATION, cast=float)
+            delay = self.get_number(request.GET, "delay", 0, MAX_DELAY, cast=float)
+            code = self.get_number(request.GET, "code", 200, 599)
+        except ValueError as e:
+            return json_response(success=False, message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        if code < 200:
+            return json_response(
+                success=False,
+                message="code must be a number between 200 and 599",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pause = duration / numbytes if numbytes else 0
+
+        async def drip():
+            await asyncio.sleep(delay)
+            for _ in range(numbytes):
+                yield b"*"
+                await asyncio.sleep(pause)
+
+        response = StreamingHttpResponse(drip(), status=code, content_type="application/octet-stream")
+        response["Content-Length"] = numbytes
+        return response
+
+
+class BaseEncodedView(BaseAsyncView):
+    """
+    Request info as JSON, compressed with `encoding` regardless of
+    Accept-Encoding. Subclasses set `encoding` and a `compress(body)` function.
+    """
+    encoding = ""
+
+    async def get(self, request):
+        body = json.dumps({
+            "success": True,
+            "message": f"{self.encoding} encoded response.",
+            "data": {**self.get_request_payload(request), self.encoding: True},
+        }).encode()
+        response = HttpResponse(self.compress(body), content_type="application/json")
+        response["Content-Encoding"] = self.encoding
+        return response
+
+
+class GzipView(BaseEncodedView):
+    encoding = "gzip"
+    compress = staticmethod(gzip.compress)
+
+
+class DeflateView(BaseEncodedView):
+    encoding = "deflate"
+    compress = staticmethod(zlib.compress)
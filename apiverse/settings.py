@@ -1,7 +1,9 @@
 from pathlib import Path
+from importlib.util import find_spec
 from decouple import config
 import dj_database_url
 import os
+import tempfile
 
 # ----------------------------
 # Base Directory
@@ -36,11 +38,13 @@ INSTALLED_APPS = [
     "drf_spectacular",
 
     # Local apps
+    "core",
     "accounts",
     "todos",
     "socials",
     "chats",
-    "ecommerce"
+    "ecommerce",
+    "apis",
 ]
 
 # ----------------------------
@@ -52,6 +56,10 @@ AUTH_USER_MODEL = "accounts.User"
 # Middleware
 # ----------------------------
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.RateLimitHeadersMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -61,6 +69,128 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# ----------------------------
+# Request Metrics
+# ----------------------------
+# Workers flush snapshots to DIRECTORY so /api/v1/metrics/ can aggregate them.
+# Scrapers authenticate with `Authorization: Bearer <TOKEN>`; without a token
+# the endpoint is only open to staff sessions, or to everyone when DEBUG is on.
+REQUEST_METRICS = {
+    "ENABLED": config("REQUEST_METRICS_ENABLED", default=True, cast=bool),
+    "SERVER_TIMING": config("REQUEST_METRICS_SERVER_TIMING", default=True, cast=bool),
+    "DIRECTORY": config("REQUEST_METRICS_DIR", default=os.path.join(tempfile.gettempdir(), "apiverse-metrics")),
+    "FLUSH_INTERVAL": config("REQUEST_METRICS_FLUSH_INTERVAL", default=5, cast=int),
+    "TOKEN": config("METRICS_TOKEN", default=None),
+}
+
+# ----------------------------
+# Query Budgets
+# ----------------------------
+# Views declare `query_budget = <max queries>`; enforced (and N+1 detected) only
+# when ENFORCE is on, which defaults to DEBUG.
+QUERY_BUDGET = {
+    "ENFORCE": config("QUERY_BUDGET_ENFORCE", default=DEBUG, cast=bool),
+    "DEFAULT_BUDGET": None,
+    "N_PLUS_ONE_THRESHOLD": 3,
+}
+
+# ----------------------------
+# Authenticated Principal Cache
+# ----------------------------
+# SHARED_CACHE names a CACHES alias shared by all workers (e.g. Redis) so that
+# invalidations propagate across processes; None keeps the cache per-process,
+# and entries then expire after LOCAL_TTL seconds so a deactivated user or a
+# role change reaches every worker quickly.
+AUTH_PRINCIPAL_CACHE = {
+    "MAX_SIZE": config("AUTH_PRINCIPAL_CACHE_MAX_SIZE", default=10000, cast=int),
+    "TTL": config("AUTH_PRINCIPAL_CACHE_TTL", default=60, cast=int),
+    "SHARED_CACHE": config("AUTH_PRINCIPAL_CACHE_SHARED", default=None),
+    "LOCAL_TTL": config("AUTH_PRINCIPAL_CACHE_LOCAL_TTL", default=5, cast=int),
+}
+
+# ----------------------------
+# Static Asset Serving
+# ----------------------------
+# Kitchen-sink images up to MEMORY_LIMIT bytes are served from memory, larger
+# ones from a memory map; MAX_AGE is the Cache-Control max-age in seconds.
+ASSET_SERVING = {
+    "MEMORY_LIMIT": config("ASSET_MEMORY_LIMIT", default=256 * 1024, cast=int),
+    "MAX_AGE": config("ASSET_MAX_AGE", default=86400, cast=int),
+}
+
+# /kitchen-sink/images/transform/ renders in a pool of WORKERS processes and
+# caches results in memory and under DISK_CACHE_DIR (shared by all workers).
+IMAGE_TRANSFORMS = {
+    "WORKERS": config("IMAGE_TRANSFORM_WORKERS", default=2, cast=int),
+    "MEMORY_CACHE_BYTES": config("IMAGE_TRANSFORM_MEMORY_CACHE_BYTES", default=32 * 1024 * 1024, cast=int),
+    "DISK_CACHE_DIR": config("IMAGE_TRANSFORM_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "apiverse-images")),
+    "DISK_CACHE_BYTES": config("IMAGE_TRANSFORM_DISK_CACHE_BYTES", default=256 * 1024 * 1024, cast=int),
+    "MAX_DIMENSION": 4096,
+    "DEFAULT_QUALITY": 80,
+    "TIMEOUT": 30,
+}
+
+# ----------------------------
+# GeoIP
+# ----------------------------
+# Memory-mapped range index built from data/geoip.csv (or a full CIDR dataset)
+# with `manage.py build_geoip`; all workers share it through the page cache.
+GEOIP = {
+    "PATH": config("GEOIP_PATH", default=os.path.join(BASE_DIR, "data", "geoip.bin")),
+}
+
+# ----------------------------
+# JSON Rendering
+# ----------------------------
+# core.renderers.FastJSONRenderer serializes with BACKEND: "orjson" (falls back
+# to "json" when orjson is not installed) or "json" (stdlib).
+JSON_RENDERER = {
+    "BACKEND": config("JSON_RENDERER_BACKEND", default="orjson"),
+}
+
+# MessagePack (`Accept: application/msgpack`) and CBOR (`application/cbor`)
+# responses and request bodies, for each format whose library is installed;
+# clients that do not ask for them get JSON.
+BINARY_FORMATS = [
+    fmt for fmt, module in (("msgpack", "msgpack"), ("cbor", "cbor2"))
+    if fmt in config("BINARY_FORMATS", default="msgpack,cbor").split(",") and find_spec(module)
+]
+BINARY_RENDERER_CLASSES = {"msgpack": "core.renderers.MessagePackRenderer", "cbor": "core.renderers.CBORRenderer"}
+BINARY_PARSER_CLASSES = {"msgpack": "core.parsers.MessagePackParser", "cbor": "core.parsers.CBORParser"}
+
+# ----------------------------
+# Response Compression
+# ----------------------------
+# core.middleware.CompressionMiddleware negotiates zstd, br (if zstandard /
+# brotli are installed) or gzip; bodies under MIN_SIZE bytes are sent as is.
+COMPRESSION = {
+    "ENABLED": config("COMPRESSION_ENABLED", default=True, cast=bool),
+    "MIN_SIZE": config("COMPRESSION_MIN_SIZE", default=1024, cast=int),
+}
+
+# ----------------------------
+# Rate Limiting
+# ----------------------------
+# Policies map URL names ("namespace:*" for a whole namespace) to rules
+# "<ip|user|email>:<count>/<period>"; the strictest applicable rule decides.
+# With ENFORCE off, limits are only reported (headers, metrics). SHARED_CACHE
+# names a CACHES alias shared by all workers for exact limits across processes.
+THROTTLING = {
+    "ENABLED": config("THROTTLE_ENABLED", default=True, cast=bool),
+    "ENFORCE": config("THROTTLE_ENFORCE", default=True, cast=bool),
+    "SHARED_CACHE": config("THROTTLE_SHARED_CACHE", default=None),
+    "POLICIES": {
+        "accounts:login": ["ip:20/min", "email:5/min"],
+        "accounts:async_login": ["ip:20/min", "email:5/min"],
+        "accounts:register": ["ip:10/hour"],
+        "accounts:async_register": ["ip:10/hour"],
+        "accounts:forgot_password": ["ip:10/hour", "email:3/hour"],
+        "accounts:resend_email_verification": ["ip:10/hour", "email:3/hour"],
+        "accounts:change_password": ["user:5/hour"],
+        "kitchen_sink:*": ["ip:600/min"],
+    },
+}
+
 # ----------------------------
 # REST FRAMEWORK & SPECTACULAR
 # ----------------------------
@@ -71,7 +201,21 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "accounts.authentication.JWTAuthentication",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        *(BINARY_RENDERER_CLASSES[fmt] for fmt in BINARY_FORMATS),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        *(BINARY_PARSER_CLASSES[fmt] for fmt in BINARY_FORMATS),
+    ),
+    "DEFAULT_THROTTLE_CLASSES": (
+        "core.throttling.PolicyThrottle",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
     "PAGE_SIZE": 10,
 
     # API Docs
@@ -86,6 +230,13 @@ SPECTACULAR_SETTINGS = {
     "SECURITY": [{"JWTAuth": []}],
 }
 
+# /api/v1/schema/ is served from artifacts generated once per CODE_VERSION
+# (`manage.py build_schema`, or the first request) and kept under DIRECTORY.
+OPENAPI_SCHEMA = {
+    "DIRECTORY": config("SCHEMA_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "apiverse-schema")),
+    "CODE_VERSION": config("CODE_VERSION", default=""),
+}
+
 # ----------------------------
 # URL & WSGI Configuration
 # ----------------------------
@@ -113,10 +264,23 @@ TEMPLATES = [
 # ----------------------------
 # EMAIL SETTINGS (SendGrid)
 # ----------------------------
-EMAIL_BACKEND = config("EMAIL_BACKEND", default="core.emails.SendGridBackend")
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="core.email.SendGridBackend")
 SENDGRID_API_KEY = config("SENDGRID_API_KEY")
 EMAIL_FROM = config("EMAIL_FROM")
 
+# `send_email` only writes to the outbox table; `manage.py run_outbox` delivers.
+# BATCH_SIZE is the number of recipients per SendGrid request; values above
+# 1000, the most SendGrid accepts, are capped.
+EMAIL_OUTBOX = {
+    "CONCURRENCY": config("EMAIL_OUTBOX_CONCURRENCY", default=4, cast=int),
+    "BATCH_SIZE": config("EMAIL_OUTBOX_BATCH_SIZE", default=500, cast=int),
+    "MAX_ATTEMPTS": config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=8, cast=int),
+    "RETRY_BASE_DELAY": 30,
+    "RETRY_MAX_DELAY": 3600,
+    "LEASE": 300,
+    "POLL_INTERVAL": 1.0,
+}
+
 # ----------------------------
 # FRONTEND URL
 # ----------------------------
@@ -136,6 +300,24 @@ GITHUB_CLIENT_ID = config("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET = config("GITHUB_CLIENT_SECRET")
 GITHUB_REDIRECT_URI = config("GITHUB_REDIRECT_URI")
 
+# ----------------------------
+# Outbound HTTP & OAuth Providers
+# ----------------------------
+# core.http_client: pooled keep-alive connections, timeouts in seconds and
+# jittered retries for calls to third parties (OAuth code exchange, ...).
+HTTP_CLIENT = {
+    "CONNECT_TIMEOUT": config("HTTP_CLIENT_CONNECT_TIMEOUT", default=3.05, cast=float),
+    "READ_TIMEOUT": config("HTTP_CLIENT_READ_TIMEOUT", default=10, cast=float),
+    "RETRIES": config("HTTP_CLIENT_RETRIES", default=2, cast=int),
+    "POOL_SIZE": config("HTTP_CLIENT_POOL_SIZE", default=10, cast=int),
+}
+
+# STUB_URL points Google and GitHub login at `manage.py run_oauth_stub`.
+OAUTH = {
+    "STUB_URL": config("OAUTH_STUB_URL", default=""),
+    "METADATA_TTL": config("OAUTH_METADATA_TTL", default=3600, cast=int),
+}
+
 # ----------------------------
 # Database
 # ----------------------------
@@ -167,6 +349,34 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# Django's defaults, with PBKDF2-SHA256 at PASSWORD_HASHING["ITERATIONS"]
+# (0 = Django's default); pick it with `manage.py calibrate_hasher`. Hashes
+# made with other hashers or work factors are upgraded on login.
+PASSWORD_HASHERS = [
+    "accounts.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Async login/register hash in a pool of MAX_WORKERS threads and answer 503
+# once MAX_PENDING hashes are queued or running.
+PASSWORD_HASHING = {
+    "ITERATIONS": config("PASSWORD_HASH_ITERATIONS", default=0, cast=int),
+    "MAX_WORKERS": config("PASSWORD_HASH_WORKERS", default=os.cpu_count() or 1, cast=int),
+    "MAX_PENDING": config("PASSWORD_HASH_MAX_PENDING", default=64, cast=int),
+}
+
+# POST /accounts/import/ hashes passwords in WORKERS processes and reads at
+# most MAX_ROWS rows; `manage.py import_users` has no row limit.
+USER_IMPORT = {
+    "WORKERS": config("USER_IMPORT_WORKERS", default=2, cast=int),
+    "BATCH_SIZE": config("USER_IMPORT_BATCH_SIZE", default=1000, cast=int),
+    "MAX_ROWS": config("USER_IMPORT_MAX_ROWS", default=10000, cast=int),
+    "MAX_ERRORS": 100,
+}
+
 # ----------------------------
 # Internationalization
 # ----------------------------
@@ -1,13 +1,15 @@
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+from core.views import CachedSchemaView, metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
-    path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/v1/schema/", CachedSchemaView.as_view(), name="schema"),
     path("api/v1/docs/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("api/v1/docs/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path("api/v1/metrics/", metrics_view, name="metrics"),
     
     path("api/v1/todos/", include(("todos.urls", "todos"), namespace="todos")),
     path("api/v1/chats/", include(("chats.urls", "chats"), namespace="chats")),
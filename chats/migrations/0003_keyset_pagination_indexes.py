@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0002_alter_chatmessage_created_at_messagereadreceipt'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['chat', 'created_at', 'id'], name='chats_chatm_chat_id_24a7d8_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def sync_soft_deleted(apps, schema_editor):
+    # deleted_at becomes the only liveness predicate; older deletes set just one of the two fields.
+    for name in ("Chat", "ChatMessage", "MessageReadReceipt"):
+        model = apps.get_model("chats", name)
+        model.objects.filter(is_active=False, deleted_at__isnull=True).update(deleted_at=models.F("updated_at"))
+        model.objects.filter(is_active=True, deleted_at__isnull=False).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_soft_deleted, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='chatmessage',
+            name='chats_chatm_chat_id_24a7d8_idx',
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['chat', 'created_at', 'id'], name='message_live_chat_created_idx'),
+        ),
+    ]
@@ -8,6 +8,8 @@ class Chat(BaseModel):
     last_message = models.ForeignKey("ChatMessage",related_name="last_in_chat",on_delete=models.SET_NULL, null=True, blank=True)
     participants = models.ManyToManyField(User, related_name="chats")
     admin = models.ForeignKey(User, related_name="admin_chats", on_delete=models.SET_NULL, null=True, blank=True)
+
+    soft_delete_cascade = ("messages",)
     
     def __str__(self):
         return self.name
@@ -18,6 +20,13 @@ class ChatMessage(BaseModel):
     attachments = models.JSONField(default=list, blank=True)
     chat = models.ForeignKey(Chat, related_name="messages", on_delete=models.CASCADE)
 
+    soft_delete_cascade = ("read_receipts",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["chat", "id"], name="message_live_chat_idx", condition=models.Q(deleted_at__isnull=True)),
+        ]
+
     def __str__(self):
         return f"Message by {self.sender} in {self.chat.name}"
 
@@ -15,20 +15,20 @@ from core.utils import api_response
 class UserChatListView(generics.ListAPIView):
     serializer_class = ChatSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def get_queryset(self):
         return Chat.objects.filter(
-            participants=self.request.user,
-            is_active=True
-        ).distinct()
+            participants=self.request.user
+        ).distinct().select_related("last_message__sender").prefetch_related("participants")
 
     def list(self, request, *args, **kwargs):
-        chats = self.get_queryset()
+        chats = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(chats, many=True)
         return api_response(
             success=True,
             message="Chats retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -39,17 +39,18 @@ class UserChatListView(generics.ListAPIView):
 class AvailableUsersView(generics.ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 2
 
     def get_queryset(self):
         return User.objects.exclude(id=self.request.user.id)
     
     def list(self, request, *args, **kwargs):
-        users = self.get_queryset()
+        users = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(users, many=True)
         return api_response(
             success=True,
             message="Available users retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -79,16 +80,14 @@ class OneOnOneChatView(generics.GenericAPIView):
 
         chat = Chat.objects.filter(
             is_group_chat=False,
-            participants=request.user,
-            is_active=True
+            participants=request.user
         ).filter(
             participants=other_user
         ).first()
 
         if not chat:
             chat = Chat.objects.create(
-                name=f"Chat {request.user.username} & {other_user.username}",
-                is_active=True
+                name=f"Chat {request.user.username} & {other_user.username}"
             )
             chat.participants.set([request.user, other_user])
 
@@ -107,7 +106,7 @@ class DeleteChatView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def destroy(self, request, *args, **kwargs):
-        chat = get_object_or_404(self.get_queryset(), pk=kwargs["pk"], is_active=True)
+        chat = get_object_or_404(self.get_queryset(), pk=kwargs["pk"])
         chat.delete()
         return api_response(
             success=True,
@@ -142,7 +141,7 @@ class GroupChatDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Chat.objects.filter(is_group_chat=True)
+        return Chat.objects.filter(is_group_chat=True).select_related("last_message__sender").prefetch_related("participants")
     
     def retrieve(self, request, *args, **kwargs):
         chat = get_object_or_404(self.get_queryset(), pk=kwargs["pk"])
@@ -238,19 +237,21 @@ class LeaveGroupChatView(generics.GenericAPIView):
 class ChatMessagesView(generics.ListAPIView):
     serializer_class = ChatMessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = "id"
+    query_budget = 2
 
     def get_queryset(self):
         chat_id = self.kwargs["pk"]
-        return ChatMessage.objects.filter(chat_id=chat_id).order_by("created_at")
+        return ChatMessage.objects.filter(chat_id=chat_id).select_related("sender")
     
     def list(self, request, *args, **kwargs):
-        message = self.get_queryset()
+        message = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(message, many=True)
         
         return api_response(
             success=True,
             message="Messages retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
         
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
 # Register your models here.
+from core.models import OutboxEmail
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("to_email", "template_name", "status", "attempts", "next_attempt_at", "sent_at")
+    
+    list_filter = ("status", "template_name")
+    
+    search_fields = ("to_email", "subject")
+    
+    readonly_fields = ("context", "last_error")
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from core.metrics import install_db_timer, instrument_serializers
+        from core.query_budget import install_query_recorder
+
+        connection_created.connect(install_db_timer)
+        connection_created.connect(install_query_recorder)
+        instrument_serializers()
+
+        # Registers the outbox queue-depth gauge.
+        import core.outbox  # noqa: F401
@@ -0,0 +1,303 @@
+"""
+Endpoint benchmark scenarios and reporting for `manage.py bench`.
+
+Scenarios run against data created by `manage.py seed`, either in-process
+through the Django test client or over HTTP against a running server.
+"""
+import math
+import re
+import resource
+import sys
+from dataclasses import dataclass
+from time import perf_counter
+
+from django.db import connection
+from django.urls import reverse
+
+from core.seeding import SEED_EMAIL_DOMAIN
+
+# Regression checks against a baseline: (metric, direction). Latencies and
+# query counts must not grow; throughput must not drop. Latencies and
+# throughput only cover successful requests, so errors are compared too.
+COMPARED_METRICS = (
+    ("p50_ms", "lower"),
+    ("p95_ms", "lower"),
+    ("p99_ms", "lower"),
+    ("throughput_rps", "higher"),
+    ("queries_per_request", "lower"),
+    ("errors", "lower"),
+)
+
+# Metrics that regress on any increase rather than beyond the threshold.
+EXACT_METRICS = ("queries_per_request", "errors")
+
+_SERVER_TIMING_QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+_SERVER_TIMING_DURATION_RES = {
+    "render_ms": re.compile(r"ren;dur=([\d.]+)"),
+    "throttle_ms": re.compile(r"thr;dur=([\d.]+)"),
+}
+
+
+def get_timings_ms(server_timing):
+    """Render and throttling times reported by RequestMetricsMiddleware; None when absent."""
+    timings = {}
+    for name, regex in _SERVER_TIMING_DURATION_RES.items():
+        match = regex.search(server_timing or "")
+        timings[name] = float(match.group(1)) if match else None
+    return timings
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    url_name: str
+    url_kwargs: object = None
+    payload: object = None
+    headers: object = None
+    query: str = ""
+    auth: bool = True
+
+    def get_path(self, fixtures):
+        kwargs = self.url_kwargs(fixtures) if self.url_kwargs else None
+        path = reverse(self.url_name, kwargs=kwargs)
+        return f"{path}?{self.query}" if self.query else path
+
+    def get_payload(self, fixtures):
+        return self.payload(fixtures) if self.payload else None
+
+    def get_headers(self, fixtures):
+        headers = self.headers(fixtures) if self.headers else {}
+        if self.auth:
+            headers["Authorization"] = f"Bearer {fixtures['access_token']}"
+        return headers
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario("feed", "get", "socials:list_posts"),
+        Scenario("chat_history", "get", "chats:chat-messages", url_kwargs=lambda f: {"pk": f["chat_id"]}),
+        Scenario("product_list", "get", "ecommerce:product-list"),
+        Scenario("feed_100", "get", "socials:list_posts", query="page_size=100"),
+        Scenario("product_list_100", "get", "ecommerce:product-list", query="page_size=100"),
+        Scenario(
+            "feed_100_msgpack", "get", "socials:list_posts", query="page_size=100",
+            headers=lambda f: {"Accept": "application/msgpack"},
+        ),
+        Scenario(
+            "feed_100_gzip", "get", "socials:list_posts", query="page_size=100",
+            headers=lambda f: {"Accept-Encoding": "gzip"},
+        ),
+        Scenario(
+            "feed_100_zstd", "get", "socials:list_posts", query="page_size=100",
+            headers=lambda f: {"Accept-Encoding": "zstd"},
+        ),
+        Scenario("openapi_schema", "get", "schema", auth=False),
+        Scenario(
+            "cart_add", "post", "ecommerce:add-update-cart",
+            payload=lambda f: {"product": f["product_id"], "quantity": 1},
+        ),
+        Scenario(
+            "login", "post", "accounts:login",
+            payload=lambda f: {"email": f["email"], "password": f["password"]}, auth=False,
+        ),
+        Scenario(
+            "login_async", "post", "accounts:async_login",
+            payload=lambda f: {"email": f["email"], "password": f["password"]}, auth=False,
+        ),
+        # Served by the stand-in provider (accounts.oauth_stub); see `manage.py bench`.
+        Scenario("oauth_callback", "get", "accounts:google_callback", query="code=bench", auth=False),
+        Scenario("echo_get", "get", "kitchen_sink:get-request", auth=False),
+        Scenario(
+            "echo_post", "post", "kitchen_sink:post-request",
+            payload=lambda f: {"message": "bench", "items": list(range(10))}, auth=False,
+        ),
+        Scenario("status_codes", "get", "kitchen_sink:get-all-status-codes", auth=False),
+        Scenario(
+            "status_code", "get", "kitchen_sink:get-status-code", url_kwargs=lambda f: {"status_code": 200}, auth=False,
+        ),
+        Scenario(
+            "status_codes_304", "get", "kitchen_sink:get-all-status-codes",
+            headers=lambda f: {"If-None-Match": f["status_codes_etag"]}, auth=False,
+        ),
+        Scenario("image_png", "get", "kitchen_sink:send-png-image", auth=False),
+        Scenario(
+            "image_transform", "get", "kitchen_sink:transform-image",
+            query="src=png&w=64&h=64&format=webp&q=80", auth=False,
+        ),
+    )
+}
+
+# ----------------------------
+# Fixtures
+# ----------------------------
+def load_fixtures(password):
+    """
+    Picks the seeded user with the most activity (index 0 under the power-law
+    sampling) plus one of their chats and a product.
+
+    Returns None if the database has not been seeded.
+    """
+    from accounts.models import User
+    from apis.catalog import status_code_catalog
+    from ecommerce.models import Product
+
+    user = User.objects.filter(email=f"user0@{SEED_EMAIL_DOMAIN}").first()
+    chat = user.chats.order_by("id").first() if user else None
+    product = Product.objects.order_by("id").first()
+    if user is None or chat is None or product is None:
+        return None
+
+    return {
+        "email": user.email,
+        "password": password,
+        "access_token": user.generate_access_token(minutes=24 * 60),
+        "chat_id": chat.id,
+        "product_id": str(product.id),
+        "status_codes_etag": status_code_catalog.get_all().cached.etag,
+    }
+
+# ----------------------------
+# Transports
+# ----------------------------
+class ClientTransport:
+    """In-process requests through the Django test client; counts queries on the default connection."""
+
+    mode = "client"
+
+    def __init__(self):
+        from django.test import Client
+
+        self.client = Client()
+        self.queries = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def request(self, method, path, payload, headers):
+        self.queries = 0
+        with connection.execute_wrapper(self.count_query):
+            start = perf_counter()
+            if method == "get":
+                response = self.client.get(path, headers=headers)
+            else:
+                response = getattr(self.client, method)(path, payload, content_type="application/json", headers=headers)
+            if response.streaming:
+                # Files are read while streaming; count that like a real client would.
+                b"".join(response.streaming_content)
+            elapsed = perf_counter() - start
+        return response.status_code, elapsed, self.queries, get_timings_ms(response.get("Server-Timing"))
+
+
+class HTTPTransport:
+    """
+    Requests over HTTP against a running WSGI/ASGI server. Query counts are read
+    from the Server-Timing header when REQUEST_METRICS["SERVER_TIMING"] is on.
+    """
+
+    mode = "http"
+
+    def __init__(self, base_url):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def request(self, method, path, payload, headers):
+        start = perf_counter()
+        response = self.session.request(method.upper(), self.base_url + path, json=payload, headers=headers)
+        elapsed = perf_counter() - start
+        server_timing = response.headers.get("Server-Timing", "")
+        match = _SERVER_TIMING_QUERIES_RE.search(server_timing)
+        return response.status_code, elapsed, int(match.group(1)) if match else None, get_timings_ms(server_timing)
+
+# ----------------------------
+# Running
+# ----------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(transport, scenario, fixtures, iterations, warmup):
+    path = scenario.get_path(fixtures)
+    payload = scenario.get_payload(fixtures)
+    headers = scenario.get_headers(fixtures)
+
+    for _ in range(warmup):
+        transport.request(scenario.method, path, payload, headers)
+
+    latencies, queries, errors = [], [], 0
+    durations = {name: [] for name in _SERVER_TIMING_DURATION_RES}
+    started = perf_counter()
+    for _ in range(iterations):
+        status_code, elapsed, query_count, timings = transport.request(scenario.method, path, payload, headers)
+        # Failed requests (e.g. throttled or broken) are often fast; keep them out of the figures.
+        if status_code >= 400:
+            errors += 1
+            continue
+        latencies.append(elapsed)
+        if query_count is not None:
+            queries.append(query_count)
+        for name, value in timings.items():
+            if value is not None:
+                durations[name].append(value)
+    wall_time = perf_counter() - started
+
+    latencies.sort()
+    return {
+        "method": scenario.method.upper(),
+        "path": path,
+        "requests": iterations,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall_time, 2) if wall_time else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        **{name: round(sum(values) / len(values), 3) if values else None for name, values in durations.items()},
+        "peak_rss_mb": round(peak_rss_mb(), 1) if transport.mode == "client" else None,
+    }
+
+# ----------------------------
+# Baseline Comparison
+# ----------------------------
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Returns a list of regression messages for scenarios present in both runs.
+
+    A metric regresses when it is worse than the baseline by more than
+    `threshold` (a fraction, 0.2 = 20%). Query and error counts regress on
+    any increase.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric, better in COMPARED_METRICS:
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            if metric in EXACT_METRICS:
+                regressed = new > old
+            elif better == "lower":
+                regressed = new > old * (1 + threshold)
+            else:
+                regressed = new < old * (1 - threshold)
+            if regressed:
+                change = (new - old) / old * 100 if old else float("inf")
+                regressions.append(f"{name}: {metric} {old:g} -> {new:g} ({change:+.1f}%)")
+    return regressions
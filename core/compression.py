@@ -0,0 +1,227 @@
+import zlib
+from functools import lru_cache
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from core.metrics import registry, request_timings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_SETTINGS = {
+    "ENABLED": True,
+    # Bodies smaller than this are sent as is; compression would barely pay for its headers.
+    "MIN_SIZE": 1024,
+    # Server preference among the encodings a client accepts with equal q-values.
+    "ENCODINGS": ("zstd", "br", "gzip"),
+    "LEVELS": {"zstd": 3, "br": 4, "gzip": 6},
+    # Levels for bodies compressed once and cached (see Precompressed).
+    "STATIC_LEVELS": {"zstd": 19, "br": 11, "gzip": 9},
+    # Content-Type prefixes worth compressing; images, archives and other
+    # already-compressed media are not listed.
+    "CONTENT_TYPES": (
+        "text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+        "application/msgpack", "application/cbor", "application/vnd.oai.openapi", "image/svg+xml",
+    ),
+    **getattr(settings, "COMPRESSION", {}),
+}
+
+# ----------------------------
+# Codecs
+# ----------------------------
+class GzipCodec:
+    @staticmethod
+    def compress(data, level):
+        # A fixed (zero) timestamp in the header keeps output deterministic.
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    @staticmethod
+    def get_stream_compressor(level):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return (
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliCodec:
+    @staticmethod
+    def compress(data, level):
+        return brotli.compress(data, quality=level)
+
+    @staticmethod
+    def get_stream_compressor(level):
+        compressor = brotli.Compressor(quality=level)
+        return (
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+class ZstdCodec:
+    @staticmethod
+    def compress(data, level):
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    @staticmethod
+    def get_stream_compressor(level):
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        return (
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush,
+        )
+
+
+# Encodings whose library is installed; gzip is always available.
+CODECS = {"gzip": GzipCodec}
+if brotli is not None:
+    CODECS["br"] = BrotliCodec
+if zstandard is not None:
+    CODECS["zstd"] = ZstdCodec
+
+# ----------------------------
+# Negotiation
+# ----------------------------
+@lru_cache(maxsize=256)
+def choose_encoding(accept_encoding):
+    """
+    Returns the encoding to use for an Accept-Encoding header, or None for
+    identity: the highest q-value among CODECS, ties broken by ENCODINGS order.
+    """
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        accepted[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in COMPRESSION_SETTINGS["ENCODINGS"]:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in CODECS and q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type):
+    return content_type.lower().startswith(COMPRESSION_SETTINGS["CONTENT_TYPES"])
+
+
+def get_level(encoding, levels=None):
+    return (levels or {}).get(encoding, COMPRESSION_SETTINGS["LEVELS"][encoding])
+
+# ----------------------------
+# Precompressed Payloads
+# ----------------------------
+class Precompressed:
+    """
+    Compressed variants of a static body, built once per encoding at
+    STATIC_LEVELS and reused, e.g. for pre-rendered catalog responses.
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self.variants = {}
+        self.lock = Lock()
+
+    def get(self, encoding):
+        data = self.variants.get(encoding)
+        if data is None:
+            with self.lock:
+                data = self.variants.get(encoding)
+                if data is None:
+                    data = CODECS[encoding].compress(self.body, COMPRESSION_SETTINGS["STATIC_LEVELS"][encoding])
+                    self.variants[encoding] = data
+        return data
+
+    def negotiate(self, request):
+        """Returns (body, encoding) for the request; encoding is None when sent uncompressed."""
+        if not COMPRESSION_SETTINGS["ENABLED"] or len(self.body) < COMPRESSION_SETTINGS["MIN_SIZE"]:
+            return self.body, None
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return self.body, None
+        data = self.get(encoding)
+        if len(data) >= len(self.body):
+            return self.body, None
+        return data, encoding
+
+# ----------------------------
+# Response Compression
+# ----------------------------
+def compress_response(request, response, levels=None):
+    """
+    Compresses `response` in place for the request's Accept-Encoding.
+    `levels` overrides LEVELS per encoding, e.g. {"br": 11}.
+    """
+    if (
+        response.has_header("Content-Encoding")
+        or response.status_code in (204, 206, 304)
+        or not is_compressible(response.get("Content-Type", ""))
+        or "no-transform" in response.get("Cache-Control", "")
+    ):
+        return response
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding is None:
+        return response
+    codec, level = CODECS[encoding], get_level(encoding, levels)
+
+    if response.streaming:
+        compress, finish = codec.get_stream_compressor(level)
+        if response.is_async:
+            async def compress_async(chunks):
+                async for chunk in chunks:
+                    data = compress(chunk)
+                    if data:
+                        yield data
+                yield finish()
+
+            response.streaming_content = compress_async(response.streaming_content)
+        else:
+            def compress_sync(chunks):
+                for chunk in chunks:
+                    data = compress(chunk)
+                    if data:
+                        yield data
+                yield finish()
+
+            response.streaming_content = compress_sync(response.streaming_content)
+        del response["Content-Length"]
+    else:
+        if len(response.content) < COMPRESSION_SETTINGS["MIN_SIZE"]:
+            return response
+        start = perf_counter()
+        data = codec.compress(response.content, level)
+        timings = request_timings.get()
+        if timings is not None:
+            timings.compression_time += perf_counter() - start
+        if len(data) >= len(response.content):
+            return response
+        response.content = data
+        response["Content-Length"] = str(len(data))
+
+    # The compressed bytes differ from the identity representation's.
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = "W/" + etag
+    response["Content-Encoding"] = encoding
+    registry.inc("apiverse_compressed_responses_total", encoding=encoding)
+    return response
@@ -18,6 +18,15 @@ LOGIN_TYPE_CHOICES = [
     (LOGIN_GITHUB, "GitHub"),
 ]
 
+# One-Time Token Purposes
+TOKEN_EMAIL_VERIFICATION = "EMAIL_VERIFICATION"
+TOKEN_PASSWORD_RESET = "PASSWORD_RESET"
+
+TOKEN_PURPOSE_CHOICES = [
+    (TOKEN_EMAIL_VERIFICATION, "Email Verification"),
+    (TOKEN_PASSWORD_RESET, "Password Reset"),
+]
+
 # Todo List Priority
 PRIORITY_LOW = "Low"
 PRIORITY_MEDIUM = "Medium"
@@ -57,3 +66,16 @@ PAYMENT_PROVIDERS = [
     (RAZORPAY, "Razorpay"),
     (STRIPE, "Stripe"),
 ]
+
+# Email Outbox Status
+EMAIL_PENDING = "PENDING"
+EMAIL_SENDING = "SENDING"
+EMAIL_SENT = "SENT"
+EMAIL_FAILED = "FAILED"
+
+EMAIL_STATUS = [
+    (EMAIL_PENDING, "Pending"),
+    (EMAIL_SENDING, "Sending"),
+    (EMAIL_SENT, "Sent"),
+    (EMAIL_FAILED, "Failed"),
+]
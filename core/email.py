@@ -1,5 +1,5 @@
 import sendgrid
-from sendgrid.helpers.mail import Mail, Email
+from sendgrid.helpers.mail import Mail, Email, Personalization, Substitution, To
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
 from decouple import config
@@ -73,3 +73,32 @@ class SendGridBackend(BaseEmailBackend):
                     raise e
 
         return num_sent
+
+    # ----------------------------
+    # Send Personalized Batch
+    # ----------------------------
+    def send_personalized(self, body, recipients):
+        """
+        Sends one plain-text body to many recipients in a single API request,
+        using one personalization per recipient (at most 1000 per request).
+
+        Args:
+            body (str): Body containing substitution tags, e.g. "Hi -username-".
+            recipients (list): (to_email, subject, {tag: value}) tuples.
+
+        Raises:
+            RuntimeError: If SendGrid does not accept the request.
+        """
+        mail = Mail(from_email=Email(self.from_email), plain_text_content=body)
+        for to_email, subject, substitutions in recipients:
+            personalization = Personalization()
+            personalization.add_to(To(to_email))
+            personalization.subject = subject
+            for tag, value in substitutions.items():
+                personalization.add_substitution(Substitution(tag, str(value)))
+            mail.add_personalization(personalization)
+
+        response = self.sg.send(mail)
+        if not 200 <= response.status_code < 300:
+            raise RuntimeError(f"SendGrid API failed with status {response.status_code}, body={response.body}")
+        return len(recipients)
@@ -0,0 +1,178 @@
+import asyncio
+import random
+import time
+import weakref
+from threading import Lock, local
+from urllib.parse import urlsplit
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from core.metrics import registry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+HTTP_CLIENT_SETTINGS = {
+    "CONNECT_TIMEOUT": 3.05,
+    "READ_TIMEOUT": 10,
+    # Extra attempts after a failed one; see `is_retryable` for which failures qualify.
+    "RETRIES": 2,
+    # Retry n waits a random time up to min(MAX_BACKOFF, BACKOFF * 2**n) seconds ("full jitter").
+    "BACKOFF": 0.2,
+    "MAX_BACKOFF": 2.0,
+    "RETRY_STATUSES": (429, 502, 503, 504),
+    # Keep-alive connections kept per host.
+    "POOL_SIZE": 10,
+    **getattr(settings, "HTTP_CLIENT", {}),
+}
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+
+class HTTPClientError(Exception):
+    """A request failed after all retries (connection error or timeout)."""
+
+# ----------------------------
+# Retry Policy
+# ----------------------------
+def get_backoff(attempt):
+    return random.uniform(0, min(HTTP_CLIENT_SETTINGS["MAX_BACKOFF"], HTTP_CLIENT_SETTINGS["BACKOFF"] * 2 ** attempt))
+
+
+def is_retryable(method, status_code=None, not_sent=False):
+    """
+    Idempotent requests are retried on any transport error and on
+    RETRY_STATUSES. Others (e.g. an OAuth code exchange) only when the
+    request never reached the server, so a retry cannot repeat its effect.
+    """
+    if not_sent:
+        return True
+    if method not in IDEMPOTENT_METHODS:
+        return False
+    return status_code is None or status_code in HTTP_CLIENT_SETTINGS["RETRY_STATUSES"]
+
+
+def record(url, outcome):
+    registry.inc("apiverse_http_client_requests_total", host=urlsplit(url).hostname or "", outcome=outcome)
+
+# ----------------------------
+# Sync Client
+# ----------------------------
+class HTTPClient:
+    """
+    requests with keep-alive connection pools (one session per thread, as
+    sessions are not thread-safe), connect/read timeouts on every request
+    and retries with jittered exponential backoff.
+    """
+
+    def __init__(self):
+        self.local = local()
+
+    @property
+    def session(self):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=HTTP_CLIENT_SETTINGS["POOL_SIZE"], max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.local.session = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        """
+        Like `requests.request`; `timeout` defaults to (CONNECT_TIMEOUT, READ_TIMEOUT).
+        Returns the last response, even an error status, or raises HTTPClientError.
+        """
+        method = method.upper()
+        kwargs.setdefault("timeout", (HTTP_CLIENT_SETTINGS["CONNECT_TIMEOUT"], HTTP_CLIENT_SETTINGS["READ_TIMEOUT"]))
+        for attempt in range(HTTP_CLIENT_SETTINGS["RETRIES"] + 1):
+            last = attempt == HTTP_CLIENT_SETTINGS["RETRIES"]
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                record(url, type(e).__name__)
+                if last or not is_retryable(method, not_sent=self.is_not_sent(e)):
+                    raise HTTPClientError(f"{method} {url} failed: {e}") from e
+            else:
+                record(url, str(response.status_code))
+                if last or not is_retryable(method, response.status_code):
+                    return response
+            time.sleep(get_backoff(attempt))
+
+    @staticmethod
+    def is_not_sent(error):
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+# ----------------------------
+# Async Client
+# ----------------------------
+class AsyncHTTPClient:
+    """
+    The async counterpart of HTTPClient for ASGI views: httpx.AsyncClient
+    (one pool per event loop) with the same timeouts and retries. Without
+    httpx installed, requests go through HTTPClient in a worker thread.
+    """
+
+    def __init__(self, sync_client):
+        self.sync_client = sync_client
+        self.clients = weakref.WeakKeyDictionary()
+        self.lock = Lock()
+
+    def get_client(self):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            client = self.clients.get(loop)
+            if client is None:
+                client = self.clients[loop] = httpx.AsyncClient(
+                    timeout=httpx.Timeout(HTTP_CLIENT_SETTINGS["READ_TIMEOUT"], connect=HTTP_CLIENT_SETTINGS["CONNECT_TIMEOUT"]),
+                    limits=httpx.Limits(max_keepalive_connections=HTTP_CLIENT_SETTINGS["POOL_SIZE"]),
+                )
+        return client
+
+    async def request(self, method, url, **kwargs):
+        """Like `httpx.AsyncClient.request`; returns the last response or raises HTTPClientError."""
+        if httpx is None:
+            return await sync_to_async(self.sync_client.request, thread_sensitive=False)(method, url, **kwargs)
+
+        method = method.upper()
+        client = self.get_client()
+        for attempt in range(HTTP_CLIENT_SETTINGS["RETRIES"] + 1):
+            last = attempt == HTTP_CLIENT_SETTINGS["RETRIES"]
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                record(url, type(e).__name__)
+                not_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if last or not is_retryable(method, not_sent=not_sent):
+                    raise HTTPClientError(f"{method} {url} failed: {e!r}") from e
+            else:
+                record(url, str(response.status_code))
+                if last or not is_retryable(method, response.status_code):
+                    return response
+            await asyncio.sleep(get_backoff(attempt))
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+
+http_client = HTTPClient()
+async_http_client = AsyncHTTPClient(http_client)
@@ -0,0 +1,57 @@
+import os
+import time
+import uuid
+from threading import Lock
+
+# ----------------------------
+# Time-ordered UUIDs (UUIDv7)
+# ----------------------------
+# Layout (RFC 9562): 48-bit Unix time in ms | version 7 | 12-bit rand_a |
+# variant 0b10 | 62-bit rand_b. Ids sort by creation time, so inserts append
+# to the right edge of the primary key B-tree instead of random pages.
+_RAND_A_MAX = 0xFFF
+_RAND_B_MASK = (1 << 62) - 1
+
+_lock = Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7_from_parts(unix_ms, rand_a, rand_b):
+    value = (
+        (unix_ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | (rand_a & _RAND_A_MAX) << 64
+        | 0b10 << 62
+        | (rand_b & _RAND_B_MASK)
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7():
+    """
+    Returns a new UUIDv7. Ids from one process are strictly increasing: within
+    the same millisecond rand_a acts as a counter, borrowing from the next
+    millisecond if it overflows.
+    """
+    global _last_ms, _counter
+    unix_ms = time.time_ns() // 1_000_000
+    with _lock:
+        if unix_ms > _last_ms:
+            _last_ms, _counter = unix_ms, 0
+        else:
+            _counter += 1
+            if _counter > _RAND_A_MAX:
+                _last_ms, _counter = _last_ms + 1, 0
+        unix_ms, counter = _last_ms, _counter
+    return uuid7_from_parts(unix_ms, counter, int.from_bytes(os.urandom(8), "big"))
+
+
+def uuid7_at(moment, entropy=None):
+    """
+    Returns a UUIDv7 for an aware datetime, e.g. to derive ids from `created_at`.
+    `entropy` (bytes, at least 10) makes the result deterministic.
+    """
+    entropy = entropy or os.urandom(10)
+    unix_ms = int(moment.timestamp() * 1000)
+    return uuid7_from_parts(unix_ms, int.from_bytes(entropy[:2], "big"), int.from_bytes(entropy[2:10], "big"))
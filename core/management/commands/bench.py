@@ -0,0 +1,160 @@
+import json
+import platform
+from datetime import datetime, timezone
+from threading import Thread
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from accounts.oauth import OAUTH_SETTINGS, provider_metadata
+from accounts.oauth_stub import make_stub_server
+from core.bench import SCENARIOS, ClientTransport, HTTPTransport, compare_to_baseline, load_fixtures, run_scenario
+from core.throttling import THROTTLE_SETTINGS
+
+# ----------------------------
+# Endpoint Benchmarks
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Benchmarks key endpoints against seeded data (see `manage.py seed`) and reports "
+        "throughput, p50/p95/p99 latency, JSON render time, throttling time, queries per request and peak RSS. "
+        "Fails when a scenario regresses against --baseline by more than --threshold."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios", default=",".join(SCENARIOS),
+            help=f"Comma-separated scenarios to run (default all: {', '.join(SCENARIOS)}).",
+        )
+        parser.add_argument("--iterations", type=int, default=200, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario.")
+        parser.add_argument(
+            "--base-url",
+            help="Benchmark a running server (e.g. http://127.0.0.1:8000) instead of the in-process test client.",
+        )
+        parser.add_argument("--password", default="password123", help="Password the data was seeded with.")
+        parser.add_argument("--output", help="Write results as JSON to this file.")
+        parser.add_argument("--baseline", help="Baseline JSON file to compare against.")
+        parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression as a fraction (default 0.2).")
+        parser.add_argument("--save-baseline", action="store_true", help="Overwrite --baseline with this run's results.")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options["scenarios"].split(",") if name.strip()]
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}.")
+        if options["save_baseline"] and not options["baseline"]:
+            raise CommandError("--save-baseline requires --baseline.")
+
+        fixtures = load_fixtures(options["password"])
+        if fixtures is None:
+            raise CommandError("No seeded data found. Run `manage.py seed` first.")
+
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING("DEBUG is on: query logging and budget checks will skew results."))
+
+        if options["base_url"]:
+            transport = HTTPTransport(options["base_url"])
+            self.stderr.write(self.style.WARNING(
+                "Run the server with THROTTLE_ENFORCE=False, or rate-limited scenarios (login) will fail with 429, "
+                "and with OAUTH_STUB_URL pointing at `manage.py run_oauth_stub` for oauth_callback."
+            ))
+        else:
+            # Allows the test client's "testserver" host and keeps outgoing emails in memory.
+            setup_test_environment()
+            transport = ClientTransport()
+            # Rate limits are still evaluated (and timed), but repeated logins aren't rejected.
+            THROTTLE_SETTINGS["ENFORCE"] = False
+
+        stub = None
+        if "oauth_callback" in names and transport.mode == "client" and not OAUTH_SETTINGS["STUB_URL"]:
+            stub = self.start_oauth_stub()
+
+        try:
+            results = self.run(transport, names, fixtures, options)
+        finally:
+            if transport.mode == "client":
+                teardown_test_environment()
+            if stub is not None:
+                stub.shutdown()
+                OAUTH_SETTINGS["STUB_URL"] = ""
+                provider_metadata.clear()
+
+        if options["output"]:
+            self.write_json(options["output"], results)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        self.check_baseline(results, options)
+
+    def run(self, transport, names, fixtures, options):
+        results = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "mode": transport.mode,
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "debug": settings.DEBUG,
+            },
+            "scenarios": {},
+        }
+
+        self.stdout.write(
+            f"{'scenario':<18}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'render ms':>11}{'thr ms':>8}"
+            f"{'queries':>9}{'errors':>8}{'rss MB':>9}"
+        )
+        for name in names:
+            stats = run_scenario(transport, SCENARIOS[name], fixtures, options["iterations"], options["warmup"])
+            results["scenarios"][name] = stats
+            queries = "-" if stats["queries_per_request"] is None else f"{stats['queries_per_request']:g}"
+            rss = "-" if stats["peak_rss_mb"] is None else f"{stats['peak_rss_mb']:.1f}"
+            render = "-" if stats["render_ms"] is None else f"{stats['render_ms']:.3f}"
+            throttle = "-" if stats["throttle_ms"] is None else f"{stats['throttle_ms']:.3f}"
+            self.stdout.write(
+                f"{name:<18}{stats['throughput_rps']:>10.1f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                f"{stats['p99_ms']:>10.2f}{render:>11}{throttle:>8}{queries:>9}{stats['errors']:>8}{rss:>9}"
+            )
+        return results
+
+    @staticmethod
+    def start_oauth_stub():
+        """Serves the stand-in OAuth provider from a thread and points Google/GitHub login at it."""
+        stub = make_stub_server()
+        Thread(target=stub.serve_forever, daemon=True).start()
+        OAUTH_SETTINGS["STUB_URL"] = f"http://127.0.0.1:{stub.server_address[1]}"
+        provider_metadata.clear()
+        return stub
+
+    def check_baseline(self, results, options):
+        path = options["baseline"]
+        if not path:
+            return
+
+        if options["save_baseline"]:
+            self.write_json(path, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {path}."))
+            return
+
+        try:
+            with open(path) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f"Baseline {path} not found. Create it with --save-baseline.")
+
+        regressions = compare_to_baseline(results, baseline, options["threshold"])
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regression(s) beyond {options['threshold']:.0%}:\n  " + "\n  ".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%} against {path}."))
+
+    @staticmethod
+    def write_json(path, data):
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
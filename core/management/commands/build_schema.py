@@ -0,0 +1,23 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from core.schema import FORMATS, build_artifacts, get_artifact_path, get_code_version
+
+# ----------------------------
+# Build OpenAPI Schema
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Generates the OpenAPI schema served at /api/v1/schema/ for the current code version "
+        "(OPENAPI_SCHEMA[\"CODE_VERSION\"] or a hash of the sources). Run as a release step so "
+        "servers load the artifact instead of generating it on the first request."
+    )
+
+    def handle(self, *args, **options):
+        version = get_code_version()
+        build_artifacts(version)
+        for fmt in FORMATS:
+            path = get_artifact_path(version, fmt)
+            self.stdout.write(f"  {path} ({os.path.getsize(path):,} bytes)")
+        self.stdout.write(self.style.SUCCESS(f"Built schema for code version {version}."))
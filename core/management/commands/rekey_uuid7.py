@@ -0,0 +1,91 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.models import Case, Value, When
+
+from core.ids import uuid7_at
+from core.models import BaseModel
+
+# ----------------------------
+# Re-key Legacy UUIDv4 Rows
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Migration path to time-ordered ids: rewrites the random UUIDv4 primary keys of existing "
+        "BaseModel rows to UUIDv7s derived from their created_at, updating every foreign key and "
+        "many-to-many row that references them. Safe to re-run; rows that already have a UUIDv7 "
+        "are skipped. Run during a maintenance window: ids in issued JWTs and client caches change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows re-keyed per transaction.")
+        parser.add_argument("--models", help="Comma-separated app_label.Model names (default: all BaseModel models).")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be re-keyed.")
+
+    def handle(self, *args, **options):
+        # Parents and children are updated in turn inside one transaction, so
+        # foreign keys must only be checked at commit (PostgreSQL, SQLite).
+        if not connection.features.can_defer_constraint_checks:
+            raise CommandError(f"{connection.vendor} cannot defer foreign key checks; re-keying is not supported.")
+
+        for model in self.get_models(options["models"]):
+            references = self.get_references(model)
+            rekeyed = self.rekey_model(model, references, options["batch_size"], options["dry_run"])
+            verb = "would be re-keyed" if options["dry_run"] else "re-keyed"
+            self.stdout.write(f"  {model._meta.label:<28} {rekeyed:>10,} rows {verb}")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    @staticmethod
+    def get_models(labels):
+        if labels:
+            try:
+                return [apps.get_model(label.strip()) for label in labels.split(",")]
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+        return [
+            model for model in apps.get_models()
+            if issubclass(model, BaseModel) and not model._meta.proxy
+        ]
+
+    @staticmethod
+    def get_references(model):
+        """Concrete foreign keys pointing at `model`, including auto-created M2M through tables."""
+        return [
+            (related, field)
+            for related in apps.get_models(include_auto_created=True)
+            for field in related._meta.concrete_fields
+            if field.many_to_one or field.one_to_one
+            if field.remote_field.model is model and not related._meta.proxy
+        ]
+
+    def rekey_model(self, model, references, batch_size, dry_run):
+        rekeyed, last_pk = 0, None
+        manager = model._base_manager
+        while True:
+            batch = manager.order_by("pk")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            rows = list(batch.values_list("pk", "created_at")[:batch_size])
+            if not rows:
+                return rekeyed
+            last_pk = rows[-1][0]
+
+            # Re-keyed rows may sort after `last_pk`; they are visited again and skipped here.
+            mapping = {pk: uuid7_at(created_at) for pk, created_at in rows if pk.version != 7}
+            if mapping and not dry_run:
+                with transaction.atomic():
+                    for related, field in references:
+                        related._base_manager.filter(**{f"{field.attname}__in": mapping}).update(
+                            **{field.attname: self.remap(field.attname, mapping)}
+                        )
+                    pk_name = model._meta.pk.attname
+                    manager.filter(pk__in=mapping).update(**{pk_name: self.remap(pk_name, mapping)})
+            rekeyed += len(mapping)
+
+    @staticmethod
+    def remap(column, mapping):
+        return Case(
+            *[When(**{column: old}, then=Value(new)) for old, new in mapping.items()],
+            output_field=models.UUIDField(),
+        )
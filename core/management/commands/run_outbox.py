@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.outbox import MAX_BATCH_SIZE, OUTBOX_SETTINGS, OutboxWorker
+
+# ----------------------------
+# Deliver Outbox Emails
+# ----------------------------
+class Command(BaseCommand):
+    help = "Delivers queued outbox emails in batches, retrying failures with exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=OUTBOX_SETTINGS["CONCURRENCY"], help="Batches sent in parallel.")
+        parser.add_argument(
+            "--batch-size", type=int,
+            help=f"Recipients per request, at most {MAX_BATCH_SIZE} (default EMAIL_OUTBOX['BATCH_SIZE'], capped likewise).",
+        )
+        parser.add_argument("--poll-interval", type=float, default=OUTBOX_SETTINGS["POLL_INTERVAL"], help="Seconds to wait when the outbox is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once no email is due instead of polling.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and not 1 <= options["batch_size"] <= MAX_BATCH_SIZE:
+            raise CommandError(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}.")
+        worker = OutboxWorker(concurrency=options["concurrency"], batch_size=options["batch_size"])
+        self.stdout.write(f"Delivering outbox emails ({worker.concurrency} x {worker.batch_size})...")
+        try:
+            worker.run(once=options["once"], poll_interval=options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Outbox worker stopped."))
@@ -0,0 +1,171 @@
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import OuterRef, Subquery
+
+from accounts.models import User
+from chats.models import Chat, ChatMessage
+from core.seeding import FIELDS, PLAN, SeedSpec, generate_chunk
+from ecommerce.models import Cart, CartItem, Category, Order, OrderItem, Product, Profile
+from socials.models import Comment, Follow, Like, Post
+
+DEFAULT_COUNTS = {
+    "users": 1000,
+    "follows": 10000,
+    "posts": 5000,
+    "comments": 20000,
+    "likes": 50000,
+    "chats": 2000,
+    "messages": 50000,
+    "categories": 20,
+    "products": 2000,
+    "carts": 500,
+    "orders": 2000,
+}
+
+MODELS = {
+    "users": User,
+    "profiles": Profile,
+    "follows": Follow,
+    "posts": Post,
+    "comments": Comment,
+    "likes": Like,
+    "chats": Chat,
+    "chat_participants": Chat.participants.through,
+    "messages": ChatMessage,
+    "categories": Category,
+    "products": Product,
+    "carts": Cart,
+    "cart_items": CartItem,
+    "orders": Order,
+    "order_items": OrderItem,
+}
+
+# ----------------------------
+# Chunk Insertion
+# ----------------------------
+def insert_rows(table, rows, batch_size):
+    """Inserts `rows` into `table` and returns the number of rows actually inserted."""
+    model, fields = MODELS[table], FIELDS[table]
+    objects = [model(**dict(zip(fields, row))) for row in rows]
+    if table != "follows":
+        model.objects.bulk_create(objects, batch_size=batch_size)
+        return len(objects)
+
+    # Follows are unique per pair and drawn independently, so duplicates are
+    # skipped; ids are unique per row, so the ids found are the rows inserted.
+    model.objects.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True)
+    ids = [obj.pk for obj in objects]
+    return sum(
+        model._base_manager.filter(pk__in=ids[start:start + batch_size]).count()
+        for start in range(0, len(ids), batch_size)
+    )
+
+
+def insert_chunk(rows_by_table, batch_size):
+    """Returns {table: rows inserted}."""
+    with transaction.atomic():
+        return {table: insert_rows(table, rows, batch_size) for table, rows in rows_by_table.items()}
+
+
+def generate_rows(spec, key, chunk):
+    return generate_chunk(spec, key, *chunk)
+
+
+def generate_and_insert(spec, key, batch_size, chunk):
+    """Process-pool task: each worker inserts its own chunk over its own connection."""
+    return insert_chunk(generate_chunk(spec, key, *chunk), batch_size)
+
+# ----------------------------
+# Seed Synthetic Data
+# ----------------------------
+class Command(BaseCommand):
+    help = (
+        "Generates deterministic synthetic users, socials, chats and ecommerce data with "
+        "power-law activity. The same --seed, counts and --chunk-size produce the same rows. "
+        "Run against an empty database."
+    )
+
+    def add_arguments(self, parser):
+        for key, default in DEFAULT_COUNTS.items():
+            parser.add_argument(f"--{key}", type=int, default=default, help=f"Number of {key} (default {default}).")
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiplies every count.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--skew", type=float, default=2.0, help="Power-law exponent; higher = more concentrated activity.")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per INSERT.")
+        parser.add_argument("--chunk-size", type=int, default=20000, help="Rows generated per task.")
+        parser.add_argument(
+            "--workers", type=int, default=0,
+            help="Worker processes (0 = in-process). Workers also insert, except on SQLite where writes stay in this process.",
+        )
+        parser.add_argument("--password", default="password123", help="Password shared by all seeded users.")
+
+    def handle(self, *args, **options):
+        counts = {key: int(options[key] * options["scale"]) for key in DEFAULT_COUNTS}
+        counts["carts"] = min(counts["carts"], counts["users"])
+        if counts["users"] < 2:
+            raise CommandError("At least two users are required.")
+        for key in ("posts", "chats", "categories", "products"):
+            counts[key] = max(counts[key], 1)
+
+        # Hashing once keeps PBKDF2 out of the per-row cost.
+        spec = SeedSpec(
+            seed=options["seed"],
+            counts=counts,
+            password_hash=make_password(options["password"]),
+            skew=options["skew"],
+        )
+
+        executor = None
+        if options["workers"]:
+            # Forked workers must open their own connections, never share ours.
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=options["workers"])
+        started = time.perf_counter()
+        total = 0
+        try:
+            for key, _ in PLAN:
+                total += self.seed_table(spec, key, counts[key], options, executor)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        self.set_last_messages()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)."))
+
+    def seed_table(self, spec, key, count, options, executor):
+        """
+        Seeds `key` and the tables generated with it (e.g. profiles with users),
+        printing one line per table. Returns the number of rows inserted.
+        """
+        started = time.perf_counter()
+        chunk_size = options["chunk_size"]
+        chunks = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+        batch_size = options["batch_size"]
+
+        inserted = Counter({key: 0})
+        if executor and connection.vendor != "sqlite":
+            for counts in executor.map(partial(generate_and_insert, spec, key, batch_size), chunks):
+                inserted.update(counts)
+        else:
+            generate = partial(generate_rows, spec, key)
+            results = executor.map(generate, chunks) if executor else map(generate, chunks)
+            for rows_by_table in results:
+                inserted.update(insert_chunk(rows_by_table, batch_size))
+
+        elapsed = time.perf_counter() - started
+        for table, rows in inserted.items():
+            timing = f"  {elapsed:7.1f}s" if table == key else ""
+            self.stdout.write(f"  {table:<18} {rows:>10,} rows{timing}")
+        return inserted.total()
+
+    @staticmethod
+    def set_last_messages():
+        latest = ChatMessage.objects.filter(chat=OuterRef("pk")).order_by("-created_at").values("pk")[:1]
+        Chat.objects.update(last_message=Subquery(latest))
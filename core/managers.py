@@ -0,0 +1,117 @@
+from datetime import timedelta
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from core.constants import EMAIL_PENDING, EMAIL_SENDING, EMAIL_SENT, EMAIL_FAILED
+
+# ----------------------------
+# Soft Delete
+# ----------------------------
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    A row is live while `deleted_at IS NULL`. Deleting and restoring are one
+    UPDATE per table, cascading through each model's `soft_delete_cascade`
+    (reverse relation names, e.g. ("comments", "likes")).
+    """
+
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def dead(self):
+        return self.filter(deleted_at__isnull=False)
+
+    def delete(self):
+        return self.soft_delete()
+
+    def hard_delete(self):
+        return super().delete()
+
+    def soft_delete(self, deleted_at=None):
+        """Soft deletes live rows and their children; returns the number of rows of this model updated."""
+        deleted_at = deleted_at or timezone.now()
+        with transaction.atomic(using=self.db, savepoint=False):
+            # Children first: once parents are deleted they no longer match `alive()`.
+            for children in self.get_children(self.alive()):
+                children.soft_delete(deleted_at)
+            return self.alive().update(deleted_at=deleted_at, is_active=False)
+
+    def restore(self):
+        """
+        Restores deleted rows and the children deleted along with them, i.e.
+        with the same `deleted_at`. Children deleted on their own stay deleted.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            for children, fk in self.get_children(self.dead(), with_fk=True):
+                children.dead().filter(deleted_at=F(f"{fk}__deleted_at")).restore()
+            return self.dead().update(deleted_at=None, is_active=True)
+
+    def get_children(self, parents, with_fk=False):
+        for name in getattr(self.model, "soft_delete_cascade", ()):
+            relation = self.model._meta.get_field(name)
+            fk = relation.field.name
+            children = relation.related_model.all_objects.using(self.db).filter(
+                **{f"{fk}__in": parents.values("pk")}
+            )
+            yield (children, fk) if with_fk else children
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Default manager: live rows only. Use `all_objects` to include deleted ones."""
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+# ----------------------------
+# Email Outbox Manager
+# ----------------------------
+class OutboxEmailManager(models.Manager):
+    """
+    Durable email queue. Requests only INSERT; `run_outbox` workers claim due
+    rows with a lease, so a crashed worker's rows are picked up again once the
+    lease expires.
+    """
+
+    def enqueue(self, to_email, subject, template_name="generic", context=None):
+        return self.create(
+            to_email=to_email,
+            subject=subject,
+            template_name=template_name,
+            context=context or {},
+            next_attempt_at=timezone.now(),
+        )
+
+    def claim(self, limit, lease):
+        """
+        Leases up to `limit` due emails for `lease` seconds and returns them.
+        Concurrent workers skip each other's rows where the DB supports SKIP LOCKED.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            rows = list(
+                self.select_for_update(skip_locked=True)
+                .filter(status__in=[EMAIL_PENDING, EMAIL_SENDING], next_attempt_at__lte=now)
+                .order_by("next_attempt_at")[:limit]
+            )
+            if rows:
+                self.filter(pk__in=[row.pk for row in rows]).update(
+                    status=EMAIL_SENDING,
+                    next_attempt_at=now + timedelta(seconds=lease),
+                    attempts=F("attempts") + 1,
+                )
+        for row in rows:
+            row.attempts += 1
+        return rows
+
+    def mark_sent(self, ids):
+        return self.filter(pk__in=ids).update(status=EMAIL_SENT, sent_at=timezone.now(), last_error="")
+
+    def mark_failed(self, rows):
+        """Saves the status, next_attempt_at and last_error set on failed `rows`."""
+        self.bulk_update(rows, ["status", "next_attempt_at", "last_error"])
+
+    def depth(self):
+        """Returns {status: count} for emails not yet sent."""
+        counts = dict(
+            self.exclude(status=EMAIL_SENT).values_list("status").annotate(count=Count("id")).order_by()
+        )
+        return {status: counts.get(status, 0) for status in (EMAIL_PENDING, EMAIL_SENDING, EMAIL_FAILED)}
@@ -0,0 +1,296 @@
+import atexit
+import json
+import os
+import re
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic, perf_counter
+
+from django.conf import settings
+
+# Upper bounds (seconds) of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Per-view counters, stored as flat lists so snapshots merge by element-wise sum.
+COUNT, LATENCY, QUERIES, DB_TIME, SERIALIZER_TIME, RESPONSE_BYTES = range(6)
+BUCKETS_OFFSET = 6
+
+METRICS_SETTINGS = {
+    "ENABLED": True,
+    "SERVER_TIMING": True,
+    "DIRECTORY": None,
+    "FLUSH_INTERVAL": 5,
+    # Bearer token for /api/v1/metrics/. None = staff sessions only (anyone when DEBUG).
+    "TOKEN": None,
+    **getattr(settings, "REQUEST_METRICS", {}),
+}
+
+_SERIES_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)")
+
+
+def format_value(value):
+    """Sample value at full precision: counters must not be rounded, or rate() over them breaks."""
+    return str(int(value)) if isinstance(value, int) else repr(float(value))
+
+# ----------------------------
+# Per-request Timings
+# ----------------------------
+class RequestTimings:
+    __slots__ = ("queries", "db_time", "serializer_time", "render_time", "compression_time", "throttle_time", "in_serializer")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.compression_time = 0.0
+        self.throttle_time = 0.0
+        self.in_serializer = False
+
+
+request_timings: ContextVar = ContextVar("request_timings", default=None)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """
+    Execute wrapper counting queries and DB time for the current request.
+    Installed once per connection so requests don't pay for `execute_wrapper()`.
+    """
+    timings = request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_time += perf_counter() - start
+
+
+def install_db_timer(sender, connection, **kwargs):
+    """connection_created receiver adding db_execute_wrapper to new connections."""
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+def instrument_serializers():
+    """
+    Times the top-level `serializer.data` of every DRF serializer. Nested
+    serializers render through `to_representation`, so they are not counted twice.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data.fget
+    if getattr(original, "instrumented", False):
+        return
+
+    def data(self):
+        timings = request_timings.get()
+        if timings is None or timings.in_serializer:
+            return original(self)
+        timings.in_serializer = True
+        start = perf_counter()
+        try:
+            return original(self)
+        finally:
+            timings.serializer_time += perf_counter() - start
+            timings.in_serializer = False
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
+
+# ----------------------------
+# Metrics Registry
+# ----------------------------
+class MetricsRegistry:
+    """
+    In-process request metrics, shared across workers through snapshot files.
+
+    Each worker periodically writes its snapshot to `DIRECTORY/metrics-<pid>.json`;
+    `collect()` sums the snapshots of all live workers.
+    """
+
+    def __init__(self, directory=None, flush_interval=5, buckets=LATENCY_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self.views = {}
+        self.counters = {}
+        self.collectors = []
+        self.gauges = []
+        self._lock = Lock()
+        self._last_flush = monotonic()
+
+    # ----------------------------
+    # Recording
+    # ----------------------------
+    def observe(self, view, latency, queries, db_time, serializer_time, response_bytes):
+        with self._lock:
+            stats = self.views.get(view)
+            if stats is None:
+                stats = self.views[view] = [0] * (BUCKETS_OFFSET + len(self.buckets))
+            stats[COUNT] += 1
+            stats[LATENCY] += latency
+            stats[QUERIES] += queries
+            stats[DB_TIME] += db_time
+            stats[SERIALIZER_TIME] += serializer_time
+            stats[RESPONSE_BYTES] += response_bytes
+            bucket = bisect_left(self.buckets, latency)
+            if bucket < len(self.buckets):
+                stats[BUCKETS_OFFSET + bucket] += 1
+
+    def inc(self, name, value=1, **labels):
+        """Increments a counter summed across workers, e.g. inc("apiverse_emails_sent_total", template="welcome")."""
+        series = self.series_name(name, labels)
+        with self._lock:
+            self.counters[series] = self.counters.get(series, 0) + value
+
+    def register_collector(self, collector):
+        """
+        Registers a callable returning {series: value} of per-worker counters,
+        evaluated at snapshot time and summed across workers.
+        """
+        self.collectors.append(collector)
+
+    def register_gauge(self, gauge):
+        """
+        Registers a callable returning {series: value} of current values (e.g. a
+        queue depth), evaluated only at scrape time and never summed across workers.
+        """
+        self.gauges.append(gauge)
+
+    @staticmethod
+    def series_name(name, labels):
+        if not labels:
+            return name
+        rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+        return f"{name}{{{rendered}}}"
+
+    # ----------------------------
+    # Snapshots
+    # ----------------------------
+    def snapshot(self):
+        with self._lock:
+            snapshot = {
+                "views": {view: list(stats) for view, stats in self.views.items()},
+                "counters": dict(self.counters),
+            }
+        for collector in self.collectors:
+            for series, value in collector().items():
+                snapshot["counters"][series] = snapshot["counters"].get(series, 0) + value
+        return snapshot
+
+    def maybe_flush(self):
+        if self.directory and monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.directory:
+            return
+        self._last_flush = monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """Merges this worker's live snapshot with those flushed by other live workers."""
+        merged = self.snapshot()
+        if not self.directory or not os.path.isdir(self.directory):
+            return merged
+
+        for filename in os.listdir(self.directory):
+            match = re.fullmatch(r"metrics-(\d+)\.json", filename)
+            if not match or int(match.group(1)) == os.getpid():
+                continue
+            path = os.path.join(self.directory, filename)
+            if not self.is_alive(int(match.group(1))):
+                os.remove(path)
+                continue
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self.merge(merged, snapshot)
+        return merged
+
+    @staticmethod
+    def merge(target, snapshot):
+        for view, stats in snapshot.get("views", {}).items():
+            current = target["views"].get(view)
+            if current is None or len(current) != len(stats):
+                target["views"][view] = list(stats)
+            else:
+                target["views"][view] = [a + b for a, b in zip(current, stats)]
+        for series, value in snapshot.get("counters", {}).items():
+            target["counters"][series] = target["counters"].get(series, 0) + value
+
+    @staticmethod
+    def is_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    # ----------------------------
+    # Prometheus Exposition
+    # ----------------------------
+    def render_prometheus(self):
+        snapshot = self.collect()
+        lines = [
+            "# HELP apiverse_request_duration_seconds Request latency by view.",
+            "# TYPE apiverse_request_duration_seconds histogram",
+        ]
+        for view, stats in sorted(snapshot["views"].items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, stats[BUCKETS_OFFSET:]):
+                cumulative += count
+                lines.append(f'apiverse_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            lines.append(f'apiverse_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {stats[COUNT]}')
+            lines.append(f'apiverse_request_duration_seconds_sum{{view="{view}"}} {format_value(stats[LATENCY])}')
+            lines.append(f'apiverse_request_duration_seconds_count{{view="{view}"}} {stats[COUNT]}')
+
+        per_view_counters = (
+            ("apiverse_request_db_queries_total", "DB queries executed by view.", QUERIES),
+            ("apiverse_request_db_seconds_total", "Time spent in the DB by view.", DB_TIME),
+            ("apiverse_request_serializer_seconds_total", "Time spent in serializers by view.", SERIALIZER_TIME),
+            ("apiverse_response_bytes_total", "Response body bytes by view.", RESPONSE_BYTES),
+        )
+        for name, help_text, index in per_view_counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for view, stats in sorted(snapshot["views"].items()):
+                lines.append(f'{name}{{view="{view}"}} {format_value(stats[index])}')
+
+        declared = set()
+        for series, value in sorted(snapshot["counters"].items()):
+            name = _SERIES_RE.match(series).group(1)
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{series} {format_value(value)}")
+
+        declared = set()
+        for gauge in self.gauges:
+            for series, value in sorted(gauge().items()):
+                name = _SERIES_RE.match(series).group(1)
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{series} {format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(
+    directory=METRICS_SETTINGS["DIRECTORY"],
+    flush_interval=METRICS_SETTINGS["FLUSH_INTERVAL"],
+)
+atexit.register(registry.flush)
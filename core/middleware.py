@@ -0,0 +1,213 @@
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from core.compression import COMPRESSION_SETTINGS, compress_response
+from core.metrics import METRICS_SETTINGS, RequestTimings, registry, request_timings
+from core.query_budget import QueryRecorder, active_recorder, check_query_budget, get_query_budget_settings
+from core.throttling import add_rate_limit_headers
+from core.useragent import parse_user_agent
+
+# ----------------------------
+# Request Metrics Middleware
+# ----------------------------
+class RequestMetricsMiddleware:
+    """
+    Records latency, DB queries, DB time, serializer time and response size per
+    resolved URL name, and reports them (plus render, compression and throttling time) in
+    a `Server-Timing` header. Requests are also counted per client family
+    (browser or bot, see core.useragent).
+
+    Should be the first entry of MIDDLEWARE so the latency covers the whole stack.
+    DB time is collected by core.metrics.db_execute_wrapper, installed on every
+    new connection by CoreConfig. Runs natively under ASGI, so async views are
+    not pushed onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = METRICS_SETTINGS["ENABLED"]
+        self.server_timing = METRICS_SETTINGS["SERVER_TIMING"]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_timings.reset(token)
+        return self.record(request, response, timings, perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_timings.reset(token)
+        return self.record(request, response, timings, perf_counter() - start)
+
+    def record(self, request, response, timings, latency):
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(view, latency, timings.queries, timings.db_time, timings.serializer_time, size)
+        client = parse_user_agent(request.META.get("HTTP_USER_AGENT", "")).family
+        registry.inc("apiverse_requests_by_client_total", client=client)
+        registry.maybe_flush()
+
+        if self.server_timing:
+            response["Server-Timing"] = (
+                f"app;dur={latency * 1000:.2f}, "
+                f'db;dur={timings.db_time * 1000:.2f};desc="{timings.queries} queries", '
+                f"ser;dur={timings.serializer_time * 1000:.2f}, "
+                f"ren;dur={timings.render_time * 1000:.2f}, "
+                f"cmp;dur={timings.compression_time * 1000:.2f}, "
+                f"thr;dur={timings.throttle_time * 1000:.2f}"
+            )
+        return response
+
+# ----------------------------
+# Query Budget Middleware
+# ----------------------------
+class QueryBudgetMiddleware:
+    """
+    Enforces `query_budget` declared on views and detects N+1 query patterns.
+
+    Only active when QUERY_BUDGET["ENFORCE"] is set (defaults to DEBUG); raises
+    core.query_budget.QueryBudgetError with a per-serializer-field report.
+    Queries are recorded on every connection the request uses, including
+    those of sync_to_async threads under ASGI (see core.query_budget.active_recorder).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        options = get_query_budget_settings()
+        if not options["ENFORCE"]:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        token = active_recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            active_recorder.reset(token)
+        self.check(request, recorder, options)
+        return response
+
+    async def __acall__(self, request):
+        options = get_query_budget_settings()
+        if not options["ENFORCE"]:
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        token = active_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            active_recorder.reset(token)
+        self.check(request, recorder, options)
+        return response
+
+    @staticmethod
+    def check(request, recorder, options):
+        match = request.resolver_match
+        if match is not None:
+            view_class = getattr(match.func, "view_class", None)
+            check_query_budget(match.view_name, view_class, recorder, options)
+
+# ----------------------------
+# Compression Middleware
+# ----------------------------
+class CompressionMiddleware:
+    """
+    Compresses responses with zstd, brotli or gzip as negotiated by
+    Accept-Encoding (see core.compression). Streaming responses are
+    compressed chunk by chunk and flushed after each one.
+
+    Views can set `compression = {"br": 11, ...}` to override
+    COMPRESSION["LEVELS"] per encoding, or `compression = False` to opt out.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    @staticmethod
+    def compress(request, response):
+        if not COMPRESSION_SETTINGS["ENABLED"]:
+            return response
+        match = request.resolver_match
+        levels = getattr(getattr(match.func, "view_class", None), "compression", None) if match else None
+        if levels is False:
+            return response
+        return compress_response(request, response, levels)
+
+# ----------------------------
+# Rate Limit Headers Middleware
+# ----------------------------
+class RateLimitHeadersMiddleware:
+    """
+    Adds RateLimit-Limit/-Remaining/-Reset (and Retry-After on 429s) to
+    responses of throttled routes, from the status core.throttling left on
+    the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_headers(request, await self.get_response(request))
+
+    @staticmethod
+    def add_headers(request, response):
+        status = getattr(request, "rate_limit", None)
+        if status is not None:
+            add_rate_limit_headers(response, status)
+        return response
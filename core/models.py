@@ -1,21 +1,69 @@
-import uuid
 from django.db import models
 from django.utils import timezone
+from core.constants import EMAIL_STATUS, EMAIL_PENDING
+from core.ids import uuid7
+from core.managers import OutboxEmailManager, SoftDeleteManager, SoftDeleteQuerySet
 
 class BaseModel(models.Model):
     """
     Abstract base model with common fields for all models.
+    Deletes are soft: `objects` only returns rows with `deleted_at IS NULL`.
+    Ids are time-ordered UUIDv7s, so `id` doubles as a creation-order key.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)  
 
+    # Reverse relations soft deleted and restored together with this row.
+    soft_delete_cascade = ()
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
     class Meta:
         abstract = True 
         
     def delete(self, using=None, keep_parents=False):
+        self.soft_delete()
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
         self.is_active = False
-        self.save()
-    
\ No newline at end of file
+        type(self).all_objects.filter(pk=self.pk).soft_delete(self.deleted_at)
+
+    def restore(self):
+        type(self).all_objects.filter(pk=self.pk).restore()
+        self.deleted_at = None
+        self.is_active = True
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+    
+# ----------------------------
+# Email Outbox
+# ----------------------------
+class OutboxEmail(BaseModel):
+    """
+    An email waiting to be delivered by `manage.py run_outbox`.
+    """
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    template_name = models.CharField(max_length=50, default="generic")
+    context = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=EMAIL_STATUS, default=EMAIL_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.template_name} to {self.to_email} ({self.status})"
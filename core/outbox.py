@@ -0,0 +1,208 @@
+import logging
+import random
+import string
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from accounts.emails import EMAIL_TEMPLATES
+from core.constants import EMAIL_FAILED, EMAIL_PENDING
+from core.metrics import registry
+from core.models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_SETTINGS = {
+    "CONCURRENCY": 4,
+    "BATCH_SIZE": 500,
+    "MAX_ATTEMPTS": 8,
+    "RETRY_BASE_DELAY": 30,
+    "RETRY_MAX_DELAY": 3600,
+    "LEASE": 300,
+    "POLL_INTERVAL": 1.0,
+    **getattr(settings, "EMAIL_OUTBOX", {}),
+}
+
+# SendGrid rejects requests with more than 1000 personalizations (recipients).
+MAX_BATCH_SIZE = 1000
+
+# ----------------------------
+# Template Rendering
+# ----------------------------
+def get_template(template_name):
+    return EMAIL_TEMPLATES.get(template_name, EMAIL_TEMPLATES["generic"])
+
+
+def get_template_fields(template):
+    return {name for _, name, _, _ in string.Formatter().parse(template) if name}
+
+
+def render(email):
+    """Renders one outbox email. Raises ValueError if its context misses a template field."""
+    try:
+        return get_template(email.template_name).format(**email.context)
+    except KeyError as e:
+        raise ValueError(f"Missing context key for email template: {e}")
+
+
+def render_personalized(template_name, emails):
+    """
+    Renders a template once with SendGrid substitution tags ("-username-") and
+    returns (body, [(email, to_email, subject, substitutions)], [(email, error)]).
+    Emails whose context misses a template field are returned as errors
+    instead of recipients, so one bad row does not fail its whole batch.
+    """
+    template = get_template(template_name)
+    fields = get_template_fields(template)
+    body = template.format(**{field: f"-{field}-" for field in fields})
+
+    recipients, invalid = [], []
+    for email in emails:
+        missing = fields - set(email.context)
+        if missing:
+            invalid.append((email, ValueError(f"Missing context key for email template: {', '.join(sorted(missing))}")))
+            continue
+        substitutions = {f"-{field}-": email.context[field] for field in fields}
+        recipients.append((email, email.to_email, email.subject, substitutions))
+    return body, recipients, invalid
+
+# ----------------------------
+# Outbox Worker
+# ----------------------------
+class OutboxWorker:
+    """
+    Delivers outbox emails: claims due rows, groups them by template, and sends
+    each group of up to BATCH_SIZE (at most MAX_BATCH_SIZE) recipients as one
+    request on a bounded thread pool. Failed batches are retried with exponential backoff and jitter.
+
+    Only the calling thread touches the database; pool threads only send.
+    """
+
+    def __init__(self, concurrency=None, batch_size=None, max_attempts=None):
+        self.concurrency = concurrency or OUTBOX_SETTINGS["CONCURRENCY"]
+        self.batch_size = min(batch_size or OUTBOX_SETTINGS["BATCH_SIZE"], MAX_BATCH_SIZE)
+        self.max_attempts = max_attempts or OUTBOX_SETTINGS["MAX_ATTEMPTS"]
+        self.pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="outbox")
+
+    def run(self, once=False, poll_interval=None):
+        poll_interval = OUTBOX_SETTINGS["POLL_INTERVAL"] if poll_interval is None else poll_interval
+        try:
+            while True:
+                processed = self.process()
+                registry.maybe_flush()
+                if not processed:
+                    if once:
+                        return
+                    sleep(poll_interval)
+        finally:
+            self.pool.shutdown()
+            registry.flush()
+
+    def process(self):
+        """Claims, sends and records one round of batches. Returns the number of emails processed."""
+        emails = OutboxEmail.objects.claim(self.concurrency * self.batch_size, OUTBOX_SETTINGS["LEASE"])
+        if not emails:
+            return 0
+
+        by_template = defaultdict(list)
+        for email in emails:
+            by_template[email.template_name].append(email)
+        batches = [
+            (template_name, group[start:start + self.batch_size])
+            for template_name, group in by_template.items()
+            for start in range(0, len(group), self.batch_size)
+        ]
+
+        for (template_name, _), (sent, failures) in zip(batches, self.pool.map(self.send_batch, batches)):
+            if sent:
+                self.record_sent(template_name, sent)
+            if failures:
+                logger.error(f"Failed to send {len(failures)} '{template_name}' email(s): {failures[0][1]}")
+                self.record_failed(template_name, failures)
+        return len(emails)
+
+    def send_batch(self, args):
+        """
+        Pool task: sends one batch and returns (sent, [(email, error, permanent)]).
+        Emails with template errors fail permanently on their own and are left
+        out of the request; delivery errors are retried.
+        """
+        template_name, batch = args
+        start = perf_counter()
+        failures = []
+        try:
+            connection = get_connection()
+            if not hasattr(connection, "send_personalized"):
+                return self.send_each(connection, batch)
+            body, recipients, invalid = render_personalized(template_name, batch)
+            failures = [(email, error, True) for email, error in invalid]
+            batch = [email for email, *_ in recipients]
+            if batch:
+                connection.send_personalized(body, [recipient[1:] for recipient in recipients])
+            return batch, failures
+        except Exception as e:
+            return [], failures + [(email, e, False) for email in batch]
+        finally:
+            registry.inc("apiverse_outbox_send_seconds_total", perf_counter() - start)
+            registry.inc("apiverse_outbox_send_batches_total")
+
+    @staticmethod
+    def send_each(connection, batch):
+        """Fallback for backends without batching (SMTP, console, locmem): one message per email over one connection."""
+        sent, failures = [], []
+        with connection:
+            for email in batch:
+                try:
+                    message = EmailMessage(email.subject, render(email), settings.EMAIL_FROM, [email.to_email])
+                except ValueError as e:
+                    failures.append((email, e, True))
+                    continue
+                try:
+                    connection.send_messages([message])
+                    sent.append(email)
+                except Exception as e:
+                    failures.append((email, e, False))
+        return sent, failures
+
+    def record_sent(self, template_name, emails):
+        now = timezone.now()
+        OutboxEmail.objects.mark_sent([email.pk for email in emails])
+        registry.inc("apiverse_outbox_emails_total", len(emails), status="sent", template=template_name)
+        registry.inc(
+            "apiverse_outbox_delivery_seconds_total",
+            sum((now - email.created_at).total_seconds() for email in emails),
+        )
+
+    def record_failed(self, template_name, failures):
+        now = timezone.now()
+        retried = 0
+        for email, error, permanent in failures:
+            if permanent or email.attempts >= self.max_attempts:
+                email.status = EMAIL_FAILED
+            else:
+                email.status = EMAIL_PENDING
+                email.next_attempt_at = now + timedelta(seconds=self.get_backoff(email.attempts))
+                retried += 1
+            email.last_error = str(error)[:1000]
+
+        OutboxEmail.objects.mark_failed([email for email, _, _ in failures])
+        if retried:
+            registry.inc("apiverse_outbox_emails_total", retried, status="retried", template=template_name)
+        if len(failures) > retried:
+            registry.inc("apiverse_outbox_emails_total", len(failures) - retried, status="failed", template=template_name)
+
+    @staticmethod
+    def get_backoff(attempts):
+        delay = min(OUTBOX_SETTINGS["RETRY_BASE_DELAY"] * 2 ** (attempts - 1), OUTBOX_SETTINGS["RETRY_MAX_DELAY"])
+        return delay * random.uniform(0.5, 1.0)
+
+
+registry.register_gauge(lambda: {
+    registry.series_name("apiverse_outbox_queue_depth", {"status": status.lower()}): count
+    for status, count in OutboxEmail.objects.depth().items()
+})
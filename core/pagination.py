@@ -0,0 +1,134 @@
+import base64
+import binascii
+import uuid
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.settings import api_settings
+
+from core.utils import api_response
+
+# ----------------------------
+# Keyset (Cursor) Pagination
+# ----------------------------
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the time-ordered UUIDv7 `id` of BaseModel.
+
+    Every page is a bounded range scan on the key instead of an OFFSET, so
+    the cost of a page does not grow with its depth. Cursors are opaque,
+    url-safe strings returned as `next` / `prev` inside the api_response
+    envelope; a malformed cursor is rejected with 400.
+
+    Views may set `cursor_ordering = "id"` for oldest-first lists
+    (defaults to newest-first).
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = "-id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.descending = getattr(view, "cursor_ordering", self.ordering).startswith("-")
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        position, self.reverse = self.decode_cursor(cursor) if cursor else (None, False)
+
+        # Walking backwards flips the scan direction; the page is re-reversed below.
+        descending = self.descending != self.reverse
+        if position is not None:
+            queryset = queryset.filter(id__lt=position) if descending else queryset.filter(id__gt=position)
+        queryset = queryset.order_by("-id" if descending else "id")
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        has_next = has_more if not self.reverse else True
+        has_prev = has_more if self.reverse else position is not None
+
+        self.next_cursor = self.encode_cursor(results[-1], reverse=False) if results and has_next else None
+        self.prev_cursor = self.encode_cursor(results[0], reverse=True) if results and has_prev else None
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ----------------------------
+    # Cursor helpers
+    # ----------------------------
+    @staticmethod
+    def encode_cursor(instance, reverse):
+        raw = (b"p" if reverse else b"n") + instance.pk.bytes
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded)
+            if len(raw) != 17 or raw[:1] not in (b"n", b"p"):
+                raise ValueError(cursor)
+            return uuid.UUID(bytes=raw[1:]), raw[:1] == b"p"
+        except (binascii.Error, ValueError):
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+
+    # ----------------------------
+    # Responses
+    # ----------------------------
+    def get_paginated_data(self, data):
+        return {
+            "results": data,
+            "next": self.next_cursor,
+            "prev": self.prev_cursor,
+        }
+
+    def get_paginated_response(self, data):
+        return api_response(
+            success=True,
+            message="Results retrieved successfully",
+            data=self.get_paginated_data(data),
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "success": {"type": "boolean"},
+                "message": {"type": "string"},
+                "data": {
+                    "type": "object",
+                    "properties": {
+                        "results": schema,
+                        "next": {"type": "string", "nullable": True},
+                        "prev": {"type": "string", "nullable": True},
+                    },
+                },
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor taken from `next` or `prev` of a previous page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results per page (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from core.renderers import cbor2, is_timestamp_key, msgpack
+
+# ----------------------------
+# Binary Parsers
+# ----------------------------
+# The counterparts of core.renderers' binary renderers: 16-byte binary values
+# become UUIDs (wherever they appear, as they do in responses) and integers
+# under "*_at"/"*_date" keys become datetimes (Unix milliseconds), so views
+# and serializers see the same types as with JSON.
+def from_binary_value(value, key=""):
+    if isinstance(value, dict):
+        return {k: from_binary_value(v, k if isinstance(k, str) else "") for k, v in value.items()}
+    if isinstance(value, list):
+        return [from_binary_value(v) for v in value]
+    if isinstance(value, bytes) and len(value) == 16:
+        return UUID(bytes=value)
+    if type(value) is int and is_timestamp_key(key):
+        try:
+            return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return value
+    return value
+
+
+class BinaryParser(BaseParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return from_binary_value(self.loads(stream.read() if stream is not None else b""))
+        except Exception as e:
+            raise ParseError(f"{self.format_name} parse error - {str(e) or type(e).__name__}")
+
+    def loads(self, data):
+        raise NotImplementedError
+
+
+class MessagePackParser(BinaryParser):
+    media_type = "application/msgpack"
+    format_name = "MessagePack"
+
+    def loads(self, data):
+        return msgpack.unpackb(data, raw=False, timestamp=0)
+
+
+class CBORParser(BinaryParser):
+    media_type = "application/cbor"
+    format_name = "CBOR"
+
+    def loads(self, data):
+        return cbor2.loads(data)
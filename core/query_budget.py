@@ -0,0 +1,126 @@
+import re
+import sys
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Collapses "IN (%s, %s, ...)" so prefetches of different sizes share one shape.
+_IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+
+
+def get_query_budget_settings():
+    """
+    Read per request so tests can toggle enforcement with override_settings.
+    """
+    return {
+        "ENFORCE": settings.DEBUG,
+        "DEFAULT_BUDGET": None,
+        "N_PLUS_ONE_THRESHOLD": 3,
+        **getattr(settings, "QUERY_BUDGET", {}),
+    }
+
+
+class QueryBudgetError(AssertionError):
+    """Raised when a view exceeds its query budget or repeats a query shape (N+1)."""
+
+# ----------------------------
+# Query Recorder
+# ----------------------------
+class QueryRecorder:
+    """
+    Execute wrapper recording the shape of every query and the serializer
+    field that triggered it.
+
+    Usage:
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            ...
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((self.get_shape(sql), self.get_serializer_field()))
+        return execute(sql, params, many, context)
+
+    @staticmethod
+    def get_shape(sql):
+        return _IN_LIST_RE.sub("(...)", sql)
+
+    @staticmethod
+    def get_serializer_field():
+        """
+        Returns "Serializer.field" for the innermost Serializer.to_representation
+        frame on the stack, i.e. the field whose rendering issued the query.
+        """
+        from rest_framework.serializers import Serializer
+
+        frame = sys._getframe(2)
+        while frame is not None:
+            if frame.f_code.co_name == "to_representation":
+                owner = frame.f_locals.get("self")
+                field = frame.f_locals.get("field")
+                if isinstance(owner, Serializer) and field is not None:
+                    return f"{type(owner).__name__}.{field.field_name}"
+            frame = frame.f_back
+        return None
+
+    def repeated(self, threshold):
+        """Returns [(count, shape, fields)] for every shape executed `threshold` or more times."""
+        counts = Counter(shape for shape, _ in self.queries)
+        fields = defaultdict(set)
+        for shape, field in self.queries:
+            if field:
+                fields[shape].add(field)
+        return [
+            (count, shape, sorted(fields[shape]))
+            for shape, count in counts.most_common()
+            if count >= threshold
+        ]
+
+# The recorder of the current request. A context variable rather than a
+# wrapper on one connection: under ASGI, the ORM calls of async views run in
+# sync_to_async threads, each with its own connection, and those threads
+# inherit the request's context.
+active_recorder: ContextVar = ContextVar("active_recorder", default=None)
+
+
+def recorder_execute_wrapper(execute, sql, params, many, context):
+    """Execute wrapper feeding the active QueryRecorder, if any. Installed once per connection."""
+    recorder = active_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver adding recorder_execute_wrapper to new connections."""
+    if recorder_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(recorder_execute_wrapper)
+
+# ----------------------------
+# Budget Check
+# ----------------------------
+def check_query_budget(view_name, view_class, recorder, options=None):
+    """
+    Raises QueryBudgetError if the view exceeded `view_class.query_budget` or
+    repeated a query shape at least N_PLUS_ONE_THRESHOLD times.
+    """
+    options = options or get_query_budget_settings()
+    budget = getattr(view_class, "query_budget", options["DEFAULT_BUDGET"])
+    repeated = recorder.repeated(options["N_PLUS_ONE_THRESHOLD"])
+    total = len(recorder.queries)
+
+    if not repeated and (budget is None or total <= budget):
+        return
+
+    view_label = f"{view_name} ({view_class.__name__})" if view_class else view_name
+    lines = [f"Query budget check failed for {view_label}: {total} queries, budget {budget}."]
+    if repeated:
+        lines.append("Repeated queries (possible N+1):")
+        for count, shape, fields in repeated:
+            source = ", ".join(fields) or "outside serializers"
+            lines.append(f"  {count}x from {source}: {shape[:200]}")
+    raise QueryBudgetError("\n".join(lines))
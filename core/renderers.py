@@ -0,0 +1,199 @@
+import json
+from datetime import datetime
+from functools import lru_cache
+from time import perf_counter
+from uuid import UUID
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.metrics import request_timings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+JSON_RENDERER_SETTINGS = {
+    "BACKEND": "orjson",
+    **getattr(settings, "JSON_RENDERER", {}),
+}
+
+_ENVELOPE_KEYS = ("success", "message", "data")
+
+# ----------------------------
+# Serializers
+# ----------------------------
+# orjson natively handles UUID, dict/list/str subclasses (ReturnDict, ErrorDetail,
+# ...). Everything else, including datetimes (so they keep DRF's millisecond,
+# "Z"-suffixed format) and Decimals (strings under COERCE_DECIMAL_TO_STRING),
+# goes through DRF's encoder, so output matches JSONRenderer's.
+_encoder = JSONEncoder()
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _dumps_orjson(data):
+    return orjson.dumps(data, default=_encoder.default, option=_ORJSON_OPTIONS)
+
+
+def _dumps_json(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def get_dumps(backend):
+    """Returns the serializer for `backend` ("orjson" or "json"); orjson falls back to json if not installed."""
+    if backend == "orjson" and orjson is not None:
+        return _dumps_orjson
+    return _dumps_json
+
+
+dumps = get_dumps(JSON_RENDERER_SETTINGS["BACKEND"])
+
+
+def add_render_time(start):
+    timings = request_timings.get()
+    if timings is not None:
+        timings.render_time += perf_counter() - start
+
+# ----------------------------
+# Renderers
+# ----------------------------
+class FastJSONRenderer(JSONRenderer):
+    """
+    Compact JSON through JSON_RENDERER["BACKEND"]. Indented output (`?indent=`
+    in the Accept header) is left to DRF's JSONRenderer.
+
+    `api_response` envelopes take a fast path: `data` is serialized on its
+    own and the envelope written around it.
+    Render time is added to the request's timings (`ren` in Server-Timing).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        start = perf_counter()
+        if type(data) is dict and tuple(data) == _ENVELOPE_KEYS and isinstance(data["success"], bool):
+            body = self.render_envelope(data)
+        else:
+            body = dumps(data)
+        # Like JSONRenderer, escape the separators that are invalid in JavaScript string literals.
+        if b"\xe2\x80" in body:
+            body = body.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+        add_render_time(start)
+        return body
+
+    @staticmethod
+    def render_envelope(data):
+        return b"".join((
+            b'{"success":true,"message":' if data["success"] else b'{"success":false,"message":',
+            dumps(data["message"]),
+            b',"data":',
+            dumps(data["data"]),
+            b"}",
+        ))
+
+# ----------------------------
+# Binary Renderers
+# ----------------------------
+# Serializers emit ids and timestamps as strings. For binary formats, the
+# values under "id"/"*_id" keys are sent as 16-byte UUIDs and those under
+# "*_at"/"*_date" keys as integer Unix timestamps in milliseconds; UUID and
+# datetime objects (e.g. primary keys of related fields) are converted
+# wherever they appear. core.parsers applies the reverse on request bodies.
+def is_uuid_key(key):
+    return key == "id" or key.endswith("_id")
+
+
+def is_timestamp_key(key):
+    return key.endswith(("_at", "_date"))
+
+
+def to_timestamp(value):
+    return int(value.timestamp() * 1000)
+
+
+@lru_cache(maxsize=1024)
+def get_converter(key):
+    """Returns the str -> binary conversion for values under `key`, or None."""
+    if is_uuid_key(key):
+        return lambda value: UUID(value).bytes if len(value) == 36 else value
+    if is_timestamp_key(key):
+        return lambda value: to_timestamp(datetime.fromisoformat(value))
+    return None
+
+
+_SCALARS = frozenset((int, float, bool, type(None)))
+
+
+def to_binary_value(value, converter=None):
+    cls = type(value)
+    if cls in _SCALARS:
+        return value
+    if cls is str:
+        if converter is not None:
+            try:
+                return converter(value)
+            except ValueError:
+                pass
+        return value
+    if isinstance(value, dict):
+        return {k: to_binary_value(v, get_converter(k) if isinstance(k, str) else None) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_binary_value(v) for v in value]
+    if isinstance(value, str):
+        return to_binary_value(str(value), converter)
+    if isinstance(value, UUID):
+        return value.bytes
+    if isinstance(value, datetime):
+        return to_timestamp(value)
+    return value
+
+
+class BinaryRenderer(BaseRenderer):
+    """
+    Base class for binary formats. Anything the format cannot encode
+    natively (Decimals, dates, lazy strings, ...) goes through DRF's encoder.
+    """
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        start = perf_counter()
+        body = self.dumps(to_binary_value(data))
+        add_render_time(start)
+        return body
+
+    def dumps(self, data):
+        raise NotImplementedError
+
+
+class MessagePackRenderer(BinaryRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+
+    def dumps(self, data):
+        return msgpack.packb(data, default=_encoder.default)
+
+
+class CBORRenderer(BinaryRenderer):
+    media_type = "application/cbor"
+    format = "cbor"
+
+    def dumps(self, data):
+        return cbor2.dumps(data, default=lambda encoder, value: encoder.encode(_encoder.default(value)))
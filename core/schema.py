@@ -0,0 +1,133 @@
+import os
+import tempfile
+from hashlib import blake2b
+from threading import Lock
+
+import drf_spectacular
+from django.conf import settings
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+from core.utils import build_cached_response
+
+SCHEMA_SETTINGS = {
+    "DIRECTORY": os.path.join(tempfile.gettempdir(), "apiverse-schema"),
+    # Identifies the deployed code, e.g. a commit SHA. When empty, a hash of
+    # the project's Python sources is used instead.
+    "CODE_VERSION": "",
+    **getattr(settings, "OPENAPI_SCHEMA", {}),
+}
+
+FORMATS = ("yaml", "json")
+
+# Directories under BASE_DIR that hold no API code.
+_SKIPPED_DIRECTORIES = {"data", "static", "media", "node_modules", "venv", "env"}
+
+# ----------------------------
+# Code Version
+# ----------------------------
+def get_code_version():
+    """
+    CODE_VERSION, or a digest of every .py file under BASE_DIR together with
+    the drf-spectacular version and settings, all of which shape the schema.
+    """
+    if SCHEMA_SETTINGS["CODE_VERSION"]:
+        return SCHEMA_SETTINGS["CODE_VERSION"]
+
+    digest = blake2b(digest_size=8)
+    digest.update(drf_spectacular.__version__.encode())
+    digest.update(repr(sorted(getattr(settings, "SPECTACULAR_SETTINGS", {}).items())).encode())
+    for root, directories, files in os.walk(settings.BASE_DIR):
+        directories[:] = sorted(d for d in directories if not d.startswith((".", "__")) and d not in _SKIPPED_DIRECTORIES)
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, settings.BASE_DIR).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+# ----------------------------
+# Schema Artifacts
+# ----------------------------
+def get_artifact_path(version, fmt):
+    return os.path.join(SCHEMA_SETTINGS["DIRECTORY"], f"openapi-{version}.{fmt}")
+
+
+def build_artifacts(version):
+    """
+    Generates the public schema (what SpectacularAPIView serves by default)
+    and writes it as openapi-<version>.yaml/.json, replacing older versions.
+    Returns {format: bytes}.
+    """
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(urlconf=spectacular_settings.SERVE_URLCONF)
+    schema = generator.get_schema(request=None, public=True)
+    artifacts = {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, OpenApiJsonRenderer.media_type, renderer_context={}),
+    }
+
+    directory = SCHEMA_SETTINGS["DIRECTORY"]
+    os.makedirs(directory, exist_ok=True)
+    for fmt, data in artifacts.items():
+        # Write then rename, so other workers never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, get_artifact_path(version, fmt))
+
+    current = {os.path.basename(get_artifact_path(version, fmt)) for fmt in FORMATS}
+    for entry in os.scandir(directory):
+        if entry.name.startswith("openapi-") and entry.name not in current:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+    return artifacts
+
+
+def load_artifacts(version):
+    """Returns {format: bytes} written for `version`, or None if any is missing."""
+    artifacts = {}
+    for fmt in FORMATS:
+        try:
+            with open(get_artifact_path(version, fmt), "rb") as f:
+                artifacts[fmt] = f.read()
+        except FileNotFoundError:
+            return None
+    return artifacts
+
+# ----------------------------
+# Schema Cache
+# ----------------------------
+class SchemaCache:
+    """
+    The OpenAPI schema for the running code version, held in memory as
+    ready-to-serve responses (see core.utils.serve_cached).
+
+    On first use it is read from the artifacts written by `manage.py
+    build_schema`, or generated and written there when they are missing, so
+    only one worker per release pays for schema generation.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.artifacts = None
+        self.responses = {}
+
+    def get(self, fmt, content_type):
+        """Returns the CachedResponse for `fmt` ("yaml" or "json") served as `content_type`."""
+        response = self.responses.get((fmt, content_type))
+        if response is None:
+            with self.lock:
+                if self.artifacts is None:
+                    version = get_code_version()
+                    self.artifacts = load_artifacts(version) or build_artifacts(version)
+                response = self.responses.get((fmt, content_type))
+                if response is None:
+                    response = build_cached_response(self.artifacts[fmt], content_type=content_type)
+                    self.responses[(fmt, content_type)] = response
+        return response
+
+
+schema_cache = SchemaCache()
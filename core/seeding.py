@@ -0,0 +1,248 @@
+"""
+Deterministic synthetic data generators for `manage.py seed`.
+
+Every row is derived from (seed, table, index), so chunks can be generated
+in any order, in any process, and parents can be referenced by index alone.
+Ids are UUIDv7s whose timestamp is the row's `created_at`.
+Generators are pure Python (no ORM) and return {table: [row tuples]}.
+"""
+import hashlib
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from core.constants import ORDER_STATUS, PAYMENT_PROVIDERS
+from core.ids import uuid7_at
+
+WORDS = (
+    "api verse lorem ipsum dolor sit amet fast cache query index cursor stream "
+    "python django rest json token chat post like cart order product coffee "
+    "travel music code review deploy weekend morning launch build ship"
+).split()
+TAGS = ["tech", "travel", "food", "music", "sports", "news", "django", "python", "art", "fitness"]
+CITIES = [("Mumbai", "MH"), ("Delhi", "DL"), ("Pune", "MH"), ("Bengaluru", "KA"), ("Jaipur", "RJ")]
+SEED_EMAIL_DOMAIN = "seed.apiverse.dev"
+
+# Column order of the row tuples produced for each table.
+FIELDS = {
+    "users": ("id", "email", "username", "password", "is_verified", "created_at"),
+    "profiles": ("id", "owner_id", "first_name", "last_name", "created_at"),
+    "follows": ("id", "follower_id", "followee_id", "created_at"),
+    "posts": ("id", "author_id", "content", "tags", "created_at"),
+    "comments": ("id", "post_id", "author_id", "content", "created_at"),
+    "likes": ("id", "post_id", "liked_by_id", "created_at"),
+    "chats": ("id", "name", "is_group_chat", "admin_id", "created_at"),
+    "chat_participants": ("chat_id", "user_id"),
+    "messages": ("id", "chat_id", "sender_id", "content", "created_at"),
+    "categories": ("id", "name", "created_at"),
+    "products": ("id", "category_id", "owner_id", "name", "description", "price", "stock", "main_image_url", "created_at"),
+    "carts": ("id", "owner_id", "created_at"),
+    "cart_items": ("id", "cart_id", "product_id", "quantity", "created_at"),
+    "orders": (
+        "id", "customer_id", "order_price", "discounted_order_price", "address_line1", "city", "state",
+        "country", "pincode", "status", "payment_provider", "is_payment_done", "created_at",
+    ),
+    "order_items": ("id", "order_id", "product_id", "quantity", "price_at_purchase", "created_at"),
+}
+
+
+@dataclass(frozen=True)
+class SeedSpec:
+    seed: int
+    counts: dict
+    password_hash: str
+    skew: float = 2.0
+    start: datetime = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    days: int = 365
+    extra: dict = field(default_factory=dict)
+
+# ----------------------------
+# Deterministic Helpers
+# ----------------------------
+def make_digest(spec, table, index):
+    return hashlib.blake2b(f"{spec.seed}:{table}:{index}".encode(), digest_size=16).digest()
+
+
+def make_time(spec, table, index):
+    """`created_at` of row `index`, spread uniformly over the seeded period."""
+    fraction = int.from_bytes(make_digest(spec, table, index)[:6], "big") / (1 << 48)
+    return spec.start + timedelta(seconds=fraction * spec.days * 86400)
+
+
+def make_id(spec, table, index, at=None):
+    """UUIDv7 of row `index`, timestamped at `at` (default: the row's make_time)."""
+    at = at or make_time(spec, table, index)
+    return uuid7_at(at, make_digest(spec, table, index)[6:])
+
+
+def make_rng(spec, table, index):
+    return random.Random(f"{spec.seed}:{table}:{index}")
+
+
+def pick(rng, count, skew):
+    """
+    Power-law index in [0, count): u ** skew piles probability onto low indexes,
+    so a few users/posts/chats receive most of the activity.
+    """
+    return min(int(count * rng.random() ** skew), count - 1)
+
+
+def text(rng, low=5, high=30):
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def chat_members(spec, index):
+    """Participants of chat `index`: two for one-on-one chats, 3-10 for groups."""
+    rng = make_rng(spec, "chat-members", index)
+    users = spec.counts["users"]
+    size = rng.randint(3, 10) if rng.random() < 0.2 else 2
+    members = {pick(rng, users, spec.skew) for _ in range(size * 2)}
+    return sorted(members)[:size] if len(members) >= 2 else [0, min(1, users - 1)]
+
+
+def product_price(spec, index):
+    return Decimal(make_rng(spec, "price", index).randint(100, 500000)) / 100
+
+# ----------------------------
+# Table Generators
+# ----------------------------
+def gen_users(spec, rng, start, stop):
+    users, profiles = [], []
+    for i in range(start, stop):
+        user_id, created_at = make_id(spec, "users", i), make_time(spec, "users", i)
+        users.append((user_id, f"user{i}@{SEED_EMAIL_DOMAIN}", f"user{i}", spec.password_hash, True, created_at))
+        profiles.append((make_id(spec, "profiles", i, at=created_at), user_id, f"user{i}", "", created_at))
+    return {"users": users, "profiles": profiles}
+
+
+def gen_follows(spec, rng, start, stop):
+    users, rows = spec.counts["users"], []
+    for i in range(start, stop):
+        follower = rng.randrange(users)
+        followee = pick(rng, users, spec.skew)
+        if follower != followee:
+            rows.append((make_id(spec, "follows", i), make_id(spec, "users", follower), make_id(spec, "users", followee), make_time(spec, "follows", i)))
+    return {"follows": rows}
+
+
+def gen_posts(spec, rng, start, stop):
+    users = spec.counts["users"]
+    return {"posts": [
+        (make_id(spec, "posts", i), make_id(spec, "users", pick(rng, users, spec.skew)), text(rng),
+         rng.sample(TAGS, rng.randint(0, 3)), make_time(spec, "posts", i))
+        for i in range(start, stop)
+    ]}
+
+
+def gen_comments(spec, rng, start, stop):
+    users, posts = spec.counts["users"], spec.counts["posts"]
+    return {"comments": [
+        (make_id(spec, "comments", i), make_id(spec, "posts", pick(rng, posts, spec.skew)),
+         make_id(spec, "users", rng.randrange(users)), text(rng, 2, 15), make_time(spec, "comments", i))
+        for i in range(start, stop)
+    ]}
+
+
+def gen_likes(spec, rng, start, stop):
+    users, posts = spec.counts["users"], spec.counts["posts"]
+    return {"likes": [
+        (make_id(spec, "likes", i), make_id(spec, "posts", pick(rng, posts, spec.skew)),
+         make_id(spec, "users", rng.randrange(users)), make_time(spec, "likes", i))
+        for i in range(start, stop)
+    ]}
+
+
+def gen_chats(spec, rng, start, stop):
+    chats, participants = [], []
+    for i in range(start, stop):
+        chat_id = make_id(spec, "chats", i)
+        members = chat_members(spec, i)
+        is_group = len(members) > 2
+        admin_id = make_id(spec, "users", members[0]) if is_group else None
+        chats.append((chat_id, f"Chat {i}", is_group, admin_id, make_time(spec, "chats", i)))
+        participants.extend((chat_id, make_id(spec, "users", member)) for member in members)
+    return {"chats": chats, "chat_participants": participants}
+
+
+def gen_messages(spec, rng, start, stop):
+    chats, rows = spec.counts["chats"], []
+    for i in range(start, stop):
+        chat = pick(rng, chats, spec.skew)
+        sender = rng.choice(chat_members(spec, chat))
+        rows.append((make_id(spec, "messages", i), make_id(spec, "chats", chat), make_id(spec, "users", sender),
+                     text(rng, 1, 20), make_time(spec, "messages", i)))
+    return {"messages": rows}
+
+
+def gen_categories(spec, rng, start, stop):
+    return {"categories": [
+        (make_id(spec, "categories", i), f"Category {i}", make_time(spec, "categories", i))
+        for i in range(start, stop)
+    ]}
+
+
+def gen_products(spec, rng, start, stop):
+    users, categories = spec.counts["users"], spec.counts["categories"]
+    return {"products": [
+        (make_id(spec, "products", i), make_id(spec, "categories", pick(rng, categories, spec.skew)),
+         make_id(spec, "users", rng.randrange(users)), f"Product {i}", text(rng, 10, 40),
+         product_price(spec, i), rng.randint(0, 500), f"https://picsum.photos/seed/{i}/600/600", make_time(spec, "products", i))
+        for i in range(start, stop)
+    ]}
+
+
+def gen_carts(spec, rng, start, stop):
+    carts, items = [], []
+    products = spec.counts["products"]
+    for i in range(start, stop):
+        cart_id = make_id(spec, "carts", i)
+        created_at = make_time(spec, "carts", i)
+        carts.append((cart_id, make_id(spec, "users", i), created_at))
+        for n in range(rng.randint(0, 5)):
+            items.append((make_id(spec, "cart_items", f"{i}:{n}", at=created_at), cart_id, make_id(spec, "products", pick(rng, products, spec.skew)),
+                          rng.randint(1, 4), created_at))
+    return {"carts": carts, "cart_items": items}
+
+
+def gen_orders(spec, rng, start, stop):
+    users, products = spec.counts["users"], spec.counts["products"]
+    orders, items = [], []
+    for i in range(start, stop):
+        order_id = make_id(spec, "orders", i)
+        created_at = make_time(spec, "orders", i)
+        total = Decimal("0")
+        for n in range(rng.randint(1, 5)):
+            product = pick(rng, products, spec.skew)
+            quantity = rng.randint(1, 3)
+            price = product_price(spec, product)
+            total += price * quantity
+            items.append((make_id(spec, "order_items", f"{i}:{n}", at=created_at), order_id, make_id(spec, "products", product), quantity, price, created_at))
+        city, state = rng.choice(CITIES)
+        orders.append((order_id, make_id(spec, "users", pick(rng, users, spec.skew)), total, total, f"{rng.randint(1, 999)} Main Road",
+                       city, state, "India", f"{rng.randint(100000, 999999)}", rng.choice(ORDER_STATUS)[0],
+                       rng.choice(PAYMENT_PROVIDERS)[0], rng.random() < 0.8, created_at))
+    return {"orders": orders, "order_items": items}
+
+
+# (count key, generator) in dependency order; carts are capped at one per user.
+PLAN = [
+    ("users", gen_users),
+    ("follows", gen_follows),
+    ("posts", gen_posts),
+    ("comments", gen_comments),
+    ("likes", gen_likes),
+    ("chats", gen_chats),
+    ("messages", gen_messages),
+    ("categories", gen_categories),
+    ("products", gen_products),
+    ("carts", gen_carts),
+    ("orders", gen_orders),
+]
+GENERATORS = dict(PLAN)
+
+
+def generate_chunk(spec, key, start, stop):
+    """Process-pool entry point: rows for indexes [start, stop) of `key`."""
+    rng = make_rng(spec, key, start)
+    return GENERATORS[key](spec, rng, start, stop)
@@ -0,0 +1,69 @@
+from django.test import override_settings
+from django.urls import URLResolver, get_resolver, reverse
+
+from core.query_budget import QueryBudgetError
+
+EXCLUDED_URLS = ("admin", "schema", "swagger-ui", "redoc", "metrics")
+
+# ----------------------------
+# URL Walking
+# ----------------------------
+def iter_url_patterns(patterns=None, namespace=None):
+    """
+    Yields (url_name, pattern, view_class) for every named URL, following includes.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = ":".join(filter(None, [namespace, pattern.namespace])) or None
+            yield from iter_url_patterns(pattern.url_patterns, nested)
+        elif pattern.name:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            yield name, pattern, getattr(pattern.callback, "view_class", None)
+
+# ----------------------------
+# Query Budget Assertions
+# ----------------------------
+def assert_query_budgets(client, url_kwargs=None, exclude=EXCLUDED_URLS):
+    """
+    GETs every named URL with QUERY_BUDGET enforcement on and raises one
+    AssertionError listing every budget or N+1 violation.
+
+    Args:
+        client: Authenticated test client, with data already seeded.
+        url_kwargs (dict): Maps a URL name ("socials:retrieve_post") to its kwargs,
+            or a path parameter name ("pk") to a value. URLs whose parameters
+            cannot be filled are skipped.
+        exclude (tuple): URL names or namespaces not to check.
+
+    Returns:
+        list: URL names that were checked.
+    """
+    url_kwargs = url_kwargs or {}
+    checked, failures = [], []
+
+    with override_settings(QUERY_BUDGET={"ENFORCE": True}):
+        for name, pattern, view_class in iter_url_patterns():
+            if name in exclude or name.split(":")[0] in exclude:
+                continue
+            if view_class is None or not hasattr(view_class, "get"):
+                continue
+
+            params = pattern.pattern.regex.groupindex
+            kwargs = url_kwargs.get(name) or {
+                param: url_kwargs[param] for param in params if param in url_kwargs
+            }
+            if set(params) - set(kwargs):
+                continue
+
+            try:
+                client.get(reverse(name, kwargs=kwargs))
+            except QueryBudgetError as e:
+                failures.append(str(e))
+            checked.append(name)
+
+    if failures:
+        raise AssertionError("\n\n".join(failures))
+    return checked
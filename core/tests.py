@@ -1,3 +1,496 @@
-from django.test import TestCase
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import ResolverMatch, reverse
+from django.utils import timezone
+
+from accounts.models import User
+from chats.models import Chat, ChatMessage
+from core.bench import Scenario, compare_to_baseline, run_scenario
+from core.constants import EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENDING, EMAIL_SENT
+from core.ids import uuid7, uuid7_at
+from core.management.commands.seed import MODELS as SEED_MODELS
+from core.metrics import METRICS_SETTINGS, MetricsRegistry
+from core.middleware import QueryBudgetMiddleware
+from core.models import OutboxEmail
+from core.outbox import MAX_BATCH_SIZE, OUTBOX_SETTINGS, OutboxWorker
+from core.query_budget import QueryBudgetError
+from core.throttling import POLICIES, LocalStore, RateLimiter, RateLimitStatus, SharedStore, parse_rule, rate_limiter
+from core.testing import EXCLUDED_URLS, assert_query_budgets
+from ecommerce.models import Category, Product
+from socials.models import Comment, Post, Profile
+from socials.views import PostListView
+from todos.models import Todo
+
+# ----------------------------
+# Query Budgets
+# ----------------------------
+class QueryBudgetTests(TestCase):
+    # Kitchen-sink endpoints are timing/streaming demos; OAuth views call out to providers.
+    exclude = EXCLUDED_URLS + (
+        "kitchen_sink", "accounts:google_login", "accounts:google_callback",
+        "accounts:github_login", "accounts:github_callback",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed", users=20, follows=60, posts=40, comments=120, likes=200, chats=10, messages=100,
+            categories=3, products=20, carts=5, orders=10, stdout=StringIO(),
+        )
+        # The most active seeded user, so per-user lists have several rows.
+        cls.user = max(User.objects.all(), key=lambda user: user.posts.count())
+        cls.post = Post.objects.filter(comments__isnull=False).first()
+        cls.comment = Comment.objects.filter(post=cls.post).first()
+        cls.chat = Chat.objects.filter(participants=cls.user).first()
+        cls.category = Category.objects.first()
+        cls.product = Product.objects.first()
+        cls.todo = Todo.objects.create(title="Check query budgets")
+        Profile.objects.create(owner=cls.user)
+
+    def setUp(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {self.user.generate_access_token()}"
+
+    def get_url_kwargs(self):
+        return {
+            "id": self.post.id,
+            "post_id": self.post.id,
+            "comment_id": self.comment.id,
+            "user_id": self.user.id,
+            "username": self.user.username,
+            "tag": self.post.tags[0] if self.post.tags else "tech",
+            "category_id": self.category.id,
+            "todos:todo-retrieve": {"id": self.todo.id},
+            "chats:group-chat-detail": {"pk": self.chat.id},
+            "chats:chat-messages": {"pk": self.chat.id},
+            "ecommerce:category-detail": {"pk": self.category.id},
+            "ecommerce:product-detail": {"pk": self.product.id},
+        }
+
+    def test_views_stay_within_budget(self):
+        checked = assert_query_budgets(self.client, url_kwargs=self.get_url_kwargs(), exclude=self.exclude)
+        self.assertIn("socials:list_posts", checked)
+        self.assertIn("socials:retrieve_post", checked)
+        self.assertIn("chats:chat-messages", checked)
+
+    def test_n_plus_one_is_reported(self):
+        # Without prefetch_related("comments"), every post loads its comments separately.
+        def get_queryset(view):
+            return Post.objects.all()
+
+        with mock.patch.object(PostListView, "get_queryset", get_queryset):
+            with self.assertRaisesMessage(AssertionError, "PostSerializer.comments"):
+                assert_query_budgets(self.client, exclude=self.exclude)
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    class ProbeView:
+        query_budget = 0
+
+    def get_request(self):
+        def view(request):
+            pass
+
+        view.view_class = self.ProbeView
+        request = RequestFactory().get("/probe/")
+        request.resolver_match = ResolverMatch(view, (), {}, url_name="probe")
+        return request
+
+    @staticmethod
+    def run_query():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            connection.close()
+
+    @override_settings(QUERY_BUDGET={"ENFORCE": True})
+    async def test_queries_in_worker_threads_are_recorded(self):
+        # Under ASGI, sync_to_async runs the ORM on another thread and connection.
+        async def get_response(request):
+            await sync_to_async(self.run_query, thread_sensitive=False)()
+            return HttpResponse()
+
+        with self.assertRaisesMessage(QueryBudgetError, "1 queries, budget 0"):
+            await QueryBudgetMiddleware(get_response)(self.get_request())
+
+# ----------------------------
+# Seeding
+# ----------------------------
+class SeedTests(TestCase):
+    def test_reported_counts_match_the_tables(self):
+        out = StringIO()
+        # Many follows among few users, so some pairs repeat and are skipped.
+        call_command(
+            "seed", users=10, follows=200, posts=5, comments=5, likes=5, chats=20, messages=5,
+            categories=1, products=2, carts=2, orders=2, chunk_size=30, stdout=out,
+        )
+        reported = {
+            line.split()[0]: int(line.split()[1].replace(",", ""))
+            for line in out.getvalue().splitlines() if line.startswith("  ")
+        }
+        self.assertEqual(set(reported), set(SEED_MODELS))
+        for table, model in SEED_MODELS.items():
+            with self.subTest(table=table):
+                self.assertEqual(reported[table], model._base_manager.count())
+        self.assertLess(reported["follows"], 200)
+
+# ----------------------------
+# Request Metrics
+# ----------------------------
+class PrometheusExpositionTests(TestCase):
+    def test_values_keep_full_precision(self):
+        registry = MetricsRegistry()
+        registry.observe("socials:list_posts", 0.0123456789, 3, 0.001, 0.002, 12345678)
+        registry.inc("apiverse_emails_sent_total", value=10_000_001)
+        output = registry.render_prometheus()
+        self.assertIn('apiverse_response_bytes_total{view="socials:list_posts"} 12345678\n', output)
+        self.assertIn('apiverse_request_duration_seconds_sum{view="socials:list_posts"} 0.0123456789\n', output)
+        self.assertIn("apiverse_emails_sent_total 10000001\n", output)
+
+
+class MetricsEndpointTests(TestCase):
+    url = reverse("metrics")
+
+    @override_settings(DEBUG=False)
+    def test_closed_without_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @override_settings(DEBUG=True)
+    def test_open_in_debug_without_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(DEBUG=True)
+    def test_token_is_required_when_configured(self):
+        with mock.patch.dict(METRICS_SETTINGS, TOKEN="scrape-secret"):
+            self.assertEqual(self.client.get(self.url).status_code, 401)
+            self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+            self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION="Bearer scrape-secret").status_code, 200)
+
+    @override_settings(DEBUG=False)
+    def test_staff_session_is_allowed(self):
+        staff = User.objects.create_user(email="ops@example.com", username="ops", password="password123", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+class FakeTransport:
+    mode = "http"
+
+    def __init__(self, responses):
+        self.responses = iter(responses)
+
+    def request(self, method, path, payload, headers):
+        status_code, elapsed = next(self.responses)
+        return status_code, elapsed, None, {}
+
+
+class BenchTests(TestCase):
+    scenario = Scenario("status_codes", "get", "kitchen_sink:get-all-status-codes", auth=False)
+
+    def test_failed_requests_are_left_out_of_latencies(self):
+        transport = FakeTransport([(200, 0.010), (429, 0.001), (200, 0.030), (500, 0.001)])
+        stats = run_scenario(transport, self.scenario, {}, iterations=4, warmup=0)
+        self.assertEqual(stats["errors"], 2)
+        self.assertEqual(stats["p50_ms"], 10.0)
+        self.assertEqual(stats["max_ms"], 30.0)
+
+    def test_new_errors_are_a_regression(self):
+        previous = {"p50_ms": 10.0, "throughput_rps": 100.0, "errors": 0}
+        current = {"p50_ms": 10.0, "throughput_rps": 100.0, "errors": 3}
+        regressions = compare_to_baseline({"scenarios": {"login": current}}, {"scenarios": {"login": previous}}, 0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("login: errors 0 -> 3"))
+
+# ----------------------------
+# Email Outbox
+# ----------------------------
+class FakeSendGridConnection:
+    def __init__(self, error=None):
+        self.error = error
+        self.requests = []
+
+    def send_personalized(self, body, recipients):
+        if self.error:
+            raise self.error
+        self.requests.append((body, recipients))
+        return len(recipients)
+
+
+class OutboxTests(TestCase):
+    def enqueue(self, count, template_name="welcome", **context):
+        return [
+            OutboxEmail.objects.enqueue(f"user{i}@example.com", "Hello", template_name, {"username": f"user{i}", **context})
+            for i in range(count)
+        ]
+
+    def deliver(self, connection, **kwargs):
+        with mock.patch("core.outbox.get_connection", return_value=connection):
+            OutboxWorker(concurrency=2, **kwargs).run(once=True)
+
+    def get_statuses(self, emails):
+        return [OutboxEmail.objects.get(pk=email.pk).status for email in emails]
+
+    def test_claim_leases_due_rows(self):
+        emails = self.enqueue(3)
+        claimed = OutboxEmail.objects.claim(2, lease=300)
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual([email.attempts for email in claimed], [1, 1])
+        row = OutboxEmail.objects.get(pk=claimed[0].pk)
+        self.assertEqual((row.status, row.attempts), (EMAIL_SENDING, 1))
+        self.assertGreater(row.next_attempt_at, timezone.now() + timedelta(seconds=290))
+
+        self.assertEqual(len(OutboxEmail.objects.claim(10, lease=300)), 1)
+        self.assertEqual(OutboxEmail.objects.claim(10, lease=300), [])
+
+        # A crashed worker's rows are claimed again once their lease expires.
+        OutboxEmail.objects.filter(pk=emails[0].pk).update(next_attempt_at=timezone.now())
+        reclaimed = OutboxEmail.objects.claim(10, lease=300)
+        self.assertEqual([(email.pk, email.attempts) for email in reclaimed], [(emails[0].pk, 2)])
+
+    def test_emails_are_batched_per_template(self):
+        welcome = self.enqueue(5)
+        generic = self.enqueue(1, "generic", message="Hi")
+        connection = FakeSendGridConnection()
+        self.deliver(connection, batch_size=2)
+
+        sizes = sorted(len(recipients) for _, recipients in connection.requests)
+        self.assertEqual(sizes, [1, 1, 2, 2])
+        self.assertEqual(set(self.get_statuses(welcome + generic)), {EMAIL_SENT})
+        body, recipients = next(request for request in connection.requests if "-message-" in request[0])
+        self.assertEqual(recipients, [("user0@example.com", "Hello", {"-username-": "user0", "-message-": "Hi"})])
+
+    def test_batch_size_is_capped(self):
+        self.assertEqual(OutboxWorker(batch_size=5000).batch_size, MAX_BATCH_SIZE)
+
+    def test_one_bad_row_does_not_fail_its_batch(self):
+        good = self.enqueue(2)
+        bad = OutboxEmail.objects.enqueue("bad@example.com", "Hello", "welcome", {})
+        connection = FakeSendGridConnection()
+        self.deliver(connection)
+
+        self.assertEqual(self.get_statuses(good), [EMAIL_SENT, EMAIL_SENT])
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, EMAIL_FAILED)
+        self.assertEqual(bad.last_error, "Missing context key for email template: username")
+        [(_, recipients)] = connection.requests
+        self.assertEqual([to_email for to_email, _, _ in recipients], ["user0@example.com", "user1@example.com"])
+
+    def test_delivery_errors_are_retried_with_backoff(self):
+        [email] = self.enqueue(1)
+        self.deliver(FakeSendGridConnection(RuntimeError("SendGrid is down")))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.last_error), (EMAIL_PENDING, 1, "SendGrid is down"))
+        delay = (email.next_attempt_at - timezone.now()).total_seconds()
+        self.assertTrue(OUTBOX_SETTINGS["RETRY_BASE_DELAY"] * 0.5 - 1 <= delay <= OUTBOX_SETTINGS["RETRY_BASE_DELAY"])
+
+        # Out of attempts: the email fails for good.
+        OutboxEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.deliver(FakeSendGridConnection(RuntimeError("SendGrid is down")), max_attempts=2)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (EMAIL_FAILED, 2))
+
+    def test_backoff_grows_exponentially_up_to_the_cap(self):
+        with mock.patch("core.outbox.random.uniform", return_value=1.0):
+            delays = [OutboxWorker.get_backoff(attempts) for attempts in (1, 2, 3, 20)]
+        base = OUTBOX_SETTINGS["RETRY_BASE_DELAY"]
+        self.assertEqual(delays, [base, base * 2, base * 4, OUTBOX_SETTINGS["RETRY_MAX_DELAY"]])
+
+# ----------------------------
+# Rate Limiting
+# ----------------------------
+class RateLimitStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def hit(self, store, clock, now, count=1):
+        with mock.patch(f"core.throttling.{clock}", return_value=now):
+            return [store.hit("key", 4, 60) for _ in range(count)]
+
+    def test_token_bucket_refills_over_time(self):
+        store = LocalStore(maxsize=10)
+        statuses = self.hit(store, "monotonic", 100, count=5)
+        self.assertEqual([status.allowed for status in statuses], [True] * 4 + [False])
+        self.assertEqual([status.remaining for status in statuses], [3, 2, 1, 0, 0])
+        self.assertEqual(statuses[-1].reset, 15)
+
+        # 4 tokens per 60s: one token is back after 15 seconds.
+        [status] = self.hit(store, "monotonic", 115)
+        self.assertEqual((status.allowed, status.remaining), (True, 0))
+        [status] = self.hit(store, "monotonic", 115)
+        self.assertFalse(status.allowed)
+
+    def test_least_recently_used_buckets_are_dropped(self):
+        store = LocalStore(maxsize=2)
+        for key in ("a", "b", "c"):
+            store.hit(key, 4, 60)
+        self.assertEqual(list(store.buckets), ["b", "c"])
+
+    def test_sliding_window_weights_the_previous_window(self):
+        store = SharedStore("default")
+        statuses = self.hit(store, "time", 600, count=5)
+        self.assertEqual([status.allowed for status in statuses], [True] * 4 + [False])
+
+        # Halfway through the next window, half of the previous 5 hits still count.
+        allowed, rejected = self.hit(store, "time", 690, count=2)
+        self.assertEqual((allowed.allowed, allowed.remaining, allowed.reset), (True, 0, 30))
+        self.assertFalse(rejected.allowed)
+
+        [status] = self.hit(store, "time", 720)
+        self.assertEqual((status.allowed, status.remaining), (True, 1))
+
+    def test_local_token_is_refunded_when_the_shared_store_rejects(self):
+        limiter = RateLimiter(max_keys=10, shared_alias="default")
+        rules = [parse_rule("ip:2/min")]
+        identities = {"ip": "10.0.0.1"}
+        with mock.patch.object(limiter.shared, "hit", return_value=RateLimitStatus(False, 2, 0, 30)):
+            for _ in range(3):
+                self.assertFalse(limiter.check("login", rules, identities).allowed)
+        [(tokens, _)] = limiter.local.buckets.values()
+        self.assertEqual(tokens, 2)
+        self.assertTrue(limiter.check("login", rules, identities).allowed)
+
+
+class RateLimitPolicyTests(TestCase):
+    forgot_password_url = reverse("accounts:forgot_password")
+    change_password_url = reverse("accounts:change_password")
+
+    def setUp(self):
+        rate_limiter.local.buckets.clear()
+
+    def forgot_password(self, email, ip="10.0.0.1"):
+        return self.client.post(self.forgot_password_url, {"email": email}, content_type="application/json", REMOTE_ADDR=ip)
+
+    @mock.patch.dict(POLICIES, {"accounts:forgot_password": [parse_rule("ip:3/min"), parse_rule("email:1/min")]})
+    def test_ip_and_email_scopes(self):
+        response = self.forgot_password("a@example.com")
+        self.assertEqual(response.status_code, 200)
+        # The most restrictive rule is reported.
+        self.assertEqual(response["RateLimit-Limit"], "1")
+        self.assertEqual(response["RateLimit-Remaining"], "0")
+        self.assertNotIn("Retry-After", response)
+
+        response = self.forgot_password("A@example.com ")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertEqual(response["RateLimit-Reset"], "60")
+
+        # Another email from the same IP, until the IP's 3 requests are used up.
+        self.assertEqual(self.forgot_password("b@example.com").status_code, 200)
+        self.assertEqual(self.forgot_password("c@example.com").status_code, 429)
+        # The email limit holds across IPs; other IPs have their own limit.
+        self.assertEqual(self.forgot_password("a@example.com", ip="10.0.0.2").status_code, 429)
+        self.assertEqual(self.forgot_password("d@example.com", ip="10.0.0.2").status_code, 200)
+
+    @mock.patch.dict(POLICIES, {"accounts:change_password": [parse_rule("user:1/min")]})
+    def test_user_scope(self):
+        first = User.objects.create_user(email="first@example.com", username="first", password="password123")
+        second = User.objects.create_user(email="second@example.com", username="second", password="password123")
+
+        def change_password(user):
+            return self.client.post(
+                self.change_password_url, {}, content_type="application/json",
+                HTTP_AUTHORIZATION=f"Bearer {user.generate_access_token()}",
+            )
+
+        self.assertEqual(change_password(first).status_code, 400)
+        self.assertEqual(change_password(first).status_code, 429)
+        self.assertEqual(change_password(second).status_code, 400)
+
+    def test_rules_are_parsed(self):
+        self.assertEqual(parse_rule("email:3/10min"), ("email", 3, 600.0))
+        self.assertEqual(parse_rule("ip: 5 / hour"), ("ip", 5, 3600.0))
+        for rule in ("ip:5", "device:5/min", "ip:5/fortnight"):
+            with self.subTest(rule=rule), self.assertRaises(ValueError):
+                parse_rule(rule)
+
+# ----------------------------
+# UUIDv7 Ids
+# ----------------------------
+class UUID7Tests(TestCase):
+    def test_ids_increase(self):
+        ids = [uuid7() for _ in range(10000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual({(i.version, i.variant) for i in ids}, {(7, uuid.RFC_4122)})
+
+    def test_ids_increase_within_one_millisecond(self):
+        # More ids than rand_a can count in one millisecond borrow from the next.
+        now = uuid7().int >> 80
+        with mock.patch("core.ids.time.time_ns", return_value=now * 1_000_000):
+            ids = [uuid7() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_uuid7_at_encodes_the_timestamp(self):
+        moment = datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone.utc)
+        value = uuid7_at(moment, entropy=bytes(range(10)))
+        self.assertEqual(value.int >> 80, int(moment.timestamp() * 1000))
+        self.assertEqual(value, uuid7_at(moment, entropy=bytes(range(10))))
+        self.assertLess(value, uuid7_at(moment + timedelta(milliseconds=1)))
+
+
+class RekeyUUID7Tests(TestCase):
+    def setUp(self):
+        # Rows as created before ids were time-ordered.
+        self.user = User.objects.create_user(id=uuid.uuid4(), email="old@example.com", username="old", password="x")
+        self.other = User.objects.create_user(id=uuid.uuid4(), email="older@example.com", username="older", password="x")
+        self.post = Post.objects.create(id=uuid.uuid4(), author=self.user, content="Legacy post")
+        self.comment = Comment.objects.create(id=uuid.uuid4(), author=self.other, post=self.post, content="Legacy comment")
+        self.chat = Chat.objects.create(id=uuid.uuid4(), name="Legacy chat", admin=self.user)
+        self.chat.participants.set([self.user, self.other])
+        self.message = ChatMessage.objects.create(id=uuid.uuid4(), sender=self.other, chat=self.chat, content="Hi")
+        Chat.objects.filter(pk=self.chat.pk).update(last_message=self.message)
+
+    def rekey(self):
+        out = StringIO()
+        call_command("rekey_uuid7", batch_size=2, stdout=out)
+        return out.getvalue()
+
+    def test_references_are_rewritten(self):
+        self.rekey()
+
+        user = User.objects.get(username="old")
+        other = User.objects.get(username="older")
+        post = Post.objects.get(content="Legacy post")
+        comment = Comment.objects.get(content="Legacy comment")
+        chat = Chat.objects.get(name="Legacy chat")
+        for row, old in ((user, self.user), (post, self.post), (comment, self.comment), (chat, self.chat)):
+            with self.subTest(row=row):
+                self.assertEqual(row.pk.version, 7)
+                self.assertNotEqual(row.pk, old.pk)
+                self.assertEqual(row.pk.int >> 80, int(row.created_at.timestamp() * 1000))
+
+        self.assertEqual((post.author_id, comment.author_id, comment.post_id), (user.pk, other.pk, post.pk))
+        self.assertEqual(chat.admin_id, user.pk)
+        self.assertEqual(chat.last_message.content, "Hi")
+        self.assertEqual(chat.last_message.sender_id, other.pk)
+        self.assertEqual(set(chat.participants.values_list("pk", flat=True)), {user.pk, other.pk})
+        self.assertEqual(user.profile.first_name, "old")
+
+    def test_running_twice_changes_nothing(self):
+        self.rekey()
+        ids = {model: set(model.all_objects.values_list("pk", flat=True)) for model in (User, Post, Comment, Chat)}
+        participants = set(Chat.participants.through.objects.values_list("chat_id", "user_id"))
+
+        output = self.rekey()
+        self.assertNotRegex(output, r"[1-9][\d,]* rows re-keyed")
+        for model, before in ids.items():
+            self.assertEqual(set(model.all_objects.values_list("pk", flat=True)), before)
+        self.assertEqual(set(Chat.participants.through.objects.values_list("chat_id", "user_id")), participants)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command("rekey_uuid7", models="socials.Post", dry_run=True, stdout=out)
+        self.assertIn("1 rows would be re-keyed", out.getvalue())
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
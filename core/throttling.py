@@ -0,0 +1,253 @@
+import math
+import re
+from collections import OrderedDict, namedtuple
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic, perf_counter, time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from core.metrics import registry, request_timings
+
+THROTTLE_SETTINGS = {
+    "ENABLED": True,
+    # When False, limits are evaluated and reported (headers, metrics) but not enforced.
+    "ENFORCE": True,
+    # Alias from CACHES shared by all workers (e.g. Redis) for exact limits
+    # across processes. None = each process limits on its own.
+    "SHARED_CACHE": None,
+    # Buckets kept in memory per process; the least recently used are dropped.
+    "MAX_KEYS": 100000,
+    # URL name (or "namespace:*") -> rules "<scope>:<count>/<period>", where
+    # scope is "ip", "user" or "email" (the `email` field of the request body).
+    "POLICIES": {},
+    **getattr(settings, "THROTTLING", {}),
+}
+
+_PERIODS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+_RULE_RE = re.compile(r"^(ip|user|email):(\d+)/(\d*)(\w+)$")
+
+Rule = namedtuple("Rule", ["scope", "limit", "period"])
+RateLimitStatus = namedtuple("RateLimitStatus", ["allowed", "limit", "remaining", "reset"])
+
+
+def parse_rule(rule):
+    """Parses "ip:5/min" (or "email:3/10min") into Rule("ip", 5, 60.0)."""
+    match = _RULE_RE.match(rule.replace(" ", ""))
+    if match is None or match.group(4) not in _PERIODS:
+        raise ValueError(f"Invalid throttle rule {rule!r}; expected e.g. 'ip:5/min'.")
+    scope, limit, multiplier, unit = match.groups()
+    return Rule(scope, int(limit), float(int(multiplier or 1) * _PERIODS[unit]))
+
+
+POLICIES = {
+    name: [parse_rule(rule) for rule in rules]
+    for name, rules in THROTTLE_SETTINGS["POLICIES"].items()
+}
+
+
+def get_policy(view_name):
+    """
+    Returns (policy name, rules) for a resolved URL name: its exact entry,
+    else its namespace's "namespace:*" entry, whose limits then apply to the
+    namespace as a whole. (None, ()) when neither exists.
+    """
+    if view_name in POLICIES:
+        return view_name, POLICIES[view_name]
+    if ":" in view_name:
+        name = f"{view_name.rsplit(':', 1)[0]}:*"
+        if name in POLICIES:
+            return name, POLICIES[name]
+    return None, ()
+
+# ----------------------------
+# Stores
+# ----------------------------
+class LocalStore:
+    """
+    Token buckets in process memory: each key holds up to `limit` tokens and
+    refills at limit/period per second. Exact within one process.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.buckets = OrderedDict()
+        self.lock = Lock()
+
+    def hit(self, key, limit, period):
+        rate = limit / period
+        now = monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.pop(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.maxsize:
+                self.buckets.popitem(last=False)
+
+        reset = (limit - tokens) / rate
+        if allowed:
+            return RateLimitStatus(True, limit, int(tokens), reset)
+        return RateLimitStatus(False, limit, 0, (1 - tokens) / rate)
+
+    def refund(self, key, limit):
+        """Gives back the token taken by a hit that was rejected elsewhere."""
+        with self.lock:
+            if key in self.buckets:
+                tokens, updated_at = self.buckets[key]
+                self.buckets[key] = (min(limit, tokens + 1), updated_at)
+
+
+class SharedStore:
+    """
+    Sliding-window counters in a shared Django cache: the count of the
+    current fixed window plus the previous window's, weighted by how much of
+    it still overlaps the sliding window. Uses atomic `incr`, so it is
+    accurate across workers on Redis or Memcached.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def hit(self, key, limit, period):
+        cache = caches[self.alias]
+        now = time()
+        window = int(now // period)
+        elapsed = now / period - window
+        current_key = f"throttle:{key}:{window}"
+        try:
+            count = cache.incr(current_key)
+        except ValueError:
+            cache.add(current_key, 0, timeout=int(period * 2) + 1)
+            count = cache.incr(current_key)
+        previous = cache.get(f"throttle:{key}:{window - 1}", 0)
+
+        used = previous * (1 - elapsed) + count
+        reset = (1 - elapsed) * period
+        if used <= limit:
+            return RateLimitStatus(True, limit, int(limit - used), reset)
+        return RateLimitStatus(False, limit, 0, reset)
+
+# ----------------------------
+# Rate Limiter
+# ----------------------------
+class RateLimiter:
+    """
+    Applies a policy's rules to a request's identities. The local bucket is
+    checked first, so clients over the limit are rejected without a cache
+    round trip; requests it admits are then counted in the shared store,
+    when one is configured, which decides across workers. A request the
+    shared store rejects gets its local token back.
+    """
+
+    def __init__(self, max_keys, shared_alias=None):
+        self.local = LocalStore(max_keys)
+        self.shared = SharedStore(shared_alias) if shared_alias else None
+
+    def check(self, policy, rules, identities):
+        """
+        Returns the RateLimitStatus of the most restrictive applicable rule,
+        or None if no rule applies. Rules whose scope has no identity (e.g.
+        "user" for anonymous requests) are skipped.
+        """
+        start = perf_counter()
+        result = None
+        for rule in rules:
+            identity = identities.get(rule.scope)
+            if not identity:
+                continue
+            key = f"{policy}:{rule.scope}:{identity}:{rule.limit}/{rule.period:g}"
+            status = self.local.hit(key, rule.limit, rule.period)
+            if status.allowed and self.shared is not None:
+                status = self.shared.hit(key, rule.limit, rule.period)
+                if not status.allowed:
+                    self.local.refund(key, rule.limit)
+            if not status.allowed:
+                registry.inc("apiverse_throttled_requests_total", policy=policy, scope=rule.scope)
+            if result is None or not status.allowed or (result.allowed and status.remaining < result.remaining):
+                result = status
+            if not status.allowed:
+                break
+
+        timings = request_timings.get()
+        if timings is not None:
+            timings.throttle_time += perf_counter() - start
+        return result
+
+
+rate_limiter = RateLimiter(THROTTLE_SETTINGS["MAX_KEYS"], THROTTLE_SETTINGS["SHARED_CACHE"])
+
+
+def hash_identity(value):
+    """Keeps emails (and other personal data) out of cache keys."""
+    return blake2b(value.strip().lower().encode(), digest_size=12).hexdigest()
+
+
+def get_client_ident(request):
+    """The client IP as DRF throttles see it (honours NUM_PROXIES), for plain Django views."""
+    return BaseThrottle().get_ident(request)
+
+
+def check_rate_limit(request, ip, user_id=None, email=None):
+    """
+    Checks the policy of the request's URL name. Returns the RateLimitStatus
+    (also kept on `request.rate_limit` for the response headers), or None if
+    throttling is disabled or no policy applies.
+    """
+    match = request.resolver_match
+    if not THROTTLE_SETTINGS["ENABLED"] or match is None:
+        return None
+    policy, rules = get_policy(match.view_name)
+    if not rules:
+        return None
+
+    identities = {"ip": ip, "user": str(user_id) if user_id else None, "email": hash_identity(email) if email else None}
+    status = rate_limiter.check(policy, rules, identities)
+    if status is not None and not THROTTLE_SETTINGS["ENFORCE"]:
+        status = status._replace(allowed=True)
+    request.rate_limit = status
+    return status
+
+
+def add_rate_limit_headers(response, status):
+    """RateLimit-* headers (IETF draft) plus Retry-After when the request was rejected."""
+    response["RateLimit-Limit"] = str(status.limit)
+    response["RateLimit-Remaining"] = str(status.remaining)
+    response["RateLimit-Reset"] = str(math.ceil(status.reset))
+    if not status.allowed:
+        response["Retry-After"] = str(math.ceil(status.reset))
+    return response
+
+# ----------------------------
+# DRF Throttle
+# ----------------------------
+class PolicyThrottle(BaseThrottle):
+    """
+    Throttles DRF views by the THROTTLING["POLICIES"] entry of their URL name.
+    The request body is only parsed when a rule is keyed by email.
+    The client IP comes from DRF's `get_ident` (honours NUM_PROXIES).
+    """
+
+    def __init__(self):
+        self.status = None
+
+    def allow_request(self, request, view):
+        _, rules = get_policy(request.resolver_match.view_name) if request.resolver_match else (None, ())
+        email = None
+        if any(rule.scope == "email" for rule in rules):
+            email = request.data.get("email") if hasattr(request.data, "get") else None
+            email = email if isinstance(email, str) else None
+        user = request.user
+        self.status = check_rate_limit(
+            request._request, self.get_ident(request),
+            user_id=user.pk if user is not None and user.is_authenticated else None,
+            email=email,
+        )
+        return self.status is None or self.status.allowed
+
+    def wait(self):
+        return self.status.reset if self.status is not None else None
@@ -0,0 +1,109 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+from core.cache import LRUCache
+from core.metrics import registry
+
+USER_AGENT_SETTINGS = {
+    "RULES": os.path.join(settings.BASE_DIR, "data", "user-agents.json"),
+    "CACHE_SIZE": 1024,
+    "MAX_LENGTH": 512,
+    **getattr(settings, "USER_AGENTS", {}),
+}
+
+# ----------------------------
+# Rule Compilation
+# ----------------------------
+# data/user-agents.json maps each family (bot, browser, os, device) to ordered
+# [name, pattern] rules; a pattern may capture `(?P<version>...)`. Each family
+# is compiled into one regex `^(?:.*?(?P<r0>...)|.*?(?P<r1>...)|...)`: the
+# alternatives are tried in order, so the first rule that matches anywhere
+# in the string wins, and `lastgroup` names it.
+class RuleSet:
+    def __init__(self, rules):
+        self.names = [name for name, _ in rules]
+        alternatives = [
+            f".*?(?P<r{index}>{pattern.replace('(?P<version>', f'(?P<v{index}>')})"
+            for index, (_, pattern) in enumerate(rules)
+        ]
+        self.regex = re.compile(f"^(?:{'|'.join(alternatives)})", re.DOTALL)
+
+    def match(self, user_agent):
+        """Returns (name, version) of the first matching rule, or (None, None)."""
+        match = self.regex.match(user_agent)
+        if match is None:
+            return None, None
+        index = int(match.lastgroup[1:])
+        version = match.groupdict().get(f"v{index}")
+        return self.names[index], version.replace("_", ".") if version else None
+
+
+def load_rules(path):
+    with open(path, "r") as f:
+        return {family: RuleSet(rules) for family, rules in json.load(f).items()}
+
+# ----------------------------
+# User-Agent Parsing
+# ----------------------------
+@dataclass(frozen=True)
+class ClientInfo:
+    browser: Optional[str] = None
+    browser_version: Optional[str] = None
+    os: Optional[str] = None
+    os_version: Optional[str] = None
+    device: str = "other"
+    bot: Optional[str] = None
+
+    @property
+    def family(self):
+        """Low-cardinality label for metrics and logs: the bot or browser name."""
+        return self.bot or self.browser or "Other"
+
+    def as_dict(self):
+        return {
+            "browser": {"name": self.browser, "version": self.browser_version},
+            "os": {"name": self.os, "version": self.os_version},
+            "device": self.device,
+            "bot": self.bot,
+            "isBot": self.bot is not None,
+        }
+
+
+_rules = load_rules(USER_AGENT_SETTINGS["RULES"])
+_cache = LRUCache(maxsize=USER_AGENT_SETTINGS["CACHE_SIZE"])
+
+
+def parse_user_agent(user_agent: str) -> ClientInfo:
+    """
+    Returns browser, OS, device type and bot detected in a User-Agent header.
+    Results are memoized per distinct string, which real traffic has few of;
+    ClientInfo is immutable so callers can share them.
+    """
+    user_agent = (user_agent or "")[:USER_AGENT_SETTINGS["MAX_LENGTH"]]
+    info = _cache.get(user_agent)
+    if info is None:
+        info = _parse(user_agent)
+        _cache.set(user_agent, info)
+    return info
+
+
+def _parse(user_agent):
+    bot, _ = _rules["bot"].match(user_agent)
+    browser, browser_version = (None, None) if bot else _rules["browser"].match(user_agent)
+    os_name, os_version = _rules["os"].match(user_agent)
+    if bot:
+        device = "bot"
+    else:
+        device = _rules["device"].match(user_agent)[0] or ("desktop" if browser else "other")
+    return ClientInfo(browser, browser_version, os_name, os_version, device, bot)
+
+
+registry.register_collector(lambda: {
+    "apiverse_user_agent_cache_hits_total": _cache.hits,
+    "apiverse_user_agent_cache_misses_total": _cache.misses,
+})
@@ -1,13 +1,12 @@
 import secrets
 import hashlib
+from collections import namedtuple
 from datetime import timedelta
-from threading import Thread
-import logging
-from smtplib import SMTPException
 
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, parse_header_parameters
 
 from rest_framework import status
 from rest_framework.response import Response
@@ -15,9 +14,8 @@ from rest_framework import serializers
 
 from typing import Optional, Union
 
-from accounts.emails import EMAIL_TEMPLATES
-
-logger = logging.getLogger(__name__)
+from core.compression import Precompressed
+from core.models import OutboxEmail
 
 # ----------------------------
 # Generate Temporary Token
@@ -63,45 +61,84 @@ def api_response(
     }
     return Response(response, status=status_code)
 
+
+def json_response(
+    success: bool,
+    message: str,
+    data: Optional[Union[dict, list]] = None,
+    status_code: int = status.HTTP_200_OK,
+) -> JsonResponse:
+    """
+    `api_response` for plain Django views (e.g. async views, which DRF's
+    APIView does not support); same envelope, rendered by JsonResponse.
+    """
+    response = {
+        "success": success,
+        "message": message,
+        "data": data or {},
+    }
+    return JsonResponse(response, status=status_code)
+
 # ----------------------------
-# Synchronous Template-based Email Sender
+# Precomputed Responses
 # ----------------------------
-def _send_email_sync(to_email: str, subject: str, template_name: str = "generic", context: dict = None):
+CachedResponse = namedtuple("CachedResponse", ["body", "status", "etag", "content_type"])
+
+
+def build_cached_response(body: bytes, status_code: int = status.HTTP_200_OK, content_type: str = "application/json"):
+    """
+    Wraps a body rendered once (e.g. a static catalog) for `serve_cached`.
+    Compressed variants are built on first use and cached alongside.
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return CachedResponse(Precompressed(body), status_code, etag, content_type)
+
+
+def wants_compact_json(request) -> bool:
+    """
+    True when DRF negotiated compact JSON for `request`, i.e. when a body
+    pre-rendered for `serve_cached` is what the renderer would have produced.
+    Other renderers (MessagePack, CBOR, browsable API, `indent=`) must render per request.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    if renderer is None or renderer.format != "json":
+        return False
+    _, params = parse_header_parameters(request.accepted_media_type or "")
+    return "indent" not in params
+
+
+def serve_cached(request, cached: CachedResponse, headers: Optional[dict] = None) -> HttpResponse:
     """
-    Internal function to send an email synchronously using a template.
-    Raises exception if email fails to send.
+    Returns the precomputed response, compressed for the request's
+    Accept-Encoding, or 304 Not Modified when If-None-Match matches its ETag.
+    Only 2xx responses are revalidated (RFC 9110 §13.2.1).
     """
-    from_email = getattr(settings, "EMAIL_FROM", None)
-    if not from_email:
-        raise ValueError("EMAIL_FROM is not configured in settings.")
-
-    template = EMAIL_TEMPLATES.get(template_name, EMAIL_TEMPLATES["generic"])
-    context = context or {}
-    
-    try:
-        message = template.format(**context)
-    except KeyError as e:
-        raise ValueError(f"Missing context key for email template: {e}")
-
-    try:
-        send_mail(subject, message, from_email, [to_email], fail_silently=False)
-        logger.info(f"Email sent to {to_email}")
-    except SMTPException as e:
-        logger.error(f"Failed to send email to {to_email}: {e}")
-        raise Exception("Failed to send email.")
+    if 200 <= cached.status < 300:
+        etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in etags or cached.etag in etags or f"W/{cached.etag}" in etags:
+            response = HttpResponseNotModified()
+            response["ETag"] = cached.etag
+            patch_vary_headers(response, ("Accept-Encoding",))
+            return response
+
+    body, encoding = cached.body.negotiate(request)
+    response = HttpResponse(body, status=cached.status, content_type=cached.content_type, headers=headers)
+    if encoding is None:
+        response["ETag"] = cached.etag
+    else:
+        response["ETag"] = f"W/{cached.etag}"
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
 
 # ----------------------------
-# Asynchronous Template-based Email Sender
+# Template-based Email Sender (Outbox)
 # ----------------------------
 def send_email(to_email: str, subject: str, template_name: str = "generic", context: dict = None):
     """
-    Public function to send an email asynchronously using a thread.
+    Queues a template-based email in the outbox; `manage.py run_outbox` delivers it.
     Usage examples:
         send_email("user@example.com", "Welcome!", "welcome", {"username": "John"})
         send_email("user@example.com", "Reset Password", "reset_password", {"username": "John", "reset_link": "link"})
     """
-    Thread(
-        target=_send_email_sync,
-        args=(to_email, subject, template_name, context),
-        daemon=True
-    ).start()
+    return OutboxEmail.objects.enqueue(to_email, subject, template_name, context)
@@ -1,3 +1,52 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from drf_spectacular.views import SpectacularAPIView
 
-# Create your views here.
+from core.metrics import METRICS_SETTINGS, registry
+from core.schema import schema_cache
+from core.utils import serve_cached
+
+# ----------------------------
+# Prometheus Metrics
+# ----------------------------
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus text exposition of the request metrics of all workers.
+    Requires `Authorization: Bearer <REQUEST_METRICS["TOKEN"]>` or a staff
+    session; without a configured token it is only open when DEBUG is on.
+    """
+    token = METRICS_SETTINGS["TOKEN"]
+    if token:
+        allowed = constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+    else:
+        allowed = settings.DEBUG
+    if not (allowed or request.user.is_staff):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+
+    return HttpResponse(registry.render_prometheus(), content_type="text/plain; version=0.0.4")
+
+# ----------------------------
+# OpenAPI Schema
+# ----------------------------
+class CachedSchemaView(SpectacularAPIView):
+    """
+    SpectacularAPIView served from core.schema.schema_cache instead of
+    introspecting every view per request, with ETag revalidation and
+    precompressed bodies. Localized (`?lang=`) and versioned (`?version=`)
+    schemas are still generated per request.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("lang") or request.GET.get("version") or self.api_version or request.version:
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        content_type = f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type
+        title = self._get_filename(request, None)
+        return serve_cached(
+            request, schema_cache.get(renderer.format, content_type),
+            headers={"Content-Disposition": f'inline; filename="{title}"'},
+        )
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def sync_soft_deleted(apps, schema_editor):
+    # deleted_at becomes the only liveness predicate; older deletes set just one of the two fields.
+    for name in ("Address", "Category", "Coupon", "Product", "Cart", "CartItem", "Order", "OrderItem", "Profile"):
+        model = apps.get_model("ecommerce", name)
+        model.objects.filter(is_active=False, deleted_at__isnull=True).update(deleted_at=models.F("updated_at"))
+        model.objects.filter(is_active=True, deleted_at__isnull=False).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ecommerce', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_soft_deleted, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='ecommerce_p_created_e1b88d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='ecommerce_p_categor_7ffb62_idx',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['created_at', 'id'], name='product_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['category', 'created_at', 'id'], name='product_live_cat_created_idx'),
+        ),
+    ]
@@ -27,6 +27,8 @@ class Category(BaseModel):
     name = models.CharField(max_length=255)
     owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 
+    soft_delete_cascade = ("products",)
+
     def __str__(self):
         return self.name
 
@@ -59,6 +61,14 @@ class Product(BaseModel):
     main_image_url = models.URLField()
     sub_images = models.JSONField(default=list, blank=True)
 
+    # Deleted products leave carts; past order items keep pointing at them.
+    soft_delete_cascade = ("cartitem",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "id"], name="product_live_category_idx", condition=models.Q(deleted_at__isnull=True)),
+        ]
+
     def __str__(self):
         return self.name
     
@@ -70,6 +80,8 @@ class Cart(BaseModel):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="carts")
     coupon = models.ForeignKey(Coupon, on_delete=models.SET_NULL, null=True, blank=True)
 
+    soft_delete_cascade = ("items",)
+
     def __str__(self):
         return f"Cart {self.id} - {self.owner}"
 
@@ -102,6 +114,8 @@ class Order(BaseModel):
     payment_id = models.CharField(max_length=255, blank=True, null=True)
     is_payment_done = models.BooleanField(default=False)
 
+    soft_delete_cascade = ("items",)
+
     def __str__(self):
         return f"Order {self.id} - {self.customer}"
 
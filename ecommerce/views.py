@@ -63,14 +63,16 @@ class ProfileUpdateView(generics.UpdateAPIView):
 class CategoryListView(generics.ListAPIView):
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    query_budget = 2
     queryset = Category.objects.all()
 
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
         return api_response(
             success=True,
             message="Categories retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -146,14 +148,16 @@ class CategoryDeleteView(generics.DestroyAPIView):
 class ProductListView(generics.ListAPIView):
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    query_budget = 2
     queryset = Product.objects.all()
 
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
         return api_response(
             success=True,
             message="Products retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -177,17 +181,19 @@ class ProductDetailView(generics.RetrieveAPIView):
 class CategoryProductsView(generics.ListAPIView):
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    query_budget = 2
 
     def get_queryset(self):
         category_id = self.kwargs.get("category_id")
         return Product.objects.filter(category_id=category_id)
 
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
         return api_response(
             success=True,
             message="Products retrieved successfully for this category",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -247,9 +253,10 @@ class ProductDeleteView(generics.DestroyAPIView):
 class UserCartView(generics.RetrieveAPIView):
     serializer_class = CartSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 5
     
     def get_object(self):
-        cart, _ = Cart.objects.get_or_create(owner=self.request.user)
+        cart, _ = Cart.objects.prefetch_related("items").get_or_create(owner=self.request.user)
         return cart
     
     def get(self, request, *args, **kwargs):
@@ -363,14 +370,16 @@ class ClearCartView(generics.DestroyAPIView):
 class CouponListView(generics.ListAPIView):
     serializer_class = CouponSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    query_budget = 2
     queryset = Coupon.objects.all()
     
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
         return api_response(
             success=True,
             message="Coupons retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
     
@@ -393,6 +402,7 @@ class CouponCreateView(generics.CreateAPIView):
 class AvailableCouponListView(generics.ListAPIView):
     serializer_class = CouponSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 2
     
     def get_queryset(self):
         now = timezone.now()
@@ -402,11 +412,12 @@ class AvailableCouponListView(generics.ListAPIView):
         )
         
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
         return api_response(
             success=True,
             message="Available coupons retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
         
@@ -544,17 +555,18 @@ class CouponStatusUpdateView(generics.UpdateAPIView):
 class AddressListView(generics.ListAPIView):
     serializer_class = AddressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 2
     
     def get_queryset(self):
         return Address.objects.filter(owner=self.request.user)
     
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        queryset = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(queryset, many=True)
         return api_response(
             success=True,
             message="Addresses retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def sync_soft_deleted(apps, schema_editor):
+    # deleted_at becomes the only liveness predicate; older deletes set just one of the two fields.
+    for name in ("Post", "Comment", "Like", "Bookmark", "Follow", "Profile"):
+        model = apps.get_model("socials", name)
+        model.objects.filter(is_active=False, deleted_at__isnull=True).update(deleted_at=models.F("updated_at"))
+        model.objects.filter(is_active=True, deleted_at__isnull=False).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socials', '0005_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_soft_deleted, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='socials_com_post_id_9a8695_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='socials_pos_created_5c3a9c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='socials_pos_author__844476_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['post', 'created_at', 'id'], name='comment_live_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['created_at', 'id'], name='post_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['author', 'created_at', 'id'], name='post_live_author_created_idx'),
+        ),
+    ]
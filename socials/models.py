@@ -1,5 +1,4 @@
 from django.db import models
-from django.utils import timezone
 from django.utils.functional import cached_property
 from accounts.models import User
 from core.models import BaseModel
@@ -13,14 +12,16 @@ class Post(BaseModel):
     tags = models.JSONField(default=list, blank=True)
     images = models.JSONField(default=list, blank=True)
 
+    soft_delete_cascade = ("comments", "likes", "bookmarks")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["author", "id"], name="post_live_author_idx", condition=models.Q(deleted_at__isnull=True)),
+        ]
+
     def __str__(self):
         return f"Post by {self.author}"
 
-    def soft_delete(self):
-        """Mark the post as deleted instead of permanently removing it"""
-        self.deleted_at = timezone.now()
-        self.save(update_fields=["deleted_at"])
-
 
 # ==============================================================
 #                           COMMENT
@@ -30,6 +31,13 @@ class Comment(BaseModel):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
     content = models.TextField()
 
+    soft_delete_cascade = ("likes",)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["post", "id"], name="comment_live_post_idx", condition=models.Q(deleted_at__isnull=True)),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author} on {self.post.id}"
 
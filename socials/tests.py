@@ -1,3 +1,124 @@
+import base64
+
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from core.pagination import KeysetPagination
+from socials.models import Bookmark, Comment, Like, Post
+
+# ----------------------------
+# Keyset Pagination
+# ----------------------------
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="pager@example.com", username="pager", password="password123")
+        # UUIDv7 ids increase with creation order, so the newest post comes first.
+        cls.posts = [Post.objects.create(author=cls.user, content=f"Post {i}") for i in range(25)]
+        cls.url = reverse("socials:list_posts")
+
+    def setUp(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {self.user.generate_access_token()}"
+
+    def get_page(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["data"]
+
+    def get_ids(self, page):
+        return [post["id"] for post in page["results"]]
+
+    def test_forward_pages_have_no_duplicates_or_gaps(self):
+        ids, cursor = [], None
+        for _ in range(3):
+            page = self.get_page(page_size=10, **({"cursor": cursor} if cursor else {}))
+            ids += self.get_ids(page)
+            cursor = page["next"]
+        self.assertIsNone(cursor)
+        self.assertEqual(ids, [str(post.id) for post in reversed(self.posts)])
+
+    def test_prev_returns_the_previous_page(self):
+        first = self.get_page(page_size=10)
+        self.assertIsNone(first["prev"])
+        second = self.get_page(page_size=10, cursor=first["next"])
+        back = self.get_page(page_size=10, cursor=second["prev"])
+        self.assertEqual(self.get_ids(back), self.get_ids(first))
+        self.assertIsNone(back["prev"])
+        self.assertEqual(back["next"], first["next"])
+
+    def test_past_the_last_row_is_an_empty_page(self):
+        last = self.get_page(page_size=25)
+        self.assertIsNone(last["next"])
+        cursor = KeysetPagination.encode_cursor(self.posts[0], reverse=False)
+        page = self.get_page(cursor=cursor)
+        self.assertEqual(page, {"results": [], "next": None, "prev": None})
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(len(self.get_page(page_size=0)["results"]), 1)
+        self.assertEqual(len(self.get_page(page_size="many")["results"]), KeysetPagination.page_size)
+        Post.objects.bulk_create([Post(author=self.user, content="More") for _ in range(KeysetPagination.max_page_size)])
+        self.assertEqual(len(self.get_page(page_size=1000)["results"]), KeysetPagination.max_page_size)
+
+    def test_tampered_cursor_is_rejected(self):
+        valid = KeysetPagination.encode_cursor(self.posts[10], reverse=False)
+        cursors = [
+            "not base64!",
+            "%%%",
+            base64.urlsafe_b64encode(b"n" + self.posts[10].pk.bytes[:8]).decode(),
+            base64.urlsafe_b64encode(b"x" + self.posts[10].pk.bytes).decode(),
+            valid[:-2],
+            valid + "AAAA",
+            "é",
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+# ----------------------------
+# Soft Delete
+# ----------------------------
+class SoftDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="deleter@example.com", username="deleter", password="password123")
+
+    def setUp(self):
+        self.post = Post.objects.create(author=self.user, content="Soon gone")
+        self.comment = Comment.objects.create(author=self.user, post=self.post, content="First")
+        self.comment_like = Like.objects.create(liked_by=self.user, comment=self.comment)
+        self.post_like = Like.objects.create(liked_by=self.user, post=self.post)
+        self.bookmark = Bookmark.objects.create(post=self.post, bookmarked_by=self.user)
+
+    def assertLive(self, *objects, live=True):
+        for obj in objects:
+            with self.subTest(obj=obj):
+                self.assertEqual(type(obj).objects.filter(pk=obj.pk).exists(), live)
+                self.assertTrue(type(obj).all_objects.filter(pk=obj.pk).exists())
+
+    def test_delete_cascades_to_children(self):
+        self.post.delete()
+        self.assertLive(self.post, self.comment, self.comment_like, self.post_like, self.bookmark, live=False)
+        self.assertIsNotNone(Post.all_objects.get(pk=self.post.pk).deleted_at)
+
+    def test_queryset_delete_is_soft(self):
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.assertLive(self.post, self.comment, self.comment_like, live=False)
+
+    def test_restore_brings_back_children_deleted_with_the_parent(self):
+        self.post.delete()
+        self.post.restore()
+        self.assertLive(self.post, self.comment, self.comment_like, self.post_like, self.bookmark)
+        self.assertIsNone(Post.objects.get(pk=self.post.pk).deleted_at)
+
+    def test_restore_keeps_children_deleted_on_their_own(self):
+        self.comment.delete()
+        self.post.delete()
+        self.post.restore()
+        self.assertLive(self.post, self.post_like, self.bookmark)
+        self.assertLive(self.comment, self.comment_like, live=False)
 
-# Create your tests here.
+    def test_hard_delete_removes_rows(self):
+        self.post.hard_delete()
+        self.assertFalse(Post.all_objects.filter(pk=self.post.pk).exists())
@@ -24,17 +24,18 @@ from .serializers import (
 class PostListView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def get_queryset(self):
-        return Post.objects.filter(deleted_at__isnull=True).order_by("-created_at")
+        return Post.objects.prefetch_related("comments")
 
     def list(self, request, *args, **kwargs):
-        posts = self.get_queryset()
+        posts = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(posts, many=True)
         return api_response(
             success=True,
             message="Posts retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -67,9 +68,10 @@ class PostCreateView(generics.CreateAPIView):
 class PostRetrieveView(generics.RetrieveAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def get_queryset(self):
-        return Post.objects.filter(deleted_at__isnull=True)
+        return Post.objects.prefetch_related("comments")
 
     def retrieve(self, request, *args, **kwargs):
         post = get_object_or_404(self.get_queryset(), id=kwargs["id"])
@@ -90,7 +92,7 @@ class PostUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Post.objects.filter(deleted_at__isnull=True, author=self.request.user)
+        return Post.objects.filter(author=self.request.user)
 
     def update(self, request, *args, **kwargs):
         post = get_object_or_404(self.get_queryset(), id=kwargs["id"])
@@ -113,7 +115,7 @@ class PostDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Post.objects.filter(deleted_at__isnull=True, author=self.request.user)
+        return Post.objects.filter(author=self.request.user)
 
     def destroy(self, request, *args, **kwargs):
         post = get_object_or_404(self.get_queryset(), id=kwargs["id"])
@@ -131,17 +133,18 @@ class PostDeleteView(generics.DestroyAPIView):
 class MyPostsView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def get_queryset(self):
-        return Post.objects.filter(author=self.request.user, deleted_at__isnull=True).order_by("-created_at")
+        return Post.objects.filter(author=self.request.user).prefetch_related("comments")
 
     def list(self, request, *args, **kwargs):
-        posts = self.get_queryset()
+        posts = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(posts, many=True)
         return api_response(
             success=True,
             message="My posts retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -152,18 +155,19 @@ class MyPostsView(generics.ListAPIView):
 class PostsByUsernameView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def get_queryset(self):
         username = self.kwargs.get("username")
-        return Post.objects.filter(author__username=username, deleted_at__isnull=True).order_by("-created_at")
+        return Post.objects.filter(author__username=username).prefetch_related("comments")
 
     def list(self, request, *args, **kwargs):
-        posts = self.get_queryset()
+        posts = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(posts, many=True)
         return api_response(
             success=True,
             message=f"Posts by user '{self.kwargs['username']}' retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -174,18 +178,19 @@ class PostsByUsernameView(generics.ListAPIView):
 class PostsByTagView(generics.ListAPIView):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def get_queryset(self):
         tag = self.kwargs.get("tag")
-        return Post.objects.filter(tags__icontains=tag, deleted_at__isnull=True).order_by("-created_at")
+        return Post.objects.filter(tags__icontains=tag).prefetch_related("comments")
 
     def list(self, request, *args, **kwargs):
-        posts = self.get_queryset()
+        posts = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(posts, many=True)
         return api_response(
             success=True,
             message=f"Posts with tag '{self.kwargs['tag']}' retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -202,7 +207,7 @@ class RemovePostImageView(generics.GenericAPIView):
         image_url = request.data.get("image_url")
 
         post = get_object_or_404(
-            Post, id=post_id, author=request.user, deleted_at__isnull=True
+            Post, id=post_id, author=request.user
         )
 
         if image_url not in post.images:
@@ -354,13 +359,16 @@ class LikePostView(generics.GenericAPIView):
 
     def post(self, request, post_id):
         post = get_object_or_404(Post, id=post_id)
-        like, created = Like.objects.get_or_create(
+        # Toggles reuse the soft-deleted row rather than piling up tombstones.
+        like, created = Like.all_objects.get_or_create(
             liked_by=request.user, post=post
         )
-        if not created:
+        if not created and like.deleted_at is None:
             # Unlike if already liked
             like.delete()
             return Response({"message": "Post unliked"}, status=status.HTTP_200_OK)
+        if not created:
+            like.restore()
         return Response({"message": "Post liked"}, status=status.HTTP_201_CREATED)
 
 
@@ -373,12 +381,14 @@ class LikeCommentView(generics.GenericAPIView):
 
     def post(self, request, comment_id):
         comment = get_object_or_404(Comment, id=comment_id)
-        like, created = Like.objects.get_or_create(
+        like, created = Like.all_objects.get_or_create(
             liked_by=request.user, comment=comment
         )
-        if not created:
+        if not created and like.deleted_at is None:
             like.delete()
             return Response({"message": "Comment unliked"}, status=status.HTTP_200_OK)
+        if not created:
+            like.restore()
         return Response({"message": "Comment liked"}, status=status.HTTP_201_CREATED)
 
 
@@ -395,7 +405,7 @@ class PostCommentsView(generics.ListAPIView):
 
     def get_queryset(self):
         post_id = self.kwargs["post_id"]
-        return Comment.objects.filter(post_id=post_id).order_by("-created_at")
+        return Comment.objects.filter(post_id=post_id)
 
 
 class AddCommentView(generics.CreateAPIView):
@@ -454,12 +464,14 @@ class BookmarkPostView(generics.GenericAPIView):
 
     def post(self, request, post_id):
         post = get_object_or_404(Post, id=post_id)
-        bookmark, created = Bookmark.objects.get_or_create(
+        bookmark, created = Bookmark.all_objects.get_or_create(
             bookmarked_by=request.user, post=post
         )
-        if not created:
+        if not created and bookmark.deleted_at is None:
             bookmark.delete()
             return Response({"message": "Bookmark removed"}, status=status.HTTP_200_OK)
+        if not created:
+            bookmark.restore()
         return Response({"message": "Post bookmarked"}, status=status.HTTP_201_CREATED)
 
 
@@ -505,10 +517,12 @@ class FollowUnfollowUserView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        follow, created = Follow.objects.get_or_create(
+        follow, created = Follow.all_objects.get_or_create(
             follower=request.user, followee=user_to_follow 
         )
-        if not created:
+        if not created and follow.deleted_at is None:
             follow.delete()
             return Response({"message": "Unfollowed user"}, status=status.HTTP_200_OK)
+        if not created:
+            follow.restore()
         return Response({"message": "Followed user"}, status=status.HTTP_201_CREATED)
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0002_todo_deleted_at_alter_todo_priority'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['created_at', 'id'], name='todos_todo_created_486b96_idx'),
+        ),
+    ]
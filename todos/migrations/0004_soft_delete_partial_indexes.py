@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+def sync_soft_deleted(apps, schema_editor):
+    # deleted_at becomes the only liveness predicate; older deletes set just one of the two fields.
+    for name in ("Todo",):
+        model = apps.get_model("todos", name)
+        model.objects.filter(is_active=False, deleted_at__isnull=True).update(deleted_at=models.F("updated_at"))
+        model.objects.filter(is_active=True, deleted_at__isnull=False).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_soft_deleted, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='todo',
+            name='todos_todo_created_486b96_idx',
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['created_at', 'id'], name='todo_live_created_idx'),
+        ),
+    ]
@@ -1,6 +1,5 @@
 from django.db import models
 from core.models import BaseModel  
-from django.utils import timezone
 from core.constants import PRIORITY_CHOICES, PRIORITY_MEDIUM
 
 class Todo(BaseModel):
@@ -42,11 +41,6 @@ class Todo(BaseModel):
             models.Index(fields=['completed']),
         ]
 
-    def soft_delete(self):
-        """Soft delete instead of removing the record"""
-        self.deleted_at = timezone.now()
-        self.save()
-
     @property
     def status(self):
         """Virtual field to return human-readable status"""
@@ -10,17 +10,18 @@ from core.utils import api_response
 class TodoListView(generics.ListAPIView):
     serializer_class = TodoSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 2
 
     def get_queryset(self):
-        return Todo.objects.filter(deleted_at__isnull=True).order_by("-created_at")
+        return Todo.objects.all()
 
     def list(self, request, *args, **kwargs):
-        todos = self.get_queryset()
+        todos = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(todos, many=True)
         return api_response(
             success=True,
             message="Todos retrieved successfully",
-            data=serializer.data,
+            data=self.paginator.get_paginated_data(serializer.data),
             status_code=status.HTTP_200_OK
         )
 
@@ -52,7 +53,7 @@ class TodoRetrieveView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Todo.objects.filter(deleted_at__isnull=True)
+        return Todo.objects.all()
 
     def retrieve(self, request, *args, **kwargs):
         todo = get_object_or_404(self.get_queryset(), pk=kwargs["id"])
@@ -72,7 +73,7 @@ class TodoUpdateView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Todo.objects.filter(deleted_at__isnull=True)
+        return Todo.objects.all()
 
     def update(self, request, *args, **kwargs):
         todo = get_object_or_404(self.get_queryset(), pk=kwargs["id"])
@@ -95,7 +96,7 @@ class TodoDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Todo.objects.filter(deleted_at__isnull=True)
+        return Todo.objects.all()
 
     def destroy(self, request, *args, **kwargs):
         todo = get_object_or_404(self.get_queryset(), pk=kwargs["id"])
@@ -115,7 +116,7 @@ class TodoToggleStatusView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def patch(self, request, *args, **kwargs):
-        todo = get_object_or_404(Todo, id=kwargs["id"], deleted_at__isnull=True)
+        todo = get_object_or_404(Todo, id=kwargs["id"])
         todo.completed = not todo.completed
         todo.save(update_fields=["completed"])
         response = {"id": todo.id, "completed": todo.completed}